@@ -1,3 +1,4 @@
+import mimetypes
 import os
 import types
 
@@ -57,6 +58,16 @@ class FileResponse(StreamingHttpResponse):
         if not hasattr(value, 'read'):
             self.file_to_stream = None
             result = super(FileResponse, self)._set_streaming_content(value)
+
+            # Iterables like generators have no content to inspect, use
+            # the filename extension if any to determine the content type.
+            if self.get('Content-Type', '').startswith(settings.DEFAULT_CONTENT_TYPE):
+                content_type, encoding = mimetypes.guess_type(
+                    url=self.filename or ''
+                )
+                if content_type:
+                    self['Content-Type'] = content_type
+
             self._set_as_attachment(filename=self.filename)
 
             return result
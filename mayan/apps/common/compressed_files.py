@@ -1,4 +1,5 @@
 import tarfile
+import time
 import zipfile
 
 import extract_msg
@@ -16,7 +17,7 @@ from django.utils.six import BytesIO
 from mayan.apps.mimetype.api import get_mimetype
 
 from .exceptions import NoMIMETypeMatch
-from .literals import MSG_MIME_TYPES
+from .literals import MSG_MIME_TYPES, ZIP_ARCHIVE_STREAM_CHUNK_SIZE
 
 
 class Archive(object):
@@ -218,6 +219,76 @@ class ZipArchive(Archive):
         return SimpleUploadedFile(name=filename, content=self.write().read())
 
 
+class ZipArchiveStream(object):
+    """
+    Write a ZIP archive as a sequence of byte strings instead of building it
+    in memory. Member files are read in chunks and each member is written
+    with ZIP64 extensions so there is no limit to the member or archive
+    size. Usage:
+
+        zip_archive_stream = ZipArchiveStream()
+        for chunk in zip_archive_stream.add_file(file_object, filename):
+            ...
+        for chunk in zip_archive_stream.close():
+            ...
+    """
+    def __init__(self, chunk_size=ZIP_ARCHIVE_STREAM_CHUNK_SIZE):
+        self.chunk_size = chunk_size
+        self.stream_buffer = ZipArchiveStreamBuffer()
+        self._archive = zipfile.ZipFile(
+            allowZip64=True, file=self.stream_buffer, mode='w'
+        )
+
+    def add_file(self, file_object, filename):
+        zip_info = zipfile.ZipInfo(
+            date_time=time.localtime(time.time())[:6], filename=filename
+        )
+        zip_info.compress_type = COMPRESSION
+        # Fix for Linux zip files read in Windows.
+        zip_info.create_system = 0
+        zip_info.external_attr = 0o600 << 16
+
+        with self._archive.open(zip_info, force_zip64=True, mode='w') as member_file_object:
+            while True:
+                data = file_object.read(self.chunk_size)
+                if not data:
+                    break
+
+                member_file_object.write(data)
+                for chunk in self.stream_buffer.pop():
+                    yield chunk
+
+        for chunk in self.stream_buffer.pop():
+            yield chunk
+
+    def close(self):
+        self._archive.close()
+        for chunk in self.stream_buffer.pop():
+            yield chunk
+
+
+class ZipArchiveStreamBuffer(object):
+    """
+    Non seekable file like object that holds the bytes written by the
+    archive until they are popped by the stream. Being non seekable causes
+    zipfile to write the member sizes after the member data.
+    """
+    def __init__(self):
+        self.chunks = []
+
+    def flush(self):
+        """Nothing to flush, the data is collected by the pop method."""
+
+    def pop(self):
+        chunks = self.chunks
+        self.chunks = []
+        return chunks
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+
+
 Archive.register(
     archive_classes=(MsgArchive,), mime_types=MSG_MIME_TYPES
 )
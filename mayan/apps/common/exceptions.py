@@ -20,6 +20,13 @@ class CompressionFileError(BaseCommonException):
     pass
 
 
+class HTTPRangeNotSatisfiable(BaseCommonException):
+    """
+    The range requested starts beyond the end of the resource
+    """
+    pass
+
+
 class NoMIMETypeMatch(CompressionFileError):
     """
     There is no decompressor registered for the specified MIME type
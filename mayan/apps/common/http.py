@@ -3,6 +3,11 @@ from django.urls import reverse
 from django.utils.encoding import force_bytes
 from django.utils.six import PY3
 
+from .exceptions import HTTPRangeNotSatisfiable
+from .literals import (
+    DOWNLOAD_RANGE_CHUNK_SIZE, DOWNLOAD_RANGE_MAXIMUM_COUNT
+)
+
 
 class URL(object):
     def __init__(
@@ -44,3 +49,160 @@ class URL(object):
             return result
         else:
             return force_bytes(result)
+
+
+def _iterate_file_range(file_object, position, start, end, chunk_size):
+    if getattr(file_object, 'seekable', lambda: True)():
+        file_object.seek(start)
+    else:
+        # Files that can't seek are read and the bytes discarded until
+        # the start of the range.
+        while position < start:
+            chunk = file_object.read(min(chunk_size, start - position))
+            if not chunk:
+                return
+
+            position += len(chunk)
+
+    remaining = end - start + 1
+
+    while remaining > 0:
+        chunk = file_object.read(min(chunk_size, remaining))
+        if not chunk:
+            break
+
+        remaining -= len(chunk)
+        yield chunk
+
+
+def get_multipart_range_header(boundary, content_type, end, size, start):
+    """
+    Return the delimiter and headers that precede a byte range in the
+    body of a multipart/byteranges response.
+    """
+    return force_bytes(
+        '\r\n--{}\r\nContent-Type: {}\r\n'
+        'Content-Range: bytes {}-{}/{}\r\n\r\n'.format(
+            boundary, content_type, start, end, size
+        )
+    )
+
+
+def get_multipart_range_trailer(boundary):
+    """
+    Return the closing delimiter of a multipart/byteranges response body.
+    """
+    return force_bytes('\r\n--{}--\r\n'.format(boundary))
+
+
+def iterate_file_range(
+    file_object, start, end, chunk_size=DOWNLOAD_RANGE_CHUNK_SIZE
+):
+    """
+    Generator that yields the bytes between the start and end positions,
+    both inclusive, of a file object and closes it afterwards. The file
+    object is expected to be at its start.
+    """
+    try:
+        for chunk in _iterate_file_range(
+            chunk_size=chunk_size, end=end, file_object=file_object,
+            position=0, start=start
+        ):
+            yield chunk
+    finally:
+        file_object.close()
+
+
+def iterate_file_ranges(
+    file_object, ranges, boundary, content_type, size,
+    chunk_size=DOWNLOAD_RANGE_CHUNK_SIZE
+):
+    """
+    Generator that yields the body of a multipart/byteranges response for
+    a list of sorted, non overlapping ranges of a file object and closes
+    it afterwards. The file object is expected to be at its start.
+    """
+    try:
+        position = 0
+        for start, end in ranges:
+            yield get_multipart_range_header(
+                boundary=boundary, content_type=content_type, end=end,
+                size=size, start=start
+            )
+            for chunk in _iterate_file_range(
+                chunk_size=chunk_size, end=end, file_object=file_object,
+                position=position, start=start
+            ):
+                yield chunk
+
+            position = end + 1
+
+        yield get_multipart_range_trailer(boundary=boundary)
+    finally:
+        file_object.close()
+
+
+def parse_range_header(header, size):
+    """
+    Parse the value of a HTTP Range header for a resource of the given
+    size. Returns a sorted list of (first, last) byte position tuples with
+    overlapping and adjacent ranges merged, or None if the header is
+    missing, malformed or asks for too many ranges, in which case the
+    whole resource must be served. Ranges that start past the end of the
+    resource are dropped, HTTPRangeNotSatisfiable is raised if none are
+    left.
+    """
+    if not header:
+        return None
+
+    unit, separator, byte_range_set = header.partition('=')
+
+    if unit.strip() != 'bytes' or not separator:
+        return None
+
+    ranges = []
+
+    for byte_range in byte_range_set.split(','):
+        start, separator, end = byte_range.strip().partition('-')
+
+        if not separator:
+            return None
+
+        try:
+            if start:
+                start = int(start)
+                if end:
+                    end = int(end)
+                    if end < start:
+                        return None
+                else:
+                    end = size - 1
+            else:
+                # Suffix range, the last N bytes of the resource.
+                suffix_length = int(end)
+                if suffix_length < 0:
+                    return None
+                elif suffix_length == 0:
+                    continue
+                start = max(size - suffix_length, 0)
+                end = size - 1
+        except ValueError:
+            return None
+
+        if start < size:
+            ranges.append((start, min(end, size - 1)))
+
+    if len(ranges) > DOWNLOAD_RANGE_MAXIMUM_COUNT:
+        return None
+
+    if not ranges:
+        raise HTTPRangeNotSatisfiable
+
+    result = []
+    for start, end in sorted(ranges):
+        if result and start <= result[-1][1] + 1:
+            result[-1] = (result[-1][0], max(result[-1][1], end))
+        else:
+            result.append((start, end))
+
+    return result
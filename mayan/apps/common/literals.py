@@ -3,6 +3,8 @@ from django.utils.translation import ugettext_lazy as _
 DEFAULT_COMMON_HOME_VIEW = 'common:home'
 DEFAULT_FIREFOX_GECKODRIVER_PATH = '/usr/bin/geckodriver'
 DELETE_STALE_UPLOADS_INTERVAL = 60 * 10  # 10 minutes
+DOWNLOAD_RANGE_CHUNK_SIZE = 65536
+DOWNLOAD_RANGE_MAXIMUM_COUNT = 32
 DJANGO_SQLITE_BACKEND = 'django.db.backends.sqlite3'
 
 MSG_MIME_TYPES = (
@@ -46,3 +48,5 @@ TIME_DELTA_UNIT_CHOICES = (
     (TIME_DELTA_UNIT_MINUTES, _('Minutes')),
 )
 UPLOAD_EXPIRATION_INTERVAL = 60 * 60 * 24 * 7  # 7 days
+
+ZIP_ARCHIVE_STREAM_CHUNK_SIZE = 65536
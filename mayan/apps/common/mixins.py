@@ -1,9 +1,15 @@
+from calendar import timegm
+import os
+import uuid
+
 from django.contrib import messages
 from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import ImproperlyConfigured
-from django.http import Http404, HttpResponseRedirect
+from django.http import Http404, HttpResponse, HttpResponseRedirect
 from django.shortcuts import get_object_or_404
 from django.urls import reverse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe, quote_etag
 from django.utils.translation import ungettext, ugettext_lazy as _
 from django.views.generic.detail import SingleObjectMixin
 
@@ -12,8 +18,12 @@ from mayan.apps.acls.models import AccessControlList
 from mayan.apps.permissions import Permission
 
 from .compat import FileResponse
-from .exceptions import ActionError
+from .exceptions import ActionError, HTTPRangeNotSatisfiable
 from .forms import DynamicForm
+from .http import (
+    get_multipart_range_header, get_multipart_range_trailer,
+    iterate_file_range, iterate_file_ranges, parse_range_header
+)
 from .literals import (
     PK_LIST_SEPARATOR, TEXT_CHOICE_ITEMS, TEXT_CHOICE_LIST,
     TEXT_LIST_AS_ITEMS_PARAMETER, TEXT_LIST_AS_ITEMS_VARIABLE_NAME
@@ -64,27 +74,204 @@ class DeleteExtraDataMixin(object):
 
 
 class DownloadMixin(object):
+    """
+    Mixin to serve a file as the response. Set range_requests to True to
+    support the HTTP Range and If-Range headers, which allow clients to
+    resume interrupted downloads and to fetch parts of the file. The size
+    of the file is obtained from .get_download_file_size(), from the file
+    object or, only when a range is requested, by seeking the file object.
+    Provide .get_download_etag() and .get_download_last_modified() to
+    answer conditional requests.
+    """
     as_attachment = True
+    range_requests = False
+
+    def _get_file_object_size(self, file_object, seek=True):
+        """
+        Use the size already known by the file object, like the one of
+        SeekableEncryptedFile. Otherwise seek to the end of the file if
+        allowed. Seeking forces the file objects that decode their content
+        to decode all of it.
+        """
+        size = getattr(file_object, '__dict__', {}).get('size')
+
+        if size is None and seek and getattr(file_object, 'seekable', lambda: False)():
+            file_object.seek(0, os.SEEK_END)
+            size = file_object.tell()
+            file_object.seek(0)
+
+        return size
+
+    def _is_if_range_valid(self, etag, last_modified):
+        """
+        A range request is honored only if the validator of the If-Range
+        header still matches the file. Weak entity tags never match.
+        """
+        header = self.request.META.get('HTTP_IF_RANGE')
+
+        if not header:
+            return True
+        elif header.startswith('"') or header.startswith('W/'):
+            return etag is not None and header == etag
+        else:
+            return last_modified is not None and parse_http_date_safe(
+                date=header
+            ) == last_modified
 
     def get_as_attachment(self):
         return self.as_attachment
 
+    def get_download_etag(self):
+        return None
+
     def get_download_file_object(self):
         raise NotImplementedError(
             'Class must provide a .get_download_file_object() method that '
             'return a file like object.'
         )
 
+    def get_download_file_size(self):
+        return None
+
     def get_download_filename(self):
         return None
 
-    def render_to_response(self, **response_kwargs):
-        return FileResponse(
+    def get_download_last_modified(self):
+        return None
+
+    def get_download_mime_type(self):
+        return None
+
+    def render_to_download_response(self, etag=None, last_modified=None):
+        file_object = self.get_download_file_object()
+
+        if self.range_requests:
+            file_size = self.get_download_file_size()
+            if file_size is None:
+                # Without a Range header the file is streamed from the
+                # start, seek only when a range is requested.
+                file_size = self._get_file_object_size(
+                    file_object=file_object,
+                    seek='HTTP_RANGE' in self.request.META
+                )
+
+            if file_size is not None:
+                return self.render_to_range_response(
+                    etag=etag, file_object=file_object, file_size=file_size,
+                    last_modified=last_modified
+                )
+
+        response = FileResponse(
             as_attachment=self.get_as_attachment(),
+            content_type=self.get_download_mime_type(),
             filename=self.get_download_filename(),
-            streaming_content=self.get_download_file_object()
+            streaming_content=file_object
         )
 
+        if self.range_requests:
+            response['Accept-Ranges'] = 'bytes'
+
+        return response
+
+    def render_to_range_response(
+        self, file_object, file_size, etag=None, last_modified=None
+    ):
+        byte_ranges = None
+
+        if self._is_if_range_valid(etag=etag, last_modified=last_modified):
+            try:
+                byte_ranges = parse_range_header(
+                    header=self.request.META.get('HTTP_RANGE'),
+                    size=file_size
+                )
+            except HTTPRangeNotSatisfiable:
+                file_object.close()
+                response = HttpResponse(status=416)
+                response['Content-Range'] = 'bytes */{}'.format(file_size)
+                return response
+
+        mime_type = self.get_download_mime_type()
+
+        if not byte_ranges:
+            response = FileResponse(
+                as_attachment=self.get_as_attachment(),
+                content_type=mime_type, filename=self.get_download_filename(),
+                streaming_content=file_object
+            )
+            response['Content-Length'] = file_size
+        elif len(byte_ranges) == 1:
+            start, end = byte_ranges[0]
+            response = FileResponse(
+                as_attachment=self.get_as_attachment(),
+                content_type=mime_type, filename=self.get_download_filename(),
+                streaming_content=iterate_file_range(
+                    end=end, file_object=file_object, start=start
+                )
+            )
+            response.status_code = 206
+            response['Content-Length'] = end - start + 1
+            response['Content-Range'] = 'bytes {}-{}/{}'.format(
+                start, end, file_size
+            )
+        else:
+            boundary = uuid.uuid4().hex
+            mime_type = mime_type or 'application/octet-stream'
+
+            content_length = len(
+                get_multipart_range_trailer(boundary=boundary)
+            )
+            for start, end in byte_ranges:
+                content_length += end - start + 1 + len(
+                    get_multipart_range_header(
+                        boundary=boundary, content_type=mime_type, end=end,
+                        size=file_size, start=start
+                    )
+                )
+
+            response = FileResponse(
+                as_attachment=self.get_as_attachment(),
+                content_type='multipart/byteranges; boundary={}'.format(
+                    boundary
+                ), filename=self.get_download_filename(),
+                streaming_content=iterate_file_ranges(
+                    boundary=boundary, content_type=mime_type,
+                    file_object=file_object, ranges=byte_ranges,
+                    size=file_size
+                )
+            )
+            response.status_code = 206
+            response['Content-Length'] = content_length
+
+        response['Accept-Ranges'] = 'bytes'
+
+        return response
+
+    def render_to_response(self, **response_kwargs):
+        etag = self.get_download_etag()
+        if etag:
+            etag = quote_etag(etag_str=etag)
+
+        last_modified = self.get_download_last_modified()
+        if last_modified:
+            last_modified = timegm(last_modified.utctimetuple())
+
+        response = get_conditional_response(
+            request=self.request, etag=etag, last_modified=last_modified
+        )
+
+        if response is None:
+            response = self.render_to_download_response(
+                etag=etag, last_modified=last_modified
+            )
+
+        if etag:
+            response['ETag'] = etag
+
+        if last_modified:
+            response['Last-Modified'] = http_date(epoch_seconds=last_modified)
+
+        return response
+
 
 class DynamicFormViewMixin(object):
     form_class = DynamicForm
@@ -1,8 +1,13 @@
+import zipfile
+
 from django.utils.encoding import force_bytes
+from django.utils.six import BytesIO
 
 from mayan.apps.common.tests.base import BaseTestCase
 
-from ..compressed_files import Archive, MsgArchive, TarArchive, ZipArchive
+from ..compressed_files import (
+    Archive, MsgArchive, TarArchive, ZipArchive, ZipArchiveStream
+)
 
 from .literals import (
     TEST_ARCHIVE_MSG_STRANGE_DATE_PATH, TEST_ARCHIVE_ZIP_CP437_MEMBER_PATH,
@@ -133,3 +138,41 @@ class TarGzArchiveClassTestCase(ArchiveClassTestCaseMixin, BaseTestCase):
 class TarBz2ArchiveClassTestCase(ArchiveClassTestCaseMixin, BaseTestCase):
     archive_path = TEST_TAR_BZ2_FILE_PATH
     cls = TarArchive
+
+
+class ZipArchiveStreamTestCase(BaseTestCase):
+    def test_add_file(self):
+        zip_archive_stream = ZipArchiveStream(chunk_size=16)
+        chunks = []
+
+        with open(TEST_FILE3_PATH, mode='rb') as file_object:
+            chunks.extend(
+                zip_archive_stream.add_file(
+                    file_object=file_object, filename=TEST_FILENAME3
+                )
+            )
+            file_object.seek(0)
+            test_file_contents = file_object.read()
+
+        chunks.extend(
+            zip_archive_stream.add_file(
+                file_object=BytesIO(force_bytes(TEST_FILE_CONTENTS_1)),
+                filename=TEST_FILENAME1
+            )
+        )
+        chunks.extend(zip_archive_stream.close())
+
+        self.assertTrue(len(chunks) > 2)
+
+        with zipfile.ZipFile(BytesIO(b''.join(chunks))) as zip_file:
+            self.assertEqual(zip_file.testzip(), None)
+            self.assertEqual(
+                zip_file.namelist(), [TEST_FILENAME3, TEST_FILENAME1]
+            )
+            self.assertEqual(
+                zip_file.read(TEST_FILENAME3), test_file_contents
+            )
+            self.assertEqual(
+                zip_file.read(TEST_FILENAME1),
+                force_bytes(TEST_FILE_CONTENTS_1)
+            )
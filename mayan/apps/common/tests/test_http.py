@@ -0,0 +1,71 @@
+from .base import BaseTestCase
+
+from ..exceptions import HTTPRangeNotSatisfiable
+from ..http import parse_range_header
+
+TEST_RANGE_RESOURCE_SIZE = 100
+
+
+class ParseRangeHeaderTestCase(BaseTestCase):
+    def _parse_range_header(self, header):
+        return parse_range_header(
+            header=header, size=TEST_RANGE_RESOURCE_SIZE
+        )
+
+    def test_range(self):
+        self.assertEqual(self._parse_range_header('bytes=10-19'), [(10, 19)])
+
+    def test_range_end_past_size(self):
+        self.assertEqual(self._parse_range_header('bytes=90-200'), [(90, 99)])
+
+    def test_range_malformed(self):
+        self.assertEqual(self._parse_range_header('bytes=a-b'), None)
+        self.assertEqual(self._parse_range_header('bytes=20-10'), None)
+        self.assertEqual(self._parse_range_header('items=0-10'), None)
+        self.assertEqual(self._parse_range_header('bytes=0-1,a-b'), None)
+
+    def test_range_missing(self):
+        self.assertEqual(self._parse_range_header(None), None)
+
+    def test_range_multiple(self):
+        self.assertEqual(
+            self._parse_range_header('bytes=50-59,0-1,-10'),
+            [(0, 1), (50, 59), (90, 99)]
+        )
+
+    def test_range_multiple_merged(self):
+        self.assertEqual(
+            self._parse_range_header('bytes=0-10,5-20,21-30,40-50'),
+            [(0, 30), (40, 50)]
+        )
+
+    def test_range_multiple_partially_satisfiable(self):
+        self.assertEqual(
+            self._parse_range_header('bytes=200-300,0-9'), [(0, 9)]
+        )
+
+    def test_range_multiple_too_many(self):
+        self.assertEqual(
+            self._parse_range_header(
+                'bytes={}'.format(
+                    ','.join('{0}-{0}'.format(index * 2) for index in range(40))
+                )
+            ), None
+        )
+
+    def test_range_not_satisfiable(self):
+        with self.assertRaises(HTTPRangeNotSatisfiable):
+            self._parse_range_header('bytes=100-')
+
+        with self.assertRaises(HTTPRangeNotSatisfiable):
+            self._parse_range_header('bytes=-0')
+
+        with self.assertRaises(HTTPRangeNotSatisfiable):
+            self._parse_range_header('bytes=100-110,200-')
+
+    def test_range_open_ended(self):
+        self.assertEqual(self._parse_range_header('bytes=50-'), [(50, 99)])
+
+    def test_range_suffix(self):
+        self.assertEqual(self._parse_range_header('bytes=-10'), [(90, 99)])
+        self.assertEqual(self._parse_range_header('bytes=-200'), [(0, 99)])
@@ -1,7 +1,9 @@
 import io
 import logging
+import os
 import shutil
 import struct
+import time
 
 from PIL import Image
 import PyPDF2
@@ -10,7 +12,7 @@ import sh
 from django.utils.encoding import force_text
 from django.utils.translation import ugettext_lazy as _
 
-from mayan.apps.storage.utils import NamedTemporaryFile
+from mayan.apps.storage.utils import NamedTemporaryFile, fs_cleanup, mkdtemp
 
 from ..classes import ConverterBase
 from ..exceptions import PageCountError
@@ -18,7 +20,8 @@ from ..settings import setting_graphics_backend_arguments
 
 from ..literals import (
     DEFAULT_PDFTOPPM_DPI, DEFAULT_PDFTOPPM_FORMAT, DEFAULT_PDFTOPPM_PATH,
-    DEFAULT_PDFINFO_PATH, DEFAULT_PILLOW_MAXIMUM_IMAGE_PIXELS
+    DEFAULT_PDFINFO_PATH, DEFAULT_PILLOW_MAXIMUM_IMAGE_PIXELS,
+    PDFTOPPM_OUTPUT_POLL_INTERVAL, PDFTOPPM_OUTPUT_ROOT
 )
 
 logger = logging.getLogger(name=__name__)
@@ -84,6 +87,74 @@ class Python(ConverterBase):
             finally:
                 new_file_object.close()
 
+    def _get_pdftoppm_output_page_number(self, filename):
+        # pdftoppm names each output file as "<root>-<page number>.<ext>",
+        # zero padding the page number to the width of the page count.
+        return int(os.path.splitext(filename)[0].rsplit('-', 1)[1])
+
+    def seek_pages(self, first_page_number, last_page_number):
+        if self.mime_type != 'application/pdf' or not pdftoppm:
+            for page_number in super(Python, self).seek_pages(
+                first_page_number=first_page_number,
+                last_page_number=last_page_number
+            ):
+                yield page_number
+            return
+
+        # Spool a single copy of the source file and rasterize the entire
+        # range with one pdftoppm execution. Each page is yielded as soon
+        # as pdftoppm moves on to the next one.
+        with NamedTemporaryFile() as new_file_object:
+            self.file_object.seek(0)
+            shutil.copyfileobj(fsrc=self.file_object, fdst=new_file_object)
+            self.file_object.seek(0)
+            new_file_object.flush()
+
+            output_directory = mkdtemp()
+            process = None
+            try:
+                process = pdftoppm(
+                    new_file_object.name, os.path.join(
+                        output_directory, PDFTOPPM_OUTPUT_ROOT
+                    ), f=first_page_number + 1, l=last_page_number + 1,
+                    _bg=True
+                )
+
+                while True:
+                    is_alive = process.process.is_alive()[0]
+                    filenames = sorted(
+                        os.listdir(output_directory),
+                        key=self._get_pdftoppm_output_page_number
+                    )
+                    if is_alive:
+                        # The newest file could still be being written.
+                        filenames = filenames[:-1]
+
+                    for filename in filenames:
+                        output_filename = os.path.join(
+                            output_directory, filename
+                        )
+                        with open(output_filename, mode='rb') as file_object:
+                            self.image = Image.open(file_object)
+                            self.image.load()
+                        fs_cleanup(filename=output_filename)
+
+                        yield self._get_pdftoppm_output_page_number(
+                            filename=filename
+                        ) - 1
+
+                    if not is_alive:
+                        break
+
+                    time.sleep(PDFTOPPM_OUTPUT_POLL_INTERVAL)
+
+                process.wait()
+            finally:
+                if process is not None and process.process.is_alive()[0]:
+                    # The caller stopped consuming pages early.
+                    process.terminate()
+                fs_cleanup(filename=output_directory)
+
     def detect_orientation(self, page_number):
         # Default rotation: 0 degrees
         result = 0
@@ -1,8 +1,11 @@
+import atexit
 import copy
 from io import BytesIO
 import logging
 import os
 import shutil
+import threading
+import time
 
 import PIL
 from PIL import Image
@@ -25,12 +28,26 @@ from mayan.apps.storage.utils import (
     NamedTemporaryFile, fs_cleanup, mkdtemp
 )
 
-from .exceptions import InvalidOfficeFormat, OfficeConversionError
+from .exceptions import (
+    InvalidOfficeFormat, LibreOfficePoolError, OfficeConversionError
+)
 from .literals import (
     CONVERTER_OFFICE_FILE_MIMETYPES, DEFAULT_LIBREOFFICE_PATH,
-    DEFAULT_PAGE_NUMBER, DEFAULT_PILLOW_FORMAT
+    DEFAULT_PAGE_NUMBER, DEFAULT_PILLOW_FORMAT,
+    LIBREOFFICE_POOL_ACQUIRE_TIMEOUT, LIBREOFFICE_POOL_PDF_EXPORT_FILTERS,
+    LIBREOFFICE_POOL_START_TIMEOUT, LIBREOFFICE_POOL_TEXT_FILTER_NAME,
+    LIBREOFFICE_POOL_TEXT_FILTER_OPTIONS
+)
+from .settings import (
+    setting_graphics_backend_arguments,
+    setting_libreoffice_pool_maximum_conversions,
+    setting_libreoffice_pool_size
 )
-from .settings import setting_graphics_backend_arguments
+
+try:
+    import uno
+except ImportError:
+    uno = None
 
 libreoffice_path = setting_graphics_backend_arguments.value.get(
     'libreoffice_path', DEFAULT_LIBREOFFICE_PATH
@@ -116,9 +133,22 @@ class ConverterBase(object):
             self.image.seek(page_number)
             self.image.load()
 
+    def seek_pages(self, first_page_number, last_page_number):
+        """
+        Generator that seeks each page of the range in turn and yields the
+        page number once that page is the current image. Backends able to
+        rasterize several pages in a single pass should override this
+        method. Page numbers start with #0.
+        """
+        for page_number in range(first_page_number, last_page_number + 1):
+            self.seek_page(page_number=page_number)
+            yield page_number
+
     def soffice(self):
         """
-        Executes LibreOffice as a sub process
+        Converts the file to PDF using a LibreOffice process from the pool
+        or executes LibreOffice as a sub process if the pool is not
+        available.
         """
         if not self.command_libreoffice:
             raise OfficeConversionError(
@@ -136,35 +166,6 @@ class ConverterBase(object):
             self.file_object.seek(0)
             temporary_file_object.seek(0)
 
-            libreoffice_home_directory = mkdtemp()
-            args = (
-                temporary_file_object.name, '--outdir', setting_temporary_directory.value,
-                '-env:UserInstallation=file://{}'.format(
-                    os.path.join(
-                        libreoffice_home_directory, 'LibreOffice_Conversion'
-                    )
-                ),
-            )
-
-            kwargs = {'_env': {'HOME': libreoffice_home_directory}}
-
-            if self.mime_type == 'text/plain':
-                kwargs.update(
-                    {'infilter': 'Text (encoded):UTF8,LF,,,'}
-                )
-
-            try:
-                self.command_libreoffice(*args, **kwargs)
-            except sh.ErrorReturnCode as exception:
-                temporary_file_object.close()
-                raise OfficeConversionError(exception)
-            except Exception as exception:
-                temporary_file_object.close()
-                logger.error('Exception launching Libre Office; %s', exception)
-                raise
-            finally:
-                fs_cleanup(filename=libreoffice_home_directory)
-
             # LibreOffice return a PDF file with the same name as the input
             # provided but with the .pdf extension.
 
@@ -185,6 +186,28 @@ class ConverterBase(object):
             )
             logger.debug('converted_file_path: %s', converted_file_path)
 
+            is_converted = False
+            libreoffice_pool = LibreOfficePool.get_instance()
+
+            if libreoffice_pool:
+                temporary_file_object.flush()
+                try:
+                    libreoffice_pool.convert(
+                        input_filename=temporary_file_object.name,
+                        mime_type=self.mime_type,
+                        output_filename=converted_file_path
+                    )
+                except LibreOfficePoolError as exception:
+                    logger.warning(
+                        'LibreOffice pool unavailable, using a one-shot '
+                        'process instead; %s', exception
+                    )
+                else:
+                    is_converted = True
+
+            if not is_converted:
+                self.soffice_execute(filename=temporary_file_object.name)
+
         # Don't use context manager with the NamedTemporaryFile on purpose
         # so that it is deleted when the caller closes the file and not
         # before.
@@ -201,6 +224,37 @@ class ConverterBase(object):
         temporary_converted_file_object.seek(0)
         return temporary_converted_file_object
 
+    def soffice_execute(self, filename):
+        """
+        Executes LibreOffice as a sub process
+        """
+        libreoffice_home_directory = mkdtemp()
+        args = (
+            filename, '--outdir', setting_temporary_directory.value,
+            '-env:UserInstallation=file://{}'.format(
+                os.path.join(
+                    libreoffice_home_directory, 'LibreOffice_Conversion'
+                )
+            ),
+        )
+
+        kwargs = {'_env': {'HOME': libreoffice_home_directory}}
+
+        if self.mime_type == 'text/plain':
+            kwargs.update(
+                {'infilter': 'Text (encoded):UTF8,LF,,,'}
+            )
+
+        try:
+            self.command_libreoffice(*args, **kwargs)
+        except sh.ErrorReturnCode as exception:
+            raise OfficeConversionError(exception)
+        except Exception as exception:
+            logger.error('Exception launching Libre Office; %s', exception)
+            raise
+        finally:
+            fs_cleanup(filename=libreoffice_home_directory)
+
     def to_pdf(self):
         # Handle .msg files
         if self.mime_type in MSG_MIME_TYPES:
@@ -239,6 +293,235 @@ class ConverterBase(object):
             self.image = transformation.execute_on(image=self.image)
 
 
+class LibreOfficeProcess(object):
+    """
+    Long lived headless LibreOffice instance with its own user profile,
+    listening for UNO connections on a local named pipe.
+    """
+    def __init__(self):
+        self.conversion_count = 0
+        self.home_directory = mkdtemp()
+        self.pipe_name = 'mayan_libreoffice_{}_{}'.format(
+            os.getpid(), os.path.basename(self.home_directory)
+        )
+        self.process = None
+
+    def convert(self, input_filename, output_filename, mime_type=None):
+        desktop = self.get_desktop()
+
+        load_properties = [self.get_property_value('Hidden', True)]
+        if mime_type == 'text/plain':
+            load_properties.extend(
+                (
+                    self.get_property_value(
+                        'FilterName', LIBREOFFICE_POOL_TEXT_FILTER_NAME
+                    ), self.get_property_value(
+                        'FilterOptions', LIBREOFFICE_POOL_TEXT_FILTER_OPTIONS
+                    )
+                )
+            )
+
+        document = desktop.loadComponentFromURL(
+            uno.systemPathToFileUrl(input_filename), '_blank', 0,
+            tuple(load_properties)
+        )
+        if not document:
+            raise OfficeConversionError(
+                _('LibreOffice was unable to load the document.')
+            )
+
+        try:
+            document.storeToURL(
+                uno.systemPathToFileUrl(output_filename), (
+                    self.get_property_value(
+                        'FilterName', self.get_export_filter(
+                            document=document
+                        )
+                    ),
+                )
+            )
+        finally:
+            document.close(True)
+            self.conversion_count += 1
+
+    def get_desktop(self):
+        local_context = uno.getComponentContext()
+        resolver = local_context.ServiceManager.createInstanceWithContext(
+            'com.sun.star.bridge.UnoUrlResolver', local_context
+        )
+        context = resolver.resolve(
+            'uno:pipe,name={};urp;StarOffice.ComponentContext'.format(
+                self.pipe_name
+            )
+        )
+        return context.ServiceManager.createInstanceWithContext(
+            'com.sun.star.frame.Desktop', context
+        )
+
+    def get_export_filter(self, document):
+        for service, filter_name in LIBREOFFICE_POOL_PDF_EXPORT_FILTERS:
+            if document.supportsService(service):
+                return filter_name
+
+        return LIBREOFFICE_POOL_PDF_EXPORT_FILTERS[-1][1]
+
+    def get_property_value(self, name, value):
+        property_value = uno.createUnoStruct('com.sun.star.beans.PropertyValue')
+        property_value.Name = name
+        property_value.Value = value
+        return property_value
+
+    def is_alive(self):
+        return self.process is not None and self.process.process.is_alive()[0]
+
+    def start(self):
+        self.process = sh.Command(libreoffice_path)(
+            '--headless', '--invisible', '--nocrashreport', '--nodefault',
+            '--nolockcheck', '--nologo', '--norestore',
+            '--accept=pipe,name={};urp;StarOffice.ComponentContext'.format(
+                self.pipe_name
+            ), '-env:UserInstallation=file://{}'.format(
+                os.path.join(self.home_directory, 'LibreOffice_Conversion')
+            ), _bg=True, _env={'HOME': self.home_directory}
+        )
+
+        # Wait until the listener accepts connections.
+        start_time = time.time()
+        while True:
+            try:
+                self.get_desktop()
+            except Exception as exception:
+                if not self.is_alive():
+                    raise LibreOfficePoolError(
+                        'LibreOffice process exited during start up.'
+                    )
+
+                if time.time() - start_time > LIBREOFFICE_POOL_START_TIMEOUT:
+                    self.stop()
+                    raise LibreOfficePoolError(
+                        'Timeout waiting for LibreOffice to start; {}'.format(
+                            exception
+                        )
+                    )
+                time.sleep(0.25)
+            else:
+                return
+
+    def stop(self):
+        if self.is_alive():
+            try:
+                self.process.terminate()
+                self.process.wait()
+            except Exception as exception:
+                logger.debug(
+                    'Exception stopping LibreOffice process; %s', exception
+                )
+
+        self.process = None
+        fs_cleanup(filename=self.home_directory)
+
+
+class LibreOfficePool(object):
+    """
+    Bounded pool of long lived LibreOffice processes. Processes are started
+    on demand, recycled after a number of conversions or after an error
+    and are owned by the operating system process that created the pool.
+    """
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    @classmethod
+    def get_instance(cls):
+        """
+        Return the pool of the current process or None if the pool is
+        disabled or the LibreOffice UNO bindings are not available.
+        """
+        if not uno or not setting_libreoffice_pool_size.value:
+            return None
+
+        with cls._instance_lock:
+            # Pools are not inherited across process forks.
+            if not cls._instance or cls._instance.pid != os.getpid():
+                cls._instance = cls(
+                    maximum_conversions=setting_libreoffice_pool_maximum_conversions.value,
+                    size=setting_libreoffice_pool_size.value
+                )
+                atexit.register(cls._instance.shutdown)
+
+            return cls._instance
+
+    def __init__(self, size, maximum_conversions):
+        self.condition = threading.Condition()
+        self.idle_processes = []
+        self.maximum_conversions = maximum_conversions
+        self.pid = os.getpid()
+        self.process_count = 0
+        self.size = size
+
+    def acquire(self):
+        with self.condition:
+            while not self.idle_processes and self.process_count >= self.size:
+                if not self.condition.wait(
+                    timeout=LIBREOFFICE_POOL_ACQUIRE_TIMEOUT
+                ):
+                    raise LibreOfficePoolError(
+                        'Timeout waiting for an idle LibreOffice process.'
+                    )
+
+            if self.idle_processes:
+                return self.idle_processes.pop()
+
+            self.process_count += 1
+
+        # Start the new process outside the lock.
+        libreoffice_process = LibreOfficeProcess()
+        try:
+            libreoffice_process.start()
+        except Exception:
+            self.discard(libreoffice_process=libreoffice_process)
+            raise
+
+        return libreoffice_process
+
+    def convert(self, input_filename, output_filename, mime_type=None):
+        libreoffice_process = self.acquire()
+        try:
+            libreoffice_process.convert(
+                input_filename=input_filename, mime_type=mime_type,
+                output_filename=output_filename
+            )
+        except Exception as exception:
+            # Recycle the process in case its state is corrupted.
+            self.discard(libreoffice_process=libreoffice_process)
+            raise LibreOfficePoolError(
+                'Error converting file; {}'.format(exception)
+            )
+        else:
+            self.release(libreoffice_process=libreoffice_process)
+
+    def discard(self, libreoffice_process):
+        libreoffice_process.stop()
+        with self.condition:
+            self.process_count -= 1
+            self.condition.notify()
+
+    def release(self, libreoffice_process):
+        if libreoffice_process.conversion_count >= self.maximum_conversions or not libreoffice_process.is_alive():
+            self.discard(libreoffice_process=libreoffice_process)
+        else:
+            with self.condition:
+                self.idle_processes.append(libreoffice_process)
+                self.condition.notify()
+
+    def shutdown(self):
+        with self.condition:
+            idle_processes = self.idle_processes
+            self.idle_processes = []
+
+        for libreoffice_process in idle_processes:
+            self.discard(libreoffice_process=libreoffice_process)
+
+
 @python_2_unicode_compatible
 class Layer(object):
     _registry = {}
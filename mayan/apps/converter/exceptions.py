@@ -20,6 +20,14 @@ class UnkownConvertError(ConvertError):
     pass
 
 
+class LibreOfficePoolError(ConvertError):
+    """
+    Raised when the LibreOffice process pool is unable to perform a
+    conversion and the one-shot conversion method must be used instead.
+    """
+    pass
+
+
 class OfficeConversionError(ConvertError):
     pass
 
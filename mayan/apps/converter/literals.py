@@ -56,6 +56,9 @@ else:
     DEFAULT_PDFINFO_PATH = '/usr/bin/pdfinfo'
     DEFAULT_PDFTOPPM_PATH = '/usr/bin/pdftoppm'
 
+DEFAULT_LIBREOFFICE_POOL_MAXIMUM_CONVERSIONS = 100
+DEFAULT_LIBREOFFICE_POOL_SIZE = 0
+
 DEFAULT_ZOOM_LEVEL = 100
 DEFAULT_ROTATION = 0
 DEFAULT_PAGE_NUMBER = 1
@@ -64,3 +67,20 @@ DEFAULT_PILLOW_MAXIMUM_IMAGE_PIXELS = 89478485  # Upstream default as of v6.2.1
 
 DEFAULT_PDFTOPPM_DPI = 300
 DEFAULT_PDFTOPPM_FORMAT = 'jpeg'  # Possible values jpeg, png, tiff
+
+LIBREOFFICE_POOL_ACQUIRE_TIMEOUT = 120
+LIBREOFFICE_POOL_PDF_EXPORT_FILTERS = (
+    ('com.sun.star.sheet.SpreadsheetDocument', 'calc_pdf_Export'),
+    (
+        'com.sun.star.presentation.PresentationDocument',
+        'impress_pdf_Export'
+    ),
+    ('com.sun.star.drawing.DrawingDocument', 'draw_pdf_Export'),
+    ('com.sun.star.text.TextDocument', 'writer_pdf_Export'),
+)
+LIBREOFFICE_POOL_START_TIMEOUT = 60
+LIBREOFFICE_POOL_TEXT_FILTER_NAME = 'Text (encoded)'
+LIBREOFFICE_POOL_TEXT_FILTER_OPTIONS = 'UTF8,LF,,,'
+
+PDFTOPPM_OUTPUT_POLL_INTERVAL = 0.05
+PDFTOPPM_OUTPUT_ROOT = 'page'
@@ -3,7 +3,8 @@ from django.utils.translation import ugettext_lazy as _
 from mayan.apps.smart_settings.classes import Namespace
 
 from .literals import (
-    DEFAULT_LIBREOFFICE_PATH, DEFAULT_PDFTOPPM_DPI, DEFAULT_PDFTOPPM_FORMAT,
+    DEFAULT_LIBREOFFICE_PATH, DEFAULT_LIBREOFFICE_POOL_MAXIMUM_CONVERSIONS,
+    DEFAULT_LIBREOFFICE_POOL_SIZE, DEFAULT_PDFTOPPM_DPI, DEFAULT_PDFTOPPM_FORMAT,
     DEFAULT_PDFTOPPM_PATH, DEFAULT_PDFINFO_PATH, DEFAULT_PILLOW_FORMAT,
     DEFAULT_PILLOW_MAXIMUM_IMAGE_PIXELS
 )
@@ -32,3 +33,18 @@ setting_graphics_backend_arguments = namespace.add_setting(
         'Configuration options for the graphics conversion backend.'
     ), global_name='CONVERTER_GRAPHICS_BACKEND_ARGUMENTS'
 )
+setting_libreoffice_pool_maximum_conversions = namespace.add_setting(
+    default=DEFAULT_LIBREOFFICE_POOL_MAXIMUM_CONVERSIONS, help_text=_(
+        'Number of conversions after which a pooled LibreOffice process '
+        'is stopped and replaced by a new one.'
+    ), global_name='CONVERTER_LIBREOFFICE_POOL_MAXIMUM_CONVERSIONS'
+)
+setting_libreoffice_pool_size = namespace.add_setting(
+    default=DEFAULT_LIBREOFFICE_POOL_SIZE, help_text=_(
+        'Maximum number of long lived LibreOffice processes kept by each '
+        'worker process to convert office documents concurrently. '
+        'Requires the LibreOffice UNO Python bindings. A value of 0 '
+        'disables the pool and a new LibreOffice process is launched for '
+        'each conversion.'
+    ), global_name='CONVERTER_LIBREOFFICE_POOL_SIZE'
+)
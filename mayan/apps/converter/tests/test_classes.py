@@ -0,0 +1,68 @@
+import mock
+
+from mayan.apps.common.tests.base import BaseTestCase
+
+from ..classes import LibreOfficePool
+from ..exceptions import LibreOfficePoolError
+
+
+class LibreOfficePoolTestCase(BaseTestCase):
+    def setUp(self):
+        super(LibreOfficePoolTestCase, self).setUp()
+        patcher = mock.patch(
+            'mayan.apps.converter.classes.LibreOfficeProcess', autospec=True
+        )
+        self.mock_process_class = patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.mock_process_class.side_effect = self._get_mock_process
+
+    def _get_mock_process(self):
+        libreoffice_process = mock.Mock(conversion_count=0)
+        libreoffice_process.is_alive.return_value = True
+
+        def convert(**kwargs):
+            libreoffice_process.conversion_count += 1
+
+        libreoffice_process.convert.side_effect = convert
+        return libreoffice_process
+
+    def _convert(self, libreoffice_pool):
+        libreoffice_pool.convert(
+            input_filename='input', output_filename='output'
+        )
+
+    def test_process_reuse(self):
+        libreoffice_pool = LibreOfficePool(size=1, maximum_conversions=10)
+
+        self._convert(libreoffice_pool=libreoffice_pool)
+        self._convert(libreoffice_pool=libreoffice_pool)
+
+        self.assertEqual(self.mock_process_class.call_count, 1)
+        self.assertEqual(len(libreoffice_pool.idle_processes), 1)
+
+    def test_process_recycle_after_maximum_conversions(self):
+        libreoffice_pool = LibreOfficePool(size=1, maximum_conversions=2)
+
+        self._convert(libreoffice_pool=libreoffice_pool)
+        self._convert(libreoffice_pool=libreoffice_pool)
+        self._convert(libreoffice_pool=libreoffice_pool)
+
+        self.assertEqual(self.mock_process_class.call_count, 2)
+        self.assertEqual(libreoffice_pool.process_count, 1)
+
+    def test_process_recycle_after_error(self):
+        libreoffice_pool = LibreOfficePool(size=1, maximum_conversions=10)
+        self._convert(libreoffice_pool=libreoffice_pool)
+
+        libreoffice_process = libreoffice_pool.idle_processes[0]
+        libreoffice_process.convert.side_effect = Exception
+
+        with self.assertRaises(LibreOfficePoolError):
+            self._convert(libreoffice_pool=libreoffice_pool)
+
+        self.assertTrue(libreoffice_process.stop.called)
+        self.assertEqual(libreoffice_pool.process_count, 0)
+
+        self._convert(libreoffice_pool=libreoffice_pool)
+        self.assertEqual(self.mock_process_class.call_count, 2)
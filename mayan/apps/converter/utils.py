@@ -1,11 +1,29 @@
 import logging
 
+from PIL import Image
+
 from django.utils.module_loading import import_string
 
-from .settings import setting_graphics_backend
+from .literals import DEFAULT_PILLOW_FORMAT
+from .settings import (
+    setting_graphics_backend, setting_graphics_backend_arguments
+)
 
 logger = logging.getLogger(name=__name__)
 
 
 def get_converter_class():
     return import_string(dotted_path=setting_graphics_backend.value)
+
+
+def get_image_mime_type(output_format=None):
+    """
+    Return the MIME type of the images produced by the converter for the
+    specified output format or the configured default format.
+    """
+    output_format = output_format or setting_graphics_backend_arguments.value.get(
+        'pillow_format', DEFAULT_PILLOW_FORMAT
+    )
+
+    Image.init()
+    return Image.MIME.get(output_format.upper(), 'application/octet-stream')
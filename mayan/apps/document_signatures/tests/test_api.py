@@ -290,6 +290,7 @@ class EmbeddedSignatureDocumentAPIViewTestCase(
         response = self._request_test_document_signature_embedded_sign_view()
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
+        self.test_document.refresh_from_db()
         self.assertEqual(
             self.test_document.latest_version.signatures.count(),
             signatures + 1
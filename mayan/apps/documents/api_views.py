@@ -1,20 +1,30 @@
 import logging
+import time
 
 from django.conf import settings
-from django.http import HttpResponse
 from django.shortcuts import get_object_or_404
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
 from django.views.decorators.cache import cache_control, patch_cache_control
 
 from rest_framework import status
 from rest_framework.response import Response
 
 from mayan.apps.acls.models import AccessControlList
+from mayan.apps.common.compat import FileResponse
+from mayan.apps.converter.utils import get_image_mime_type
+from mayan.apps.lock_manager.exceptions import LockError
+from mayan.apps.lock_manager.runtime import locking_backend
 from mayan.apps.rest_api import generics
 from mayan.apps.common.generics import DownloadMixin
+from mayan.apps.storage.classes import PassthroughStorage
 
-from .literals import DOCUMENT_IMAGE_TASK_TIMEOUT
+from .literals import (
+    DOCUMENT_EXPORT_STATE_FINISHED, DOCUMENT_IMAGE_GENERATION_POLL_INTERVAL,
+    DOCUMENT_IMAGE_TASK_TIMEOUT
+)
 from .models import (
-    DeletedDocument, Document, DocumentType, RecentDocument
+    DeletedDocument, Document, DocumentExport, DocumentType, RecentDocument
 )
 from .permissions import (
     permission_document_create, permission_document_delete,
@@ -27,14 +37,18 @@ from .permissions import (
     permission_document_version_view
 )
 from .serializers import (
-    DeletedDocumentSerializer, DocumentPageSerializer, DocumentSerializer,
-    DocumentTypeSerializer, DocumentVersionSerializer,
-    NewDocumentDocumentTypeSerializer, NewDocumentSerializer,
-    NewDocumentVersionSerializer, RecentDocumentSerializer,
+    DeletedDocumentSerializer, DocumentExportSerializer,
+    DocumentPageSerializer, DocumentSerializer, DocumentTypeSerializer,
+    DocumentVersionSerializer, NewDocumentDocumentTypeSerializer,
+    NewDocumentSerializer, NewDocumentVersionSerializer,
+    RecentDocumentSerializer, WritableDocumentExportSerializer,
     WritableDocumentSerializer, WritableDocumentTypeSerializer,
     WritableDocumentVersionSerializer
 )
-from .settings import settings_document_page_image_cache_time
+from .settings import (
+    setting_disable_transformed_image_cache,
+    settings_document_page_image_cache_time
+)
 from .tasks import task_generate_document_page_image
 
 logger = logging.getLogger(name=__name__)
@@ -105,19 +119,81 @@ class APIDocumentDocumentTypeChangeView(generics.GenericAPIView):
 
 class APIDocumentDownloadView(DownloadMixin, generics.RetrieveAPIView):
     """
-    get: Download the latest version of a document.
+    get: Download the latest version of a document. Supports the Range and
+    If-Range headers for partial downloads and the conditional request
+    headers.
     """
     mayan_object_permissions = {
         'GET': (permission_document_download,)
     }
     queryset = Document.objects.all()
+    range_requests = True
+
+    def get_download_etag(self):
+        return self.object.checksum
+
+    def get_download_file_object(self):
+        return self.object.open(track_access=True)
+
+    def get_download_filename(self):
+        return self.object.label
+
+    def get_download_last_modified(self):
+        return self.object.date_updated
+
+    def get_download_mime_type(self):
+        return self.object.file_mimetype
+
+    def get_serializer(self, *args, **kwargs):
+        return None
+
+    def get_serializer_class(self):
+        return None
+
+    def retrieve(self, request, *args, **kwargs):
+        self.object = self.get_object()
+        return self.render_to_response()
+
+
+class APIDocumentExportCancelView(generics.GenericAPIView):
+    """
+    post: Cancel a queued or running document export.
+    """
+    def get_queryset(self):
+        return DocumentExport.objects.filter(user=self.request.user)
+
+    def get_serializer(self, *args, **kwargs):
+        return None
+
+    def get_serializer_class(self):
+        return None
+
+    def post(self, *args, **kwargs):
+        self.get_object().cancel()
+        return Response(status=status.HTTP_200_OK)
+
+
+class APIDocumentExportDownloadView(DownloadMixin, generics.RetrieveAPIView):
+    """
+    get: Download the compressed file of a finished document export.
+    Supports the Range header to resume interrupted downloads.
+    """
+    range_requests = True
 
     def get_download_file_object(self):
         return self.get_object().open()
 
+    def get_download_file_size(self):
+        return self.get_object().file_size
+
     def get_download_filename(self):
         return self.get_object().label
 
+    def get_queryset(self):
+        return DocumentExport.objects.filter(
+            state=DOCUMENT_EXPORT_STATE_FINISHED, user=self.request.user
+        )
+
     def get_serializer(self, *args, **kwargs):
         return None
 
@@ -128,13 +204,47 @@ class APIDocumentDownloadView(DownloadMixin, generics.RetrieveAPIView):
         return self.render_to_response()
 
 
+class APIDocumentExportListView(generics.ListCreateAPIView):
+    """
+    get: Returns a list of the document exports of the current user.
+    post: Queue the export of a selection of documents. Specify the
+    selection with one of cabinet_id, documents_pk_list,
+    index_instance_node_id or search_query.
+    """
+    def get_queryset(self):
+        return DocumentExport.objects.filter(user=self.request.user)
+
+    def get_serializer(self, *args, **kwargs):
+        if not self.request:
+            return None
+
+        return super(APIDocumentExportListView, self).get_serializer(*args, **kwargs)
+
+    def get_serializer_class(self):
+        if self.request.method == 'GET':
+            return DocumentExportSerializer
+        else:
+            return WritableDocumentExportSerializer
+
+
+class APIDocumentExportView(generics.RetrieveDestroyAPIView):
+    """
+    delete: Delete the document export and its compressed file.
+    get: Return the details of the document export.
+    """
+    serializer_class = DocumentExportSerializer
+
+    def get_queryset(self):
+        return DocumentExport.objects.filter(user=self.request.user)
+
+
 class APIDocumentListView(generics.ListCreateAPIView):
     """
     get: Returns a list of all the documents.
     post: Create a new document.
     """
     mayan_object_permissions = {'GET': (permission_document_view,)}
-    queryset = Document.objects.all()
+    queryset = Document.objects.select_related('latest_version')
 
     def get_serializer(self, *args, **kwargs):
         if not self.request:
@@ -162,6 +272,24 @@ class APIDocumentPageImageView(generics.RetrieveAPIView):
     """
     lookup_url_kwarg = 'page_pk'
 
+    def generate_image(self, document_page, image_kwargs):
+        task = task_generate_document_page_image.apply_async(
+            kwargs=dict(
+                document_page_id=document_page.pk,
+                user_id=self.request.user.pk, **image_kwargs
+            )
+        )
+
+        kwargs = {'timeout': DOCUMENT_IMAGE_TASK_TIMEOUT}
+        if settings.DEBUG:
+            # In debug more, task are run synchronously, causing this method
+            # to be called inside another task. Disable the check of nested
+            # tasks when using debug mode.
+            kwargs['disable_sync_subtasks'] = False
+
+        cache_filename = task.get(**kwargs)
+        return document_page.cache_partition.get_file(filename=cache_filename)
+
     def get_document(self):
         if self.request.method == 'GET':
             permission_required = permission_document_view
@@ -181,6 +309,59 @@ class APIDocumentPageImageView(generics.RetrieveAPIView):
             self.get_document().versions.all(), pk=self.kwargs['version_pk']
         )
 
+    def get_generated_image_cache_file(
+        self, cache_filename, document_page, image_kwargs
+    ):
+        """
+        Generate the image in the converter queue. Concurrent requests for
+        the same image wait for the request that dispatched the task instead
+        of dispatching their own.
+        """
+        if setting_disable_transformed_image_cache.value:
+            return self.generate_image(
+                document_page=document_page, image_kwargs=image_kwargs
+            )
+
+        lock_id = 'document_page_image-{}-{}'.format(
+            document_page.pk, cache_filename[:32]
+        )
+        start_time = time.time()
+
+        while time.time() - start_time < DOCUMENT_IMAGE_TASK_TIMEOUT:
+            try:
+                lock = locking_backend.acquire_lock(
+                    name=lock_id, timeout=DOCUMENT_IMAGE_TASK_TIMEOUT
+                )
+            except LockError:
+                # Another request is generating the same image.
+                cache_file = document_page.cache_partition.get_file(
+                    filename=cache_filename
+                )
+                if cache_file:
+                    return cache_file
+
+                time.sleep(DOCUMENT_IMAGE_GENERATION_POLL_INTERVAL)
+            else:
+                try:
+                    # The image could have been generated by the previous
+                    # lock holder.
+                    return document_page.cache_partition.get_file(
+                        filename=cache_filename
+                    ) or self.generate_image(
+                        document_page=document_page,
+                        image_kwargs=image_kwargs
+                    )
+                finally:
+                    lock.release()
+
+        logger.warning(
+            'Timeout waiting for the concurrent generation of image "%s" '
+            'of document page: %s', cache_filename, document_page
+        )
+        return self.generate_image(
+            document_page=document_page, image_kwargs=image_kwargs
+        )
+
     def get_queryset(self):
         return self.get_document_version().pages_all.all()
 
@@ -208,32 +389,55 @@ class APIDocumentPageImageView(generics.RetrieveAPIView):
         if maximum_layer_order:
             maximum_layer_order = int(maximum_layer_order)
 
-        task = task_generate_document_page_image.apply_async(
-            kwargs=dict(
-                document_page_id=self.get_object().pk, width=width,
-                height=height, zoom=zoom, rotation=rotation,
-                maximum_layer_order=maximum_layer_order,
-                user_id=request.user.pk
-            )
+        document_page = self.get_object()
+        image_kwargs = {
+            'height': height, 'maximum_layer_order': maximum_layer_order,
+            'rotation': rotation, 'width': width, 'zoom': zoom
+        }
+
+        # The transformation hash identifies the image content and is used
+        # as a strong ETag. Matching requests are answered without
+        # accessing the cache storage.
+        cache_filename = document_page.get_image_cache_filename(
+            user=request.user, **image_kwargs
         )
 
-        kwargs = {'timeout': DOCUMENT_IMAGE_TASK_TIMEOUT}
-        if settings.DEBUG:
-            # In debug more, task are run synchronously, causing this method
-            # to be called inside another task. Disable the check of nested
-            # tasks when using debug mode.
-            kwargs['disable_sync_subtasks'] = False
+        response = get_conditional_response(
+            request=request, etag=quote_etag(cache_filename)
+        )
 
-        cache_filename = task.get(**kwargs)
-        cache_file = self.get_object().cache_partition.get_file(filename=cache_filename)
-        with cache_file.open() as file_object:
-            response = HttpResponse(file_object.read(), content_type='image')
-            if '_hash' in request.GET:
-                patch_cache_control(
-                    response=response,
-                    max_age=settings_document_page_image_cache_time.value
+        if response is None:
+            # Serve the image directly if it is already in the cache.
+            cache_file = document_page.get_image_cache_file(
+                cache_filename=cache_filename
+            )
+            if not cache_file:
+                cache_file = self.get_generated_image_cache_file(
+                    cache_filename=cache_filename,
+                    document_page=document_page, image_kwargs=image_kwargs
                 )
-            return response
+
+            response = FileResponse(
+                content_type=get_image_mime_type(),
+                streaming_content=cache_file.open()
+            )
+
+            if isinstance(document_page.cache_partition.cache.storage, PassthroughStorage):
+                # The stored size of passthrough storages does not match
+                # the size of the content.
+                if response.has_header('Content-Length'):
+                    del response['Content-Length']
+            else:
+                response['Content-Length'] = cache_file.file_size
+
+        response['ETag'] = quote_etag(cache_filename)
+        if '_hash' in request.GET:
+            patch_cache_control(
+                response=response,
+                max_age=settings_document_page_image_cache_time.value
+            )
+
+        return response
 
 
 class APIDocumentPageView(generics.RetrieveUpdateAPIView):
@@ -338,9 +542,11 @@ class APIDocumentTypeDocumentListView(generics.ListAPIView):
 
 class APIDocumentVersionDownloadView(DownloadMixin, generics.RetrieveAPIView):
     """
-    get: Download a document version.
+    get: Download a document version. Supports the Range and If-Range
+    headers for partial downloads and the conditional request headers.
     """
     lookup_url_kwarg = 'version_pk'
+    range_requests = True
 
     def get_document(self):
         document = get_object_or_404(Document, pk=self.kwargs['pk'])
@@ -351,9 +557,11 @@ class APIDocumentVersionDownloadView(DownloadMixin, generics.RetrieveAPIView):
         )
         return document
 
+    def get_download_etag(self):
+        return self.object.checksum
+
     def get_download_file_object(self):
-        instance = self.get_object()
-        return instance.open()
+        return self.object.open(track_access=True)
 
     def get_download_filename(self):
         preserve_extension = self.request.GET.get(
@@ -364,11 +572,16 @@ class APIDocumentVersionDownloadView(DownloadMixin, generics.RetrieveAPIView):
 
         preserve_extension = preserve_extension == 'true' or preserve_extension == 'True'
 
-        instance = self.get_object()
-        return instance.get_rendered_string(
+        return self.object.get_rendered_string(
             preserve_extension=preserve_extension
         )
 
+    def get_download_last_modified(self):
+        return self.object.timestamp
+
+    def get_download_mime_type(self):
+        return self.object.mimetype
+
     def get_serializer(self, *args, **kwargs):
         return None
 
@@ -379,6 +592,7 @@ class APIDocumentVersionDownloadView(DownloadMixin, generics.RetrieveAPIView):
         return self.get_document().versions.all()
 
     def retrieve(self, request, *args, **kwargs):
+        self.object = self.get_object()
         return self.render_to_response()
 
 
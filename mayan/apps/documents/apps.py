@@ -37,6 +37,7 @@ from .dashboard_widgets import (
 )
 from .events import (
     event_document_create, event_document_download,
+    event_document_export_finished,
     event_document_properties_edit, event_document_type_changed,
     event_document_type_created, event_document_type_edited,
     event_document_version_new, event_document_version_revert,
@@ -46,6 +47,11 @@ from .handlers import (
     handler_create_default_document_type, handler_create_document_cache,
     handler_remove_empty_duplicates_lists, handler_scan_duplicates_for
 )
+from .links.document_export_links import (
+    link_document_export_cancel, link_document_export_delete,
+    link_document_export_download, link_document_export_list,
+    link_document_multiple_export
+)
 from .links.document_links import (
     link_document_clear_transformations, link_document_clone_transformations,
     link_document_document_type_edit, link_document_download,
@@ -134,6 +140,7 @@ class DocumentsApp(MayanAppConfig):
 
         DeletedDocument = self.get_model(model_name='DeletedDocument')
         Document = self.get_model(model_name='Document')
+        DocumentExport = self.get_model(model_name='DocumentExport')
         DocumentPage = self.get_model(model_name='DocumentPage')
         DocumentPageResult = self.get_model(model_name='DocumentPageResult')
         DocumentType = self.get_model(model_name='DocumentType')
@@ -148,6 +155,7 @@ class DocumentsApp(MayanAppConfig):
 
         EventModelRegistry.register(model=DeletedDocument)
         EventModelRegistry.register(model=Document)
+        EventModelRegistry.register(model=DocumentExport)
         EventModelRegistry.register(model=DocumentType)
         EventModelRegistry.register(model=DocumentVersion)
 
@@ -167,6 +175,9 @@ class DocumentsApp(MayanAppConfig):
                 event_document_type_edited,
             )
         )
+        ModelEventType.register(
+            model=DocumentExport, event_types=(event_document_export_finished,)
+        )
         ModelEventType.register(
             model=Document, event_types=(
                 event_document_download, event_document_properties_edit,
@@ -296,6 +307,34 @@ class DocumentsApp(MayanAppConfig):
             source=Document, views=('documents:duplicated_document_list',)
         )
 
+        # DocumentExport
+        SourceColumn(
+            attribute='label', is_identifier=True, source=DocumentExport
+        )
+        SourceColumn(
+            attribute='datetime_created', include_label=True,
+            is_sortable=True, source=DocumentExport
+        )
+        SourceColumn(
+            attribute='get_state_display', include_label=True,
+            label=_('State'), source=DocumentExport
+        )
+        SourceColumn(
+            attribute='document_count', include_label=True,
+            source=DocumentExport
+        )
+        SourceColumn(
+            attribute='get_progress', include_label=True,
+            source=DocumentExport
+        )
+        SourceColumn(
+            attribute='file_size', include_label=True, source=DocumentExport
+        )
+        SourceColumn(
+            attribute='datetime_expiration', include_label=True,
+            source=DocumentExport
+        )
+
         # DocumentPage
         SourceColumn(
             attribute='get_label', is_identifier=True,
@@ -417,7 +456,7 @@ class DocumentsApp(MayanAppConfig):
                 link_document_list_recent_access,
                 link_document_list_recent_added, link_document_list_favorites,
                 link_document_list, link_document_list_deleted,
-                link_duplicated_document_list,
+                link_duplicated_document_list, link_document_export_list,
             )
         )
 
@@ -486,6 +525,12 @@ class DocumentsApp(MayanAppConfig):
             links=(link_document_restore, link_document_delete),
             sources=(DeletedDocument,)
         )
+        menu_object.bind_links(
+            links=(
+                link_document_export_download, link_document_export_cancel,
+                link_document_export_delete
+            ), sources=(DocumentExport,)
+        )
 
         # Document facet links
         menu_facet.bind_links(
@@ -520,6 +565,7 @@ class DocumentsApp(MayanAppConfig):
                 link_document_multiple_favorites_remove,
                 link_document_multiple_clear_transformations,
                 link_document_multiple_trash, link_document_multiple_download,
+                link_document_multiple_export,
                 link_document_multiple_update_page_count,
                 link_document_multiple_document_type_edit,
             ), sources=(Document,)
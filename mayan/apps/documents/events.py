@@ -10,6 +10,9 @@ event_document_create = namespace.add_event_type(
 event_document_download = namespace.add_event_type(
     label=_('Document downloaded'), name='document_download'
 )
+event_document_export_finished = namespace.add_event_type(
+    label=_('Document export finished'), name='document_export_finished'
+)
 event_document_version_new = namespace.add_event_type(
     label=_('New version uploaded'), name='document_new_version'
 )
@@ -1,3 +1,4 @@
+from .document_export_forms import *  # NOQA
 from .document_forms import *  # NOQA
 from .document_page_forms import *  # NOQA
 from .document_type_forms import *  # NOQA
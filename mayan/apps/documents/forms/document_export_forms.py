@@ -0,0 +1,16 @@
+from django import forms
+from django.utils.translation import ugettext_lazy as _
+
+from ..literals import DEFAULT_ZIP_FILENAME
+
+__all__ = ('DocumentExportCreateForm',)
+
+
+class DocumentExportCreateForm(forms.Form):
+    label = forms.CharField(
+        initial=DEFAULT_ZIP_FILENAME, label=_('Compressed filename'),
+        help_text=_(
+            'The filename of the compressed file that will contain the '
+            'documents to be exported.'
+        ), max_length=255
+    )
@@ -33,6 +33,21 @@ icon_document_edit = Icon(
     driver_name='fontawesome', symbol='pencil-alt'
 )
 icon_document = Icon(driver_name='fontawesome', symbol='book')
+icon_document_export_cancel = Icon(
+    driver_name='fontawesome', symbol='ban'
+)
+icon_document_export_create = Icon(
+    driver_name='fontawesome', symbol='file-archive'
+)
+icon_document_export_delete = Icon(
+    driver_name='fontawesome', symbol='times'
+)
+icon_document_export_download = Icon(
+    driver_name='fontawesome', symbol='download'
+)
+icon_document_export_list = Icon(
+    driver_name='fontawesome', symbol='file-archive'
+)
 icon_document_list = icon_document
 icon_document_page_count_update = Icon(
     driver_name='fontawesome', symbol='copy'
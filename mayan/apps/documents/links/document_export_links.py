@@ -0,0 +1,44 @@
+from django.utils.translation import ugettext_lazy as _
+
+from mayan.apps.navigation.classes import Link
+
+from ..icons import icon_document_export_list
+from ..literals import (
+    DOCUMENT_EXPORT_STATE_QUEUED, DOCUMENT_EXPORT_STATE_RUNNING
+)
+
+
+def is_document_export_finished(context):
+    return context['object'].is_finished
+
+
+def is_document_export_pending(context):
+    return context['object'].state in (
+        DOCUMENT_EXPORT_STATE_QUEUED, DOCUMENT_EXPORT_STATE_RUNNING
+    )
+
+
+link_document_export_cancel = Link(
+    args='object.pk', condition=is_document_export_pending,
+    icon_class_path='mayan.apps.documents.icons.icon_document_export_cancel',
+    text=_('Cancel'), view='documents:document_export_cancel',
+)
+link_document_export_delete = Link(
+    args='object.pk',
+    icon_class_path='mayan.apps.documents.icons.icon_document_export_delete',
+    tags='dangerous', text=_('Delete'),
+    view='documents:document_export_delete',
+)
+link_document_export_download = Link(
+    args='object.pk', condition=is_document_export_finished,
+    icon_class_path='mayan.apps.documents.icons.icon_document_export_download',
+    text=_('Download'), view='documents:document_export_download',
+)
+link_document_export_list = Link(
+    icon_class=icon_document_export_list, text=_('Exports'),
+    view='documents:document_export_list'
+)
+link_document_multiple_export = Link(
+    icon_class_path='mayan.apps.documents.icons.icon_document_export_create',
+    text=_('Export'), view='documents:document_multiple_export'
+)
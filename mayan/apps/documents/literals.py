@@ -4,12 +4,16 @@ from mayan.apps.common.literals import TIME_DELTA_UNIT_DAYS
 
 CHECK_DELETE_PERIOD_INTERVAL = 60
 CHECK_TRASH_PERIOD_INTERVAL = 60
+DELETE_EXPIRED_DOCUMENT_EXPORTS_INTERVAL = 60 * 60  # 1 hour
 DELETE_STALE_STUBS_INTERVAL = 60 * 10  # 10 minutes
 DEFAULT_DELETE_PERIOD = 30
 DEFAULT_DELETE_TIME_UNIT = TIME_DELTA_UNIT_DAYS
 DEFAULT_DOCUMENT_TYPE_LABEL = _('Default')
+DEFAULT_DOCUMENT_EXPORT_EXPIRATION = 60 * 60 * 24  # 24 hours
 DEFAULT_DOCUMENTS_CACHE_MAXIMUM_SIZE = 500 * 2 ** 20  # 500 Megabytes
 DEFAULT_DOCUMENTS_HASH_BLOCK_SIZE = 65535
+DEFAULT_DOCUMENTS_PAGE_IMAGE_BATCH_SIZE = 1
+DEFAULT_DOCUMENTS_STORAGE_TIER_BATCH_SIZE = 100
 DEFAULT_LANGUAGE = 'eng'
 DEFAULT_LANGUAGE_CODES = (
     'ilo', 'run', 'uig', 'hin', 'pan', 'pnb', 'wuu', 'msa', 'kxd', 'ind',
@@ -29,14 +33,41 @@ DEFAULT_LANGUAGE_CODES = (
 )
 DEFAULT_STUB_EXPIRATION_INTERVAL = 60 * 60 * 24  # 24 hours
 DEFAULT_ZIP_FILENAME = 'document_bundle.zip'
+DOCUMENT_EXPORT_FILENAME = 'document_export_{}.zip'
+DOCUMENT_IMAGE_GENERATION_POLL_INTERVAL = 0.2
 DOCUMENT_IMAGE_TASK_TIMEOUT = 120
+DOCUMENT_PAGE_BASE_IMAGE_CACHE_FILENAME = 'base_image'
+DOCUMENT_PAGE_BULK_CREATE_BATCH_SIZE = 500
+DOCUMENT_VERSION_ACCESS_UPDATE_INTERVAL = 60 * 60  # 1 hour
+DOCUMENT_VERSION_CONTENT_ADDRESSED_NAME = 'content/{prefix}/{checksum}'
+DOCUMENT_VERSION_FILE_LOCK_NAME = 'document_version_file-{checksum}'
+DOCUMENT_VERSION_FILE_LOCK_POLL_INTERVAL = 0.2
+DOCUMENT_VERSION_FILE_LOCK_TIMEOUT = 60 * 10
+DOCUMENT_VERSION_FILE_LOCK_WAIT = 60
+DOCUMENT_VERSION_INTERMEDIATE_CACHE_FILENAME = 'intermediate_file'
+DUPLICATED_DOCUMENT_SCAN_CHUNK_SIZE = 500
+MIGRATE_STORAGE_TIERS_INTERVAL = 60 * 60  # 1 hour
 UPDATE_PAGE_COUNT_RETRY_DELAY = 10
 UPLOAD_NEW_VERSION_RETRY_DELAY = 10
 
+DOCUMENT_EXPORT_STATE_CANCELED = 'canceled'
+DOCUMENT_EXPORT_STATE_FAILED = 'failed'
+DOCUMENT_EXPORT_STATE_FINISHED = 'finished'
+DOCUMENT_EXPORT_STATE_QUEUED = 'queued'
+DOCUMENT_EXPORT_STATE_RUNNING = 'running'
+DOCUMENT_EXPORT_STATE_CHOICES = (
+    (DOCUMENT_EXPORT_STATE_QUEUED, _('Queued')),
+    (DOCUMENT_EXPORT_STATE_RUNNING, _('Running')),
+    (DOCUMENT_EXPORT_STATE_FINISHED, _('Finished')),
+    (DOCUMENT_EXPORT_STATE_FAILED, _('Failed')),
+    (DOCUMENT_EXPORT_STATE_CANCELED, _('Canceled')),
+)
+
 PAGE_RANGE_ALL = 'all'
 PAGE_RANGE_RANGE = 'range'
 PAGE_RANGE_CHOICES = (
     (PAGE_RANGE_ALL, _('All pages')), (PAGE_RANGE_RANGE, _('Page range'))
 )
+STORAGE_NAME_DOCUMENT_EXPORT = 'documents__documentexport'
 STORAGE_NAME_DOCUMENT_IMAGE = 'documents__documentimagecache'
 STORAGE_NAME_DOCUMENT_VERSION = 'documents__documentversion'
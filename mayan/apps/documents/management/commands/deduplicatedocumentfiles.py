@@ -0,0 +1,34 @@
+from django.core import management
+
+from ...models import DocumentVersion
+
+
+class Command(management.BaseCommand):
+    help = (
+        'Store the files of the existing document versions under their '
+        'checksum, sharing a single file between the versions with '
+        'identical content.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--statistics', action='store_true', dest='statistics',
+            default=False, help='Only show the statistics of the shared '
+            'files without converting the existing files.'
+        )
+
+    def handle(self, *args, **options):
+        if not options['statistics']:
+            version_count, reclaimed_size = DocumentVersion.objects.deduplicate_files()
+            self.stdout.write(
+                'Document versions processed: {}, bytes reclaimed: {}'.format(
+                    version_count, reclaimed_size
+                )
+            )
+
+        statistics = DocumentVersion.objects.get_file_statistics()
+        self.stdout.write(
+            'Document versions: {version_count}, stored files: '
+            '{file_count}, shared files: {shared_file_count}, bytes saved '
+            'by shared files: {reclaimed_size}'.format(**statistics)
+        )
@@ -0,0 +1,26 @@
+from django.core import management
+
+from ...models import Document, DocumentVersion
+
+
+class Command(management.BaseCommand):
+    help = (
+        'Recalculate the stored page count of the document versions and '
+        'the stored latest version of the documents, updating only the '
+        'entries that are out of sync.'
+    )
+
+    def handle(self, *args, **options):
+        repaired_version_count = DocumentVersion.objects.repair_page_counts()
+        self.stdout.write(
+            'Document versions with repaired page count: {}'.format(
+                repaired_version_count
+            )
+        )
+
+        repaired_document_count = Document.passthrough.repair_latest_versions()
+        self.stdout.write(
+            'Documents with repaired latest version: {}'.format(
+                repaired_document_count
+            )
+        )
@@ -0,0 +1,75 @@
+from django.core import management
+
+from ...models import Document
+from ...tasks import task_warm_document_cache
+
+
+class Command(management.BaseCommand):
+    help = (
+        'Render the base, display, preview and thumbnail page images of '
+        'the selected documents ahead of time.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--date-added-from', action='store', dest='date_added_from',
+            help='Only warm documents added on or after this date '
+            '(YYYY-MM-DD).'
+        )
+        parser.add_argument(
+            '--date-added-to', action='store', dest='date_added_to',
+            help='Only warm documents added on or before this date '
+            '(YYYY-MM-DD).'
+        )
+        parser.add_argument(
+            '--document-type', action='append', dest='document_type_id_list',
+            help='ID of a document type to warm. Can be specified multiple '
+            'times.', type=int
+        )
+        parser.add_argument(
+            '--foreground', action='store_true', dest='foreground',
+            default=False, help='Render the images in this process instead '
+            'of dispatching a task per document to the converter queue.'
+        )
+        parser.add_argument(
+            '--index-node', action='store', dest='index_instance_node_id',
+            help='ID of an index instance node. Only warm the documents of '
+            'this node and its children.', type=int
+        )
+        parser.add_argument(
+            '--start-id', action='store', dest='start_id',
+            help='Resume an interrupted warming from this document ID.',
+            type=int
+        )
+
+    def handle(self, *args, **options):
+        queryset = Document.objects.get_for_cache_warming(
+            date_added_from=options['date_added_from'],
+            date_added_to=options['date_added_to'],
+            document_type_id_list=options['document_type_id_list'],
+            index_instance_node_id=options['index_instance_node_id'],
+            start_id=options['start_id']
+        )
+        total = queryset.count()
+
+        for index, document in enumerate(queryset.iterator(), 1):
+            if options['foreground']:
+                document_version = document.latest_version
+                rendered_count = 0
+                if document_version:
+                    rendered_count = document_version.warm_cache()
+
+                self.stdout.write(
+                    '[{}/{}] Document ID {}: {} page images rendered.'.format(
+                        index, total, document.pk, rendered_count
+                    )
+                )
+            else:
+                task_warm_document_cache.apply_async(
+                    kwargs={'document_id': document.pk}
+                )
+                self.stdout.write(
+                    '[{}/{}] Document ID {}: submitted.'.format(
+                        index, total, document.pk
+                    )
+                )
@@ -3,15 +3,27 @@ import logging
 
 from django.apps import apps
 from django.contrib.auth import get_user_model
-from django.db import models
-from django.db.models import F, Max
+from django.db import models, transaction
+from django.db.models import (
+    Count, F, IntegerField, Max, OuterRef, Q, Subquery
+)
+from django.db.models.functions import Coalesce
 from django.utils.encoding import force_text
 from django.utils.timezone import now
 
+from mayan.apps.storage.classes import DefinedStorage
+from mayan.apps.storage.literals import STORAGE_TIER_FILE_NAME_PREFIX
+from mayan.apps.storage.utils import copy_tier_file
+
+from .literals import (
+    DUPLICATED_DOCUMENT_SCAN_CHUNK_SIZE, STORAGE_NAME_DOCUMENT_VERSION
+)
 from .settings import (
     setting_favorite_count, setting_recent_access_count,
     setting_stub_expiration_interval
 )
+from .tasks import task_document_export
+from .utils import lock_document_version_file
 
 logger = logging.getLogger(name=__name__)
 
@@ -20,12 +32,81 @@ class DocumentManager(models.Manager):
     def get_by_natural_key(self, uuid):
         return self.model.passthrough.get(uuid=force_text(uuid))
 
+    def get_for_cache_warming(
+        self, date_added_from=None, date_added_to=None,
+        document_type_id_list=None, index_instance_node_id=None,
+        start_id=None
+    ):
+        """
+        Return the documents selected for page image cache warming sorted
+        by ID, allowing an interrupted warming to be resumed from the last
+        document ID processed.
+        """
+        queryset = self.get_queryset()
+
+        if date_added_from:
+            queryset = queryset.filter(date_added__date__gte=date_added_from)
+
+        if date_added_to:
+            queryset = queryset.filter(date_added__date__lte=date_added_to)
+
+        if document_type_id_list:
+            queryset = queryset.filter(
+                document_type_id__in=document_type_id_list
+            )
+
+        if index_instance_node_id:
+            IndexInstanceNode = apps.get_model(
+                app_label='document_indexing',
+                model_name='IndexInstanceNode'
+            )
+            index_instance_node = IndexInstanceNode.objects.get(
+                pk=index_instance_node_id
+            )
+            queryset = queryset.filter(
+                index_instance_nodes__in=index_instance_node.get_descendants(
+                    include_self=True
+                )
+            ).distinct()
+
+        if start_id:
+            queryset = queryset.filter(pk__gte=start_id)
+
+        return queryset.order_by('pk')
+
     def get_queryset(self):
         return TrashCanQuerySet(
             model=self.model, using=self._db
         ).filter(in_trash=False).filter(is_stub=False)
 
 
+class DocumentExportManager(models.Manager):
+    def create_for(self, label, queryset, user):
+        """
+        Create an export of the documents of the queryset and queue the
+        task that writes the archive. The selection is stored at creation
+        time so that later changes to the source of the queryset do not
+        alter the contents of the export.
+        """
+        with transaction.atomic():
+            document_export = self.create(label=label, user=user)
+            document_export.documents.add(
+                *queryset.values_list('pk', flat=True)
+            )
+            document_export.document_count = document_export.documents.count()
+            document_export.save(update_fields=('document_count',))
+
+        task_document_export.apply_async(
+            kwargs={'document_export_id': document_export.pk}
+        )
+
+        return document_export
+
+    def delete_expired(self):
+        for document_export in self.filter(datetime_expiration__lt=now()):
+            document_export.delete()
+
+
 class DocumentPageManager(models.Manager):
     def get_by_natural_key(self, page_number, document_version_natural_key):
         DocumentVersion = apps.get_model(
@@ -112,6 +193,43 @@ class DocumentTypeManager(models.Manager):
 
 
 class DocumentVersionManager(models.Manager):
+    def _get_storage_tier_query(self, policy):
+        query = Q()
+
+        if policy.get('inactive_days'):
+            timestamp_limit = now() - timedelta(days=policy['inactive_days'])
+            query &= Q(timestamp_accessed__lt=timestamp_limit) | Q(
+                timestamp_accessed__isnull=True, timestamp__lt=timestamp_limit
+            )
+
+        if policy.get('non_latest'):
+            query &= ~Q(document__latest_version=F('pk'))
+
+        return query
+
+    def deduplicate_files(self):
+        """
+        Move the files of the existing versions to their content addressed
+        names, sharing the files of the versions with identical content.
+        Returns the number of versions processed and the storage space
+        reclaimed.
+        """
+        reclaimed_size = 0
+        version_count = 0
+
+        for document_version in self.exclude(checksum=None).order_by('pk').iterator():
+            try:
+                reclaimed_size += document_version.store_content_addressed()
+            except Exception as exception:
+                logger.error(
+                    'Error storing the file of document version %d by its '
+                    'checksum; %s', document_version.pk, exception
+                )
+            else:
+                version_count += 1
+
+        return version_count, reclaimed_size
+
     def get_by_natural_key(self, checksum, document_natural_key):
         Document = apps.get_model(
             app_label='documents', model_name='Document'
@@ -123,6 +241,171 @@ class DocumentVersionManager(models.Manager):
 
         return self.get(document__pk=document.pk, checksum=checksum)
 
+    def get_file_statistics(self):
+        """
+        Return the number of versions, of stored files and of files shared
+        by more than one version, and the storage space saved by sharing
+        files.
+        """
+        file_reference_counts = self.order_by().values('file').annotate(
+            reference_count=Count('pk')
+        )
+        reclaimed_size = 0
+        shared_file_count = 0
+
+        for entry in file_reference_counts.filter(reference_count__gt=1):
+            shared_file_count += 1
+            document_version = self.filter(file=entry['file']).first()
+            reclaimed_size += document_version.file.storage.size(
+                entry['file']
+            ) * (entry['reference_count'] - 1)
+
+        return {
+            'file_count': file_reference_counts.count(),
+            'reclaimed_size': reclaimed_size,
+            'shared_file_count': shared_file_count,
+            'version_count': self.count()
+        }
+
+    def get_storage_tier_querysets(self):
+        """
+        Return a list of tuples with each storage tier, from the coldest to
+        the warmest, and the queryset of the versions whose files belong
+        in it. The last tuple has None as the tier and the versions whose
+        files belong in the main storage. Tiers without a policy only
+        receive files moved explicitly.
+        """
+        defined_storage = DefinedStorage.get(
+            name=STORAGE_NAME_DOCUMENT_VERSION
+        )
+        colder_query = None
+        result = []
+
+        for tier in reversed(list(defined_storage.tiers.values())):
+            if tier.policy:
+                query = self._get_storage_tier_query(policy=tier.policy)
+                queryset = self.filter(query)
+
+                if colder_query is None:
+                    colder_query = query
+                else:
+                    queryset = queryset.exclude(colder_query)
+                    colder_query |= query
+
+                result.append((tier, queryset))
+
+        if colder_query is None:
+            result.append((None, self.all()))
+        else:
+            result.append((None, self.exclude(colder_query)))
+
+        return result
+
+    def migrate_storage_tiers(self, batch_size):
+        """
+        Move up to batch_size files to the storage tier selected by the
+        tier policies. The references of the versions are updated before
+        the original file is deleted. Files shared by versions that
+        belong in different tiers are left in place. Returns the number
+        of files moved.
+        """
+        file_count = 0
+        storage = self.model._meta.get_field(field_name='file').storage
+
+        for tier, queryset in self.get_storage_tier_querysets():
+            if tier:
+                candidate_queryset = queryset.exclude(
+                    file__startswith=tier.get_file_name(file_name='')
+                )
+                tier_name = tier.tier_name
+            else:
+                candidate_queryset = queryset.filter(
+                    file__startswith=STORAGE_TIER_FILE_NAME_PREFIX
+                )
+                tier_name = None
+
+            file_names = candidate_queryset.order_by('file').values_list(
+                'file', flat=True
+            ).distinct()
+
+            # Moved files leave the candidate list, the files skipped
+            # remain at its start.
+            skipped_count = 0
+            while file_count < batch_size:
+                file_name_list = list(
+                    file_names[
+                        skipped_count:skipped_count + batch_size - file_count
+                    ]
+                )
+                if not file_name_list:
+                    break
+
+                for file_name in file_name_list:
+                    checksum = self.filter(file=file_name).values_list(
+                        'checksum', flat=True
+                    ).first()
+
+                    try:
+                        # Check the references again while holding the
+                        # lock, other versions might have gained a
+                        # reference to the file since the list was read.
+                        with lock_document_version_file(checksum=checksum):
+                            if not self.filter(file=file_name).exists() or self.filter(file=file_name).exclude(pk__in=queryset.values('pk')).exists():
+                                skipped_count += 1
+                                continue
+
+                            new_file_name = copy_tier_file(
+                                defined_storage_name=STORAGE_NAME_DOCUMENT_VERSION,
+                                file_name=file_name, tier_name=tier_name
+                            )
+                            self.filter(file=file_name).update(
+                                file=new_file_name
+                            )
+                            storage.delete(name=file_name)
+                    except Exception as exception:
+                        logger.error(
+                            'Error moving document version file "%s" to '
+                            'the storage tier "%s"; %s', file_name,
+                            tier_name, exception
+                        )
+                        skipped_count += 1
+                    else:
+                        file_count += 1
+
+        return file_count
+
+    def repair_page_counts(self):
+        """
+        Compare the page count of every version against its enabled pages
+        using a single query and update only the mismatched versions.
+        Returns the number of versions repaired.
+        """
+        DocumentPage = apps.get_model(
+            app_label='documents', model_name='DocumentPage'
+        )
+
+        page_count_subquery = DocumentPage.objects.filter(
+            document_version=OuterRef('pk')
+        ).order_by().values('document_version').annotate(
+            count=Count('pk')
+        ).values('count')
+
+        queryset = self.annotate(
+            actual_page_count=Coalesce(
+                Subquery(
+                    output_field=IntegerField(), queryset=page_count_subquery
+                ), 0
+            )
+        ).values_list('pk', 'page_count', 'actual_page_count')
+
+        repaired_count = 0
+        for pk, page_count, actual_page_count in queryset.iterator():
+            if page_count != actual_page_count:
+                self.filter(pk=pk).update(page_count=actual_page_count)
+                repaired_count += 1
+
+        return repaired_count
+
 
 class DuplicatedDocumentManager(models.Manager):
     def clean_empty_duplicate_lists(self):
@@ -140,45 +423,114 @@ class DuplicatedDocumentManager(models.Manager):
 
     def scan(self):
         """
-        Find duplicates by iterating over all documents and then
-        find matching latest version checksums
+        Find all the duplicate groups with a single query grouping the
+        documents by the checksum of their latest version and rewrite the
+        duplicate lists one chunk of checksums at a time. Lists of documents
+        that are no longer duplicated are removed at the end.
         """
         Document = apps.get_model(
             app_label='documents', model_name='Document'
         )
 
-        for document in Document.objects.all():
-            self.scan_for(document=document, scan_children=False)
+        last_stale_id = self.aggregate(Max('pk'))['pk__max'] or 0
+
+        checksums = Document.objects.filter(
+            latest_version__checksum__isnull=False
+        ).values('latest_version__checksum').annotate(
+            document_count=Count('pk')
+        ).filter(document_count__gt=1).order_by(
+            'latest_version__checksum'
+        ).values_list('latest_version__checksum', flat=True)
 
-    def scan_for(self, document, scan_children=True):
+        checksum_list = []
+        for checksum in checksums.iterator():
+            checksum_list.append(checksum)
+            if len(checksum_list) == DUPLICATED_DOCUMENT_SCAN_CHUNK_SIZE:
+                self.update_checksum_groups(checksum_list=checksum_list)
+                checksum_list = []
+
+        if checksum_list:
+            self.update_checksum_groups(checksum_list=checksum_list)
+
+        # Lists rewritten above have new IDs, the remaining older lists
+        # belong to documents that are no longer duplicated.
+        self.filter(pk__lte=last_stale_id).delete()
+
+    def scan_for(self, document):
         """
-        Find duplicates by matching latest version checksums
+        Update only the duplicate groups affected by the latest version
+        checksum of the document: the group the document joins and the
+        group it was previously part of.
         """
-        if not document.latest_version:
-            return None
-
         Document = apps.get_model(
             app_label='documents', model_name='Document'
         )
 
-        # Get the documents whose latest version matches the checksum
-        # of the current document and exclude the current document
-        duplicates = Document.objects.annotate(
-            max_timestamp=Max('versions__timestamp')
-        ).filter(
-            versions__timestamp=F('max_timestamp'),
-            versions__checksum=document.checksum
-        ).exclude(pk=document.pk)
-
-        if duplicates.exists():
-            instance, created = self.get_or_create(document=document)
-            instance.documents.add(*duplicates)
-        else:
+        previous_document_id_list = list(
+            self.filter(document=document).exclude(
+                documents=None
+            ).values_list('documents', flat=True)
+        )
+
+        checksum_list = set(
+            Document.objects.filter(
+                pk__in=previous_document_id_list + [document.pk]
+            ).exclude(latest_version__checksum=None).values_list(
+                'latest_version__checksum', flat=True
+            )
+        )
+
+        with transaction.atomic():
             self.filter(document=document).delete()
+            self.update_checksum_groups(checksum_list=checksum_list)
+
+    def update_checksum_groups(self, checksum_list):
+        """
+        Recreate the duplicate lists of every document whose latest version
+        has one of the checksums provided using bulk queries.
+        """
+        Document = apps.get_model(
+            app_label='documents', model_name='Document'
+        )
+        DocumentListThrough = self.model.documents.through
+
+        checksum_groups = {}
+        for document_id, checksum in Document.objects.filter(
+            latest_version__checksum__in=checksum_list
+        ).values_list('pk', 'latest_version__checksum').order_by().iterator():
+            checksum_groups.setdefault(checksum, []).append(document_id)
+
+        document_groups = {}
+        for document_id_list in checksum_groups.values():
+            if len(document_id_list) > 1:
+                for document_id in document_id_list:
+                    document_groups[document_id] = document_id_list
+
+        with transaction.atomic():
+            self.filter(
+                document_id__in=[
+                    document_id for document_id_list in checksum_groups.values() for document_id in document_id_list
+                ]
+            ).delete()
+
+            self.bulk_create(
+                batch_size=DUPLICATED_DOCUMENT_SCAN_CHUNK_SIZE, objs=[
+                    self.model(document_id=document_id) for document_id in document_groups
+                ]
+            )
 
-        if scan_children:
-            for document in duplicates:
-                self.scan_for(document=document, scan_children=False)
+            # bulk_create does not return the IDs on every database
+            # backend, fetch them to create the list entries.
+            DocumentListThrough.objects.bulk_create(
+                batch_size=DUPLICATED_DOCUMENT_SCAN_CHUNK_SIZE, objs=[
+                    DocumentListThrough(
+                        document_id=duplicate_document_id,
+                        duplicateddocument_id=duplicated_document_id
+                    ) for duplicated_document_id, document_id in self.filter(
+                        document_id__in=document_groups
+                    ).values_list('pk', 'document_id') for duplicate_document_id in document_groups[document_id] if duplicate_document_id != document_id
+                ]
+            )
 
 
 class FavoriteDocumentManager(models.Manager):
@@ -223,6 +575,37 @@ class PassthroughManager(models.Manager):
         for stale_stub_document in self.filter(is_stub=True, date_added__lt=now() - timedelta(seconds=setting_stub_expiration_interval.value)):
             stale_stub_document.delete(to_trash=False)
 
+    def repair_latest_versions(self):
+        """
+        Compare the latest version reference of every document, including
+        trashed documents and stubs, against its versions using a single
+        query and update only the mismatched documents. Returns the number
+        of documents repaired.
+        """
+        DocumentVersion = apps.get_model(
+            app_label='documents', model_name='DocumentVersion'
+        )
+
+        latest_version_subquery = DocumentVersion.objects.filter(
+            document=OuterRef('pk')
+        ).order_by('-timestamp', '-pk').values('pk')[:1]
+
+        queryset = self.annotate(
+            actual_latest_version_id=Subquery(
+                output_field=IntegerField(), queryset=latest_version_subquery
+            )
+        ).values_list('pk', 'latest_version_id', 'actual_latest_version_id')
+
+        repaired_count = 0
+        for pk, latest_version_id, actual_latest_version_id in queryset.iterator():
+            if latest_version_id != actual_latest_version_id:
+                self.filter(pk=pk).update(
+                    latest_version_id=actual_latest_version_id
+                )
+                repaired_count += 1
+
+        return repaired_count
+
 
 class RecentDocumentManager(models.Manager):
     def add_document_for_user(self, user, document):
@@ -0,0 +1,86 @@
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+import django.db.models.deletion
+
+
+def code_populate_document_latest_version(apps, schema_editor):
+    Document = apps.get_model(
+        app_label='documents', model_name='Document'
+    )
+    DocumentVersion = apps.get_model(
+        app_label='documents', model_name='DocumentVersion'
+    )
+
+    latest_version_subquery = DocumentVersion.objects.using(
+        schema_editor.connection.alias
+    ).filter(document=OuterRef('pk')).order_by(
+        '-timestamp', '-pk'
+    ).values('pk')[:1]
+
+    Document.objects.using(schema_editor.connection.alias).update(
+        latest_version=Subquery(queryset=latest_version_subquery)
+    )
+
+
+def code_populate_document_version_page_count(apps, schema_editor):
+    DocumentPage = apps.get_model(
+        app_label='documents', model_name='DocumentPage'
+    )
+    DocumentVersion = apps.get_model(
+        app_label='documents', model_name='DocumentVersion'
+    )
+
+    page_count_subquery = DocumentPage.objects.using(
+        schema_editor.connection.alias
+    ).filter(
+        document_version=OuterRef('pk'), enabled=True
+    ).order_by().values('document_version').annotate(
+        count=Count('pk')
+    ).values('count')
+
+    DocumentVersion.objects.using(schema_editor.connection.alias).update(
+        page_count=Coalesce(
+            Subquery(
+                output_field=models.IntegerField(),
+                queryset=page_count_subquery
+            ), 0
+        )
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('documents', '0054_trasheddocument'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='document',
+            name='latest_version',
+            field=models.ForeignKey(
+                blank=True, editable=False, help_text='The most recent '
+                'version of the document. Kept up to date when versions are '
+                'added, deleted or reverted.', null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name='+', to='documents.DocumentVersion',
+                verbose_name='Latest version'
+            ),
+        ),
+        migrations.AddField(
+            model_name='documentversion',
+            name='page_count',
+            field=models.PositiveIntegerField(
+                default=0, editable=False, help_text='The number of enabled '
+                'pages of the document version.', verbose_name='Page count'
+            ),
+        ),
+        migrations.RunPython(
+            code=code_populate_document_latest_version,
+            reverse_code=migrations.RunPython.noop
+        ),
+        migrations.RunPython(
+            code=code_populate_document_version_page_count,
+            reverse_code=migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,105 @@
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import mayan.apps.storage.classes
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('documents', '0055_denormalized_fields'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DocumentExport',
+            fields=[
+                (
+                    'id', models.AutoField(
+                        auto_created=True, primary_key=True, serialize=False,
+                        verbose_name='ID'
+                    )
+                ),
+                (
+                    'label', models.CharField(
+                        help_text='Filename of the archive when downloaded.',
+                        max_length=255, verbose_name='Label'
+                    )
+                ),
+                (
+                    'datetime_created', models.DateTimeField(
+                        auto_now_add=True, db_index=True,
+                        verbose_name='Date time created'
+                    )
+                ),
+                (
+                    'datetime_expiration', models.DateTimeField(
+                        blank=True, db_index=True, editable=False,
+                        help_text='Date and time after which the export and '
+                        'its archive file will be deleted.', null=True,
+                        verbose_name='Date time expiration'
+                    )
+                ),
+                (
+                    'state', models.CharField(
+                        choices=[
+                            ('queued', 'Queued'), ('running', 'Running'),
+                            ('finished', 'Finished'), ('failed', 'Failed'),
+                            ('canceled', 'Canceled')
+                        ], db_index=True, default='queued', editable=False,
+                        max_length=8, verbose_name='State'
+                    )
+                ),
+                (
+                    'document_count', models.PositiveIntegerField(
+                        default=0, editable=False,
+                        verbose_name='Document count'
+                    )
+                ),
+                (
+                    'processed_count', models.PositiveIntegerField(
+                        default=0, editable=False,
+                        verbose_name='Processed count'
+                    )
+                ),
+                (
+                    'file', models.FileField(
+                        blank=True, editable=False,
+                        storage=mayan.apps.storage.classes.FakeStorageSubclass(),
+                        upload_to='', verbose_name='File'
+                    )
+                ),
+                (
+                    'file_size', models.BigIntegerField(
+                        default=0, editable=False,
+                        help_text='Size in bytes.', verbose_name='File size'
+                    )
+                ),
+                (
+                    'error_message', models.TextField(
+                        blank=True, editable=False,
+                        verbose_name='Error message'
+                    )
+                ),
+                (
+                    'documents', models.ManyToManyField(
+                        related_name='exports', to='documents.Document',
+                        verbose_name='Documents'
+                    )
+                ),
+                (
+                    'user', models.ForeignKey(
+                        editable=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name='document_exports',
+                        to=settings.AUTH_USER_MODEL, verbose_name='User'
+                    )
+                ),
+            ],
+            options={
+                'ordering': ('-datetime_created',),
+                'verbose_name': 'Document export',
+                'verbose_name_plural': 'Document exports',
+            },
+        ),
+    ]
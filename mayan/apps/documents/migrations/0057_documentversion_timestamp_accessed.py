@@ -0,0 +1,20 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('documents', '0056_document_export'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='documentversion',
+            name='timestamp_accessed',
+            field=models.DateTimeField(
+                blank=True, db_index=True, editable=False, help_text='The '
+                'server date and time when the file of the document version '
+                'was last read. Used by the storage tier policies.',
+                null=True, verbose_name='Last accessed'
+            ),
+        ),
+    ]
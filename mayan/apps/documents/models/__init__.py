@@ -1,3 +1,4 @@
+from .document_export_models import *  # NOQA
 from .document_models import *  # NOQA
 from .document_page_models import *  # NOQA
 from .document_type_models import *  # NOQA
@@ -0,0 +1,212 @@
+from datetime import timedelta
+import logging
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import models
+from django.utils.encoding import force_text, python_2_unicode_compatible
+from django.utils.timezone import now
+from django.utils.translation import ugettext_lazy as _
+
+from mayan.apps.common.compressed_files import ZipArchiveStream
+from mayan.apps.storage.classes import DefinedStorageLazy
+
+from ..events import event_document_export_finished
+from ..literals import (
+    DOCUMENT_EXPORT_FILENAME, DOCUMENT_EXPORT_STATE_CANCELED,
+    DOCUMENT_EXPORT_STATE_CHOICES, DOCUMENT_EXPORT_STATE_FAILED,
+    DOCUMENT_EXPORT_STATE_FINISHED, DOCUMENT_EXPORT_STATE_QUEUED,
+    DOCUMENT_EXPORT_STATE_RUNNING, STORAGE_NAME_DOCUMENT_EXPORT
+)
+from ..managers import DocumentExportManager
+from ..settings import setting_export_expiration
+
+from .document_models import Document
+
+__all__ = ('DocumentExport',)
+logger = logging.getLogger(name=__name__)
+
+
+@python_2_unicode_compatible
+class DocumentExport(models.Model):
+    """
+    Model to keep track of the asynchronous export of a selection of
+    documents as a single ZIP archive.
+    """
+    user = models.ForeignKey(
+        editable=False, on_delete=models.CASCADE,
+        related_name='document_exports', to=settings.AUTH_USER_MODEL,
+        verbose_name=_('User')
+    )
+    label = models.CharField(
+        help_text=_('Filename of the archive when downloaded.'),
+        max_length=255, verbose_name=_('Label')
+    )
+    documents = models.ManyToManyField(
+        related_name='exports', to=Document, verbose_name=_('Documents')
+    )
+    datetime_created = models.DateTimeField(
+        auto_now_add=True, db_index=True, verbose_name=_('Date time created')
+    )
+    datetime_expiration = models.DateTimeField(
+        blank=True, db_index=True, editable=False, help_text=_(
+            'Date and time after which the export and its archive file '
+            'will be deleted.'
+        ), null=True, verbose_name=_('Date time expiration')
+    )
+    state = models.CharField(
+        choices=DOCUMENT_EXPORT_STATE_CHOICES, db_index=True,
+        default=DOCUMENT_EXPORT_STATE_QUEUED, editable=False, max_length=8,
+        verbose_name=_('State')
+    )
+    document_count = models.PositiveIntegerField(
+        default=0, editable=False, verbose_name=_('Document count')
+    )
+    processed_count = models.PositiveIntegerField(
+        default=0, editable=False, verbose_name=_('Processed count')
+    )
+    file = models.FileField(
+        blank=True, editable=False,
+        storage=DefinedStorageLazy(name=STORAGE_NAME_DOCUMENT_EXPORT),
+        upload_to='', verbose_name=_('File')
+    )
+    file_size = models.BigIntegerField(
+        default=0, editable=False, help_text=_('Size in bytes.'),
+        verbose_name=_('File size')
+    )
+    error_message = models.TextField(
+        blank=True, editable=False, verbose_name=_('Error message')
+    )
+
+    objects = DocumentExportManager()
+
+    class Meta:
+        ordering = ('-datetime_created',)
+        verbose_name = _('Document export')
+        verbose_name_plural = _('Document exports')
+
+    def __str__(self):
+        return self.label
+
+    def cancel(self):
+        """
+        Mark a queued or running export as canceled. A running export
+        stops after the document being archived and deletes the partial
+        archive file.
+        """
+        DocumentExport.objects.filter(
+            pk=self.pk, state__in=(
+                DOCUMENT_EXPORT_STATE_QUEUED, DOCUMENT_EXPORT_STATE_RUNNING
+            )
+        ).update(
+            datetime_expiration=self.get_expiration(),
+            state=DOCUMENT_EXPORT_STATE_CANCELED
+        )
+        self.refresh_from_db()
+
+    def delete(self, *args, **kwargs):
+        if self.file.name:
+            self.file.storage.delete(name=self.file.name)
+
+        return super(DocumentExport, self).delete(*args, **kwargs)
+
+    def export(self):
+        """
+        Write the documents to a ZIP archive in the export storage one
+        chunk at a time. The progress is updated after each document,
+        which is also when a cancellation is detected.
+        """
+        queryset = DocumentExport.objects.filter(pk=self.pk)
+
+        if not queryset.filter(state=DOCUMENT_EXPORT_STATE_QUEUED).update(state=DOCUMENT_EXPORT_STATE_RUNNING):
+            logger.debug(
+                'Document export %d is not queued, skipping.', self.pk
+            )
+            return
+
+        storage = self.file.storage
+        name = None
+
+        try:
+            # Since open "wb" doesn't create the storage directories,
+            # force the creation of an empty file.
+            name = storage.save(
+                name=DOCUMENT_EXPORT_FILENAME.format(self.pk),
+                content=ContentFile(content='')
+            )
+            queryset.update(file=name)
+
+            zip_archive_stream = ZipArchiveStream()
+            processed_count = 0
+            is_canceled = False
+
+            with storage.open(name=name, mode='wb') as file_object:
+                for document in self.documents.order_by('pk'):
+                    with document.open(
+                        track_access=True
+                    ) as document_file_object:
+                        for chunk in zip_archive_stream.add_file(
+                            file_object=document_file_object,
+                            filename=document.label
+                        ):
+                            file_object.write(chunk)
+
+                    processed_count += 1
+                    if not queryset.filter(state=DOCUMENT_EXPORT_STATE_RUNNING).update(processed_count=processed_count):
+                        is_canceled = True
+                        break
+
+                if not is_canceled:
+                    for chunk in zip_archive_stream.close():
+                        file_object.write(chunk)
+        except Exception as exception:
+            logger.error(
+                'Error exporting documents for export %d; %s', self.pk,
+                exception, exc_info=True
+            )
+            if name:
+                storage.delete(name=name)
+
+            queryset.update(
+                datetime_expiration=self.get_expiration(),
+                error_message=force_text(exception), file='',
+                state=DOCUMENT_EXPORT_STATE_FAILED
+            )
+        else:
+            if is_canceled:
+                logger.info('Document export %d canceled.', self.pk)
+                storage.delete(name=name)
+                queryset.update(file='')
+            else:
+                queryset.update(
+                    datetime_expiration=self.get_expiration(),
+                    file_size=storage.size(name=name),
+                    state=DOCUMENT_EXPORT_STATE_FINISHED
+                )
+                event_document_export_finished.commit(
+                    actor=self.user, target=self
+                )
+
+        self.refresh_from_db()
+
+    def get_expiration(self):
+        return now() + timedelta(seconds=setting_export_expiration.value)
+
+    def get_progress(self):
+        """
+        Return the percentage of the documents already archived.
+        """
+        if self.state == DOCUMENT_EXPORT_STATE_FINISHED:
+            return 100
+        elif self.document_count:
+            return int(self.processed_count * 100 / self.document_count)
+        else:
+            return 0
+    get_progress.short_description = _('Progress')
+
+    @property
+    def is_finished(self):
+        return self.state == DOCUMENT_EXPORT_STATE_FINISHED
+
+    def open(self):
+        return self.file.storage.open(name=self.file.name)
@@ -103,6 +103,13 @@ class Document(HooksMixin, models.Model):
             'deferred upload via the API.'
         ), verbose_name=_('Is stub?')
     )
+    latest_version = models.ForeignKey(
+        blank=True, editable=False, help_text=_(
+            'The most recent version of the document. Kept up to date when '
+            'versions are added, deleted or reverted.'
+        ), null=True, on_delete=models.SET_NULL, related_name='+',
+        to='documents.DocumentVersion', verbose_name=_('Latest version')
+    )
 
     objects = DocumentManager()
     passthrough = PassthroughManager()
@@ -198,10 +205,6 @@ class Document(HooksMixin, models.Model):
     def is_in_trash(self):
         return self.in_trash
 
-    @property
-    def latest_version(self):
-        return self.versions.order_by('timestamp').last()
-
     def natural_key(self):
         return (self.uuid,)
     natural_key.dependencies = ['documents.DocumentType']
@@ -229,7 +232,11 @@ class Document(HooksMixin, models.Model):
 
     @property
     def page_count(self):
-        return self.latest_version.page_count
+        latest_version = self.latest_version
+        if latest_version:
+            return latest_version.page_count
+        else:
+            return 0
 
     @property
     def pages(self):
@@ -255,6 +262,18 @@ class Document(HooksMixin, models.Model):
 
             return DocumentPage.objects.none()
 
+    def refresh_latest_version(self):
+        """
+        Update the latest version reference from the versions table
+        without triggering the document save logic or events.
+        """
+        self.latest_version = self.versions.order_by('timestamp', 'pk').last()
+        Document.passthrough.filter(pk=self.pk).update(
+            latest_version=self.latest_version
+        )
+
+        return self.latest_version
+
     def restore(self):
         self.in_trash = False
         self.save()
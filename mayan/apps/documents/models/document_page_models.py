@@ -17,10 +17,12 @@ from mayan.apps.converter.transformations import (
 )
 from mayan.apps.converter.utils import get_converter_class
 
+from ..literals import DOCUMENT_PAGE_BASE_IMAGE_CACHE_FILENAME
 from ..managers import DocumentPageManager
 from ..settings import (
     setting_disable_base_image_cache, setting_disable_transformed_image_cache,
-    setting_display_width, setting_display_height, setting_zoom_max_level,
+    setting_display_width, setting_display_height,
+    setting_page_image_batch_size, setting_zoom_max_level,
     setting_zoom_min_level
 )
 
@@ -66,6 +68,7 @@ class DocumentPage(models.Model):
     def delete(self, *args, **kwargs):
         self.cache_partition.delete()
         super(DocumentPage, self).delete(*args, **kwargs)
+        self.document_version.refresh_page_count()
 
     def detect_orientation(self):
         with self.document_version.open() as file_object:
@@ -189,12 +192,44 @@ class DocumentPage(models.Model):
 
         return transformation_list
 
+    def get_image_cache_file(self, cache_filename):
+        """
+        Return the cache file holding the generated image for the
+        transformation hash or None if the image has not been generated
+        yet. Allows serving cached images without dispatching the image
+        generation task.
+        """
+        if not setting_disable_transformed_image_cache.value:
+            return self.cache_partition.get_file(filename=cache_filename)
+
+    def get_image_cache_filename(self, user=None, **kwargs):
+        """
+        Return the combined transformation hash used as the cache filename
+        of the image generated with the same arguments.
+        """
+        return BaseTransformation.combine(
+            self.get_combined_transformation_list(user=user, **kwargs)
+        )
+
     def get_image(self, transformations=None):
-        cache_filename = 'base_image'
+        cache_filename = DOCUMENT_PAGE_BASE_IMAGE_CACHE_FILENAME
         logger.debug('Page cache filename: %s', cache_filename)
 
         cache_file = self.cache_partition.get_file(filename=cache_filename)
 
+        if not setting_disable_base_image_cache.value and not cache_file:
+            logger.debug(
+                'Page cache file "%s" not found, rendering page batch',
+                cache_filename
+            )
+            # Render this page and the pages that follow it in a single
+            # converter pass.
+            self.document_version.cache_page_images(
+                first_page_number=self.page_number,
+                last_page_number=self.page_number + setting_page_image_batch_size.value - 1
+            )
+            cache_file = self.cache_partition.get_file(filename=cache_filename)
+
         if not setting_disable_base_image_cache.value and cache_file:
             logger.debug('Page cache file "%s" found', cache_filename)
 
@@ -259,6 +294,10 @@ class DocumentPage(models.Model):
         return (self.page_number, self.document_version.natural_key())
     natural_key.dependencies = ['documents.DocumentVersion']
 
+    def save(self, *args, **kwargs):
+        super(DocumentPage, self).save(*args, **kwargs)
+        self.document_version.refresh_page_count()
+
     @property
     def siblings(self):
         return DocumentPage.objects.filter(
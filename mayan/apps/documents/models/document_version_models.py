@@ -5,10 +5,12 @@ import shutil
 import uuid
 
 from django.apps import apps
+from django.core.files.base import File
 from django.db import models, transaction
 from django.urls import reverse
 from django.utils.encoding import force_text, python_2_unicode_compatible
 from django.utils.functional import cached_property
+from django.utils.timezone import now
 from django.utils.translation import ugettext_lazy as _
 
 from mayan.apps.common.signals import signal_mayan_pre_save
@@ -16,17 +18,32 @@ from mayan.apps.converter.exceptions import InvalidOfficeFormat, PageCountError
 from mayan.apps.converter.layers import layer_saved_transformations
 from mayan.apps.converter.transformations import TransformationRotate
 from mayan.apps.converter.utils import get_converter_class
-from mayan.apps.mimetype.api import get_mimetype
+from mayan.apps.file_caching.tasks import task_cache_partitions_delete
+from mayan.apps.mimetype.api import get_mimetype, get_mimetype_from_buffer
+from mayan.apps.mimetype.settings import setting_file_read_size
 from mayan.apps.storage.classes import DefinedStorageLazy
+from mayan.apps.storage.utils import NamedTemporaryFile
 from mayan.apps.templating.classes import Template
 
 from ..events import event_document_version_new, event_document_version_revert
 from ..literals import (
-    STORAGE_NAME_DOCUMENT_IMAGE, STORAGE_NAME_DOCUMENT_VERSION
+    DOCUMENT_PAGE_BASE_IMAGE_CACHE_FILENAME,
+    DOCUMENT_PAGE_BULK_CREATE_BATCH_SIZE,
+    DOCUMENT_VERSION_ACCESS_UPDATE_INTERVAL,
+    DOCUMENT_VERSION_CONTENT_ADDRESSED_NAME,
+    DOCUMENT_VERSION_INTERMEDIATE_CACHE_FILENAME, STORAGE_NAME_DOCUMENT_IMAGE,
+    STORAGE_NAME_DOCUMENT_VERSION
 )
 from ..managers import DocumentVersionManager
-from ..settings import setting_fix_orientation, setting_hash_block_size
+from ..settings import (
+    setting_disable_base_image_cache,
+    setting_disable_transformed_image_cache, setting_fix_orientation,
+    setting_hash_block_size, setting_storage_content_addressed
+)
 from ..signals import post_document_created, post_version_upload
+from ..utils import (
+    get_page_image_size_presets, lock_document_version_file
+)
 
 from .document_models import Document
 
@@ -74,6 +91,12 @@ class DocumentVersion(models.Model):
             'The server date and time when the document version was processed.'
         ), verbose_name=_('Timestamp')
     )
+    timestamp_accessed = models.DateTimeField(
+        blank=True, db_index=True, editable=False, help_text=_(
+            'The server date and time when the file of the document version '
+            'was last read. Used by the storage tier policies.'
+        ), null=True, verbose_name=_('Last accessed')
+    )
     comment = models.TextField(
         blank=True, default='', help_text=_(
             'An optional short text describing the document version.'
@@ -105,6 +128,11 @@ class DocumentVersion(models.Model):
             'checksum.'
         ), max_length=64, null=True, verbose_name=_('Checksum')
     )
+    page_count = models.PositiveIntegerField(
+        default=0, editable=False, help_text=_(
+            'The number of enabled pages of the document version.'
+        ), verbose_name=_('Page count')
+    )
 
     class Meta:
         ordering = ('timestamp',)
@@ -166,6 +194,54 @@ class DocumentVersion(models.Model):
     def __str__(self):
         return self.get_rendered_string()
 
+    def _get_page_count(self, file_object):
+        converter = get_converter_class()(
+            file_object=file_object, mime_type=self.mimetype
+        )
+        page_count = converter.get_page_count()
+
+        # Office documents are converted to PDF to count their pages, keep
+        # the result as the intermediate file to avoid a second conversion.
+        if converter.soffice_file:
+            with converter.soffice_file as soffice_file_object:
+                if not self.cache_partition.get_file(filename=DOCUMENT_VERSION_INTERMEDIATE_CACHE_FILENAME):
+                    soffice_file_object.seek(0)
+                    with self.cache_partition.create_file(filename=DOCUMENT_VERSION_INTERMEDIATE_CACHE_FILENAME) as cache_file_object:
+                        shutil.copyfileobj(
+                            fsrc=soffice_file_object, fdst=cache_file_object
+                        )
+
+        return page_count
+
+    def _is_stored_file_equal(self, name):
+        """
+        Compare the stored file of the version with another stored file.
+        """
+        block_size = self.get_hash_block_size()
+
+        with self.open(raw=True) as file_object:
+            with self.file.storage.open(name=name) as other_file_object:
+                while True:
+                    data = file_object.read(block_size)
+                    if data != other_file_object.read(block_size):
+                        return False
+                    elif not data:
+                        return True
+
+    def _store_content_addressed(self):
+        """
+        Called after the new version is committed. The file stays under
+        its unique name when it cannot be shared, deduplicate_files can
+        share it later.
+        """
+        try:
+            self.store_content_addressed()
+        except Exception as exception:
+            logger.error(
+                'Error storing the file of document version %d by its '
+                'checksum; %s', self.pk, exception
+            )
+
     @cached_property
     def cache(self):
         Cache = apps.get_model(app_label='file_caching', model_name='Cache')
@@ -180,14 +256,97 @@ class DocumentVersion(models.Model):
         )
         return partition
 
+    def cache_page_images(self, first_page_number=None, last_page_number=None):
+        """
+        Render the base image of the pages in the range that are not yet
+        cached using a single converter pass over the intermediate file.
+        Returns the number of page images created.
+        """
+        if setting_disable_base_image_cache.value:
+            return 0
+
+        queryset = self.pages.all()
+        if first_page_number:
+            queryset = queryset.filter(page_number__gte=first_page_number)
+        if last_page_number:
+            queryset = queryset.filter(page_number__lte=last_page_number)
+
+        pending_pages = {}
+        for document_page in queryset:
+            if not document_page.cache_partition.get_file(filename=DOCUMENT_PAGE_BASE_IMAGE_CACHE_FILENAME):
+                pending_pages[document_page.page_number] = document_page
+
+        if not pending_pages:
+            return 0
+
+        logger.debug(
+            'Rendering %d base page images for document version: %s',
+            len(pending_pages), self
+        )
+
+        created_count = 0
+        with self.get_intermediate_file() as file_object:
+            converter = get_converter_class()(file_object=file_object)
+            for page_number in converter.seek_pages(
+                first_page_number=min(pending_pages) - 1,
+                last_page_number=max(pending_pages) - 1
+            ):
+                document_page = pending_pages.get(page_number + 1)
+                if document_page:
+                    try:
+                        page_image = converter.get_page()
+                        with document_page.cache_partition.create_file(filename=DOCUMENT_PAGE_BASE_IMAGE_CACHE_FILENAME) as cache_file_object:
+                            cache_file_object.write(page_image.getvalue())
+                    except Exception as exception:
+                        logger.error(
+                            'Error creating page cache file "%s"; %s',
+                            DOCUMENT_PAGE_BASE_IMAGE_CACHE_FILENAME,
+                            exception
+                        )
+                        raise
+                    else:
+                        created_count += 1
+
+        return created_count
+
     def delete(self, *args, **kwargs):
-        for page in self.pages.all():
-            page.delete()
+        self.delete_pages()
+
+        # Content addressed files are shared, delete the file only when
+        # this is the last version referencing it. The references are
+        # checked while holding the lock of the file to not race a new
+        # version gaining a reference to it.
+        with lock_document_version_file(checksum=self.checksum):
+            if not self.get_file_references().exists():
+                self.file.storage.delete(self.file.name)
 
-        self.file.storage.delete(self.file.name)
         self.cache_partition.delete()
 
-        return super(DocumentVersion, self).delete(*args, **kwargs)
+        result = super(DocumentVersion, self).delete(*args, **kwargs)
+        self.document.refresh_latest_version()
+
+        return result
+
+    def delete_pages(self):
+        """
+        Delete all the pages of the version using a single query and
+        submit the deletion of their cache partitions to a background task.
+        """
+        # Same as the partition name of each page, the DocumentPage.uuid
+        # property.
+        partition_name_list = [
+            '{}-{}'.format(self.uuid, page_id) for page_id in self.version_pages.values_list('pk', flat=True)
+        ]
+
+        self.version_pages.all().delete()
+
+        if partition_name_list:
+            task_cache_partitions_delete.apply_async(
+                kwargs={
+                    'cache_id': self.cache.pk,
+                    'partition_name_list': partition_name_list
+                }
+            )
 
     def execute_pre_save_hooks(self):
         """
@@ -229,8 +388,33 @@ class DocumentVersion(models.Model):
         if first_page:
             return first_page.get_api_image_url(*args, **kwargs)
 
+    def get_content_addressed_name(self):
+        return DOCUMENT_VERSION_CONTENT_ADDRESSED_NAME.format(
+            checksum=self.checksum, prefix=self.checksum[:2]
+        )
+
+    def get_file_references(self):
+        """
+        Return the other versions that share the stored file.
+        """
+        return DocumentVersion.objects.filter(file=self.file.name).exclude(
+            pk=self.pk
+        )
+
+    @staticmethod
+    def get_hash_block_size():
+        block_size = setting_hash_block_size.value
+        if block_size == 0:
+            # If the setting value is 0 that means disable read limit. To disable
+            # the read limit passing None won't work, we pass -1 instead as per
+            # the Python documentation.
+            # https://docs.python.org/2/tutorial/inputoutput.html#methods-of-file-objects
+            block_size = -1
+
+        return block_size
+
     def get_intermediate_file(self):
-        cache_filename = 'intermediate_file'
+        cache_filename = DOCUMENT_VERSION_INTERMEDIATE_CACHE_FILENAME
         cache_file = self.cache_partition.get_file(filename=cache_filename)
         if cache_file:
             logger.debug('Intermidiate file found.')
@@ -280,6 +464,60 @@ class DocumentVersion(models.Model):
             context={'instance': self}
         )
 
+    def ingest_file(self):
+        """
+        Read the stored file once to compute the checksum and to detect the
+        MIME type from the leading bytes while spooling a local copy. The
+        page count is then detected from the local copy, and the PDF
+        produced when counting the pages of office documents is kept as
+        the intermediate file.
+        """
+        if not self.exists():
+            return
+
+        block_size = self.get_hash_block_size()
+        hash_object = hash_function()
+        mimetype_buffer = b''
+        mimetype_buffer_size = setting_file_read_size.value
+
+        with NamedTemporaryFile() as spool_file_object:
+            with self.open() as file_object:
+                while (True):
+                    data = file_object.read(block_size)
+                    if not data:
+                        break
+
+                    hash_object.update(data)
+                    spool_file_object.write(data)
+
+                    if not mimetype_buffer_size:
+                        mimetype_buffer += data
+                    elif len(mimetype_buffer) < mimetype_buffer_size:
+                        mimetype_buffer += data[
+                            :mimetype_buffer_size - len(mimetype_buffer)
+                        ]
+
+            self.checksum = force_text(hash_object.hexdigest())
+
+            try:
+                self.mimetype, self.encoding = get_mimetype_from_buffer(
+                    buffer=mimetype_buffer
+                )
+            except Exception:
+                self.mimetype = ''
+                self.encoding = ''
+
+            if setting_storage_content_addressed.value:
+                # Share the file only after the version is committed, the
+                # new reference must be visible to the other processes
+                # before the lock of the file is released.
+                transaction.on_commit(self._store_content_addressed)
+
+            self.save()
+
+            spool_file_object.seek(0)
+            self.update_page_count(file_object=spool_file_object, save=False)
+
     def natural_key(self):
         return (self.checksum, self.document.natural_key())
     natural_key.dependencies = ['documents.Document']
@@ -288,15 +526,19 @@ class DocumentVersion(models.Model):
     def is_in_trash(self):
         return self.document.is_in_trash
 
-    def open(self, raw=False):
+    def open(self, raw=False, track_access=False):
         """
         Return a file descriptor to a document version's file irrespective of
-        the storage backend
+        the storage backend. Only the reads done for the users, like
+        downloads and exports, set track_access to record the access used
+        by the inactive_days storage tier policy.
         """
         if raw:
             return self.file.storage.open(name=self.file.name)
         else:
             file_object = self.file.storage.open(name=self.file.name)
+            if track_access:
+                self.update_timestamp_accessed()
 
             result = DocumentVersion._execute_hooks(
                 hook_list=DocumentVersion._pre_open_hooks,
@@ -312,13 +554,6 @@ class DocumentVersion(models.Model):
         )
         return DocumentPage.passthrough.filter(document_version=self)
 
-    @property
-    def page_count(self):
-        """
-        The number of pages that the document posses.
-        """
-        return self.pages.count()
-
     @property
     def pages(self):
         return self.version_pages.all()
@@ -339,6 +574,20 @@ class DocumentVersion(models.Model):
             for version in self.document.versions.filter(timestamp__gt=self.timestamp):
                 version.delete()
 
+            self.document.refresh_latest_version()
+
+    def refresh_page_count(self):
+        """
+        Update the page count from the enabled pages of the version without
+        triggering the version save logic.
+        """
+        self.page_count = self.pages.count()
+        DocumentVersion.objects.filter(pk=self.pk).update(
+            page_count=self.page_count
+        )
+
+        return self.page_count
+
     def save(self, *args, **kwargs):
         """
         Overloaded save method that updates the document version's checksum,
@@ -367,10 +616,7 @@ class DocumentVersion(models.Model):
 
                 if new_document_version:
                     # Only do this for new documents
-                    self.update_checksum(save=False)
-                    self.update_mimetype(save=False)
-                    self.save()
-                    self.update_page_count(save=False)
+                    self.ingest_file()
                     if setting_fix_orientation.value:
                         self.fix_orientation()
 
@@ -380,6 +626,7 @@ class DocumentVersion(models.Model):
                     )
 
                     self.document.is_stub = False
+                    self.document.latest_version = self
                     if not self.document.label:
                         self.document.label = force_text(self.file)
 
@@ -417,18 +664,56 @@ class DocumentVersion(models.Model):
         else:
             return None
 
+    def store_content_addressed(self):
+        """
+        Move the file to its content addressed name. If a file with the
+        same checksum is already stored, the version only gains a
+        reference to it. Returns the size of the storage space reclaimed.
+        """
+        name = self.get_content_addressed_name()
+        old_name = self.file.name
+        reclaimed_size = 0
+
+        if old_name == name:
+            return reclaimed_size
+
+        # The existence of the file and the references to it are checked
+        # and the new reference is committed while holding the lock of the
+        # file to not race the deletion of its last reference.
+        with lock_document_version_file(checksum=self.checksum):
+            storage = self.file.storage
+
+            if storage.exists(name):
+                # The checksum is calculated after the pre open hooks, files
+                # with embedded signatures can have the same checksum but
+                # different stored content.
+                if not self._is_stored_file_equal(name=name):
+                    return reclaimed_size
+
+                # Only count the space of files that are actually deleted.
+                if not self.get_file_references().exists():
+                    reclaimed_size = storage.size(old_name)
+            else:
+                with self.open(raw=True) as file_object:
+                    name = storage.save(
+                        name=name, content=File(file=file_object)
+                    )
+
+            with transaction.atomic():
+                DocumentVersion.objects.filter(pk=self.pk).update(file=name)
+            self.file.name = name
+
+            if not DocumentVersion.objects.filter(file=old_name).exists():
+                storage.delete(old_name)
+
+        return reclaimed_size
+
     def update_checksum(self, save=True):
         """
         Open a document version's file and update the checksum field using
         the user provided checksum function
         """
-        block_size = setting_hash_block_size.value
-        if block_size == 0:
-            # If the setting value is 0 that means disable read limit. To disable
-            # the read limit passing None won't work, we pass -1 instead as per
-            # the Python documentation.
-            # https://docs.python.org/2/tutorial/inputoutput.html#methods-of-file-objects
-            block_size = -1
+        block_size = self.get_hash_block_size()
 
         if self.exists():
             hash_object = hash_function()
@@ -464,13 +749,19 @@ class DocumentVersion(models.Model):
                 if save:
                     self.save()
 
-    def update_page_count(self, save=True):
+    def update_page_count(self, file_object=None, save=True):
+        """
+        Detect the number of pages and recreate the page instances. The
+        file object is used instead of the stored file when provided.
+        """
         try:
-            with self.open() as file_object:
-                converter = get_converter_class()(
-                    file_object=file_object, mime_type=self.mimetype
-                )
-                detected_pages = converter.get_page_count()
+            if file_object:
+                detected_pages = self._get_page_count(file_object=file_object)
+            else:
+                with self.open() as file_object:
+                    detected_pages = self._get_page_count(
+                        file_object=file_object
+                    )
         except PageCountError:
             # If converter backend doesn't understand the format,
             # use 1 as the total page count
@@ -481,19 +772,65 @@ class DocumentVersion(models.Model):
             )
 
             with transaction.atomic():
-                self.pages.all().delete()
+                self.delete_pages()
+
+                DocumentPage.objects.bulk_create(
+                    batch_size=DOCUMENT_PAGE_BULK_CREATE_BATCH_SIZE, objs=[
+                        DocumentPage(
+                            document_version=self, page_number=page_number + 1
+                        ) for page_number in range(detected_pages)
+                    ]
+                )
 
-                for page_number in range(detected_pages):
-                    DocumentPage.objects.create(
-                        document_version=self, page_number=page_number + 1
-                    )
+                self.page_count = detected_pages
+                DocumentVersion.objects.filter(pk=self.pk).update(
+                    page_count=self.page_count
+                )
 
             if save:
                 self.save()
 
             return detected_pages
 
+    def update_timestamp_accessed(self):
+        """
+        Record that the file was read. The database is updated at most once
+        per DOCUMENT_VERSION_ACCESS_UPDATE_INTERVAL to avoid a write for
+        every read.
+        """
+        timestamp = now()
+
+        if not self.timestamp_accessed or (timestamp - self.timestamp_accessed).total_seconds() > DOCUMENT_VERSION_ACCESS_UPDATE_INTERVAL:
+            DocumentVersion.objects.filter(pk=self.pk).update(
+                timestamp_accessed=timestamp
+            )
+            self.timestamp_accessed = timestamp
+
     @property
     def uuid(self):
         # Make cache UUID a mix of document UUID, version ID
         return '{}-{}'.format(self.document.uuid, self.pk)
+
+    def warm_cache(self, user=None):
+        """
+        Render the base image and the display, preview and thumbnail images
+        of every page that are not yet cached. Returns the number of page
+        images rendered.
+        """
+        rendered_count = self.cache_page_images()
+
+        if setting_disable_transformed_image_cache.value:
+            return rendered_count
+
+        image_size_presets = get_page_image_size_presets()
+
+        for document_page in self.pages.all():
+            for image_kwargs in image_size_presets:
+                cache_filename = document_page.get_image_cache_filename(
+                    user=user, **image_kwargs
+                )
+                if not document_page.get_image_cache_file(cache_filename=cache_filename):
+                    document_page.generate_image(user=user, **image_kwargs)
+                    rendered_count += 1
+
+        return rendered_count
@@ -8,7 +8,8 @@ from mayan.apps.task_manager.workers import worker_fast, worker_medium
 
 from .literals import (
     CHECK_DELETE_PERIOD_INTERVAL, CHECK_TRASH_PERIOD_INTERVAL,
-    DELETE_STALE_STUBS_INTERVAL
+    DELETE_EXPIRED_DOCUMENT_EXPORTS_INTERVAL, DELETE_STALE_STUBS_INTERVAL,
+    MIGRATE_STORAGE_TIERS_INTERVAL
 )
 
 queue_converter = CeleryQueue(
@@ -29,6 +30,10 @@ queue_converter.add_task_type(
     dotted_path='mayan.apps.documents.tasks.task_generate_document_page_image',
     label=_('Generate document page image')
 )
+queue_converter.add_task_type(
+    dotted_path='mayan.apps.documents.tasks.task_warm_document_cache',
+    label=_('Warm the page image cache of a document')
+)
 
 queue_documents.add_task_type(
     dotted_path='mayan.apps.documents.tasks.task_delete_document',
@@ -53,17 +58,37 @@ queue_documents_periodic.add_task_type(
     name='task_check_trash_periods',
     schedule=timedelta(seconds=CHECK_TRASH_PERIOD_INTERVAL),
 )
+queue_documents_periodic.add_task_type(
+    dotted_path='mayan.apps.documents.tasks.task_delete_expired_document_exports',
+    label=_('Delete expired document exports'),
+    name='task_delete_expired_document_exports',
+    schedule=timedelta(seconds=DELETE_EXPIRED_DOCUMENT_EXPORTS_INTERVAL),
+)
 queue_documents_periodic.add_task_type(
     dotted_path='mayan.apps.documents.tasks.task_delete_stubs',
     label=_('Delete document stubs'),
     name='task_delete_stubs',
     schedule=timedelta(seconds=DELETE_STALE_STUBS_INTERVAL),
 )
+queue_documents_periodic.add_task_type(
+    dotted_path='mayan.apps.documents.tasks.task_migrate_storage_tiers',
+    label=_('Move document version files between storage tiers'),
+    name='task_migrate_storage_tiers',
+    schedule=timedelta(seconds=MIGRATE_STORAGE_TIERS_INTERVAL),
+)
 
+queue_tools.add_task_type(
+    dotted_path='mayan.apps.documents.tasks.task_document_export',
+    label=_('Export documents')
+)
 queue_tools.add_task_type(
     dotted_path='mayan.apps.documents.tasks.task_scan_duplicates_all',
     label=_('Duplicated document scan')
 )
+queue_tools.add_task_type(
+    dotted_path='mayan.apps.documents.tasks.task_warm_cache',
+    label=_('Warm the page image cache of documents')
+)
 
 queue_uploads.add_task_type(
     dotted_path='mayan.apps.documents.tasks.task_update_page_count',
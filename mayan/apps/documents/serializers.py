@@ -1,14 +1,22 @@
+from django.apps import apps
 from django.utils.encoding import force_text
+from django.utils.translation import ugettext_lazy as _
 
 from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
 from rest_framework.reverse import reverse
 
+from mayan.apps.acls.models import AccessControlList
 from mayan.apps.common.models import SharedUploadedFile
+from mayan.apps.dynamic_search.runtime import search_backend
 
+from .literals import DEFAULT_ZIP_FILENAME
 from .models import (
-    Document, DocumentVersion, DocumentPage, DocumentType,
+    Document, DocumentExport, DocumentVersion, DocumentPage, DocumentType,
     DocumentTypeFilename, RecentDocument
 )
+from .permissions import permission_document_download
+from .search import document_search
 from .settings import setting_language
 from .tasks import task_upload_new_version
 
@@ -109,10 +117,11 @@ class DocumentVersionSerializer(serializers.HyperlinkedModelSerializer):
         }
         fields = (
             'checksum', 'comment', 'document_url', 'download_url', 'encoding',
-            'file', 'mimetype', 'pages_url', 'size', 'timestamp', 'url'
+            'file', 'mimetype', 'page_count', 'pages_url', 'size', 'timestamp',
+            'url'
         )
         model = DocumentVersion
-        read_only_fields = ('document', 'file', 'size')
+        read_only_fields = ('document', 'file', 'page_count', 'size')
 
     def get_size(self, instance):
         return instance.size
@@ -258,6 +267,145 @@ class DocumentSerializer(serializers.HyperlinkedModelSerializer):
         read_only_fields = ('document_type',)
 
 
+class DocumentExportSerializer(serializers.HyperlinkedModelSerializer):
+    cancel_url = serializers.HyperlinkedIdentityField(
+        view_name='rest_api:documentexport-cancel'
+    )
+    download_url = serializers.HyperlinkedIdentityField(
+        view_name='rest_api:documentexport-download'
+    )
+    progress = serializers.SerializerMethodField()
+
+    class Meta:
+        extra_kwargs = {
+            'url': {'view_name': 'rest_api:documentexport-detail'},
+        }
+        fields = (
+            'cancel_url', 'datetime_created', 'datetime_expiration',
+            'document_count', 'download_url', 'error_message', 'file_size',
+            'id', 'label', 'processed_count', 'progress', 'state', 'url'
+        )
+        model = DocumentExport
+        read_only_fields = fields
+
+    def get_progress(self, instance):
+        return instance.get_progress()
+
+
+class WritableDocumentExportSerializer(serializers.ModelSerializer):
+    cabinet_id = serializers.IntegerField(
+        help_text=_('Primary key of the cabinet to export.'),
+        required=False, write_only=True
+    )
+    documents_pk_list = serializers.CharField(
+        help_text=_(
+            'Comma separated list of document primary keys to export.'
+        ), required=False, write_only=True
+    )
+    index_instance_node_id = serializers.IntegerField(
+        help_text=_(
+            'Primary key of the index instance node to export, including '
+            'the documents of its child nodes.'
+        ), required=False, write_only=True
+    )
+    label = serializers.CharField(default=DEFAULT_ZIP_FILENAME)
+    search_query = serializers.CharField(
+        help_text=_(
+            'Export the documents matching this search term.'
+        ), required=False, write_only=True
+    )
+
+    class Meta:
+        fields = (
+            'cabinet_id', 'documents_pk_list', 'id', 'index_instance_node_id',
+            'label', 'search_query'
+        )
+        model = DocumentExport
+
+    def create(self, validated_data):
+        return DocumentExport.objects.create_for(
+            label=validated_data['label'],
+            queryset=validated_data['queryset'],
+            user=self.context['request'].user
+        )
+
+    def get_queryset(self, attrs):
+        user = self.context['request'].user
+
+        if 'cabinet_id' in attrs:
+            Cabinet = apps.get_model(
+                app_label='cabinets', model_name='Cabinet'
+            )
+            try:
+                cabinet = Cabinet.objects.get(pk=attrs['cabinet_id'])
+            except Cabinet.DoesNotExist as exception:
+                raise ValidationError(force_text(exception))
+
+            return cabinet.documents.all()
+        elif 'documents_pk_list' in attrs:
+            return Document.objects.filter(pk__in=attrs['documents_pk_list'])
+        elif 'index_instance_node_id' in attrs:
+            IndexInstanceNode = apps.get_model(
+                app_label='document_indexing', model_name='IndexInstanceNode'
+            )
+            try:
+                index_instance_node = IndexInstanceNode.objects.get(
+                    pk=attrs['index_instance_node_id']
+                )
+            except IndexInstanceNode.DoesNotExist as exception:
+                raise ValidationError(force_text(exception))
+
+            return Document.objects.filter(
+                index_instance_nodes__in=index_instance_node.get_descendants(
+                    include_self=True
+                )
+            ).distinct()
+        else:
+            return search_backend.search(
+                query_string={'q': attrs['search_query']},
+                search_model=document_search, user=user
+            )
+
+    def validate(self, attrs):
+        source_count = len(
+            set(attrs).intersection(
+                (
+                    'cabinet_id', 'documents_pk_list',
+                    'index_instance_node_id', 'search_query'
+                )
+            )
+        )
+
+        if source_count != 1:
+            raise ValidationError(
+                _(
+                    'Specify one of cabinet_id, documents_pk_list, '
+                    'index_instance_node_id or search_query.'
+                )
+            )
+
+        queryset = AccessControlList.objects.restrict_queryset(
+            permission=permission_document_download,
+            queryset=self.get_queryset(attrs=attrs),
+            user=self.context['request'].user
+        )
+
+        if not queryset.exists():
+            raise ValidationError(_('No documents to export.'))
+
+        return {'label': attrs['label'], 'queryset': queryset}
+
+    def validate_documents_pk_list(self, value):
+        try:
+            return [
+                int(pk) for pk in value.split(',') if pk.strip()
+            ]
+        except ValueError:
+            raise ValidationError(
+                _('Enter a comma separated list of document primary keys.')
+            )
+
+
 class NewDocumentDocumentTypeSerializer(serializers.ModelSerializer):
     new_document_type = serializers.PrimaryKeyRelatedField(
         queryset=DocumentType.objects.all(), write_only=True
@@ -6,9 +6,11 @@ from django.utils.translation import ugettext_lazy as _
 from mayan.apps.smart_settings.classes import Namespace
 
 from .literals import (
-    DEFAULT_DOCUMENTS_CACHE_MAXIMUM_SIZE, DEFAULT_DOCUMENTS_HASH_BLOCK_SIZE,
-    DEFAULT_LANGUAGE, DEFAULT_LANGUAGE_CODES,
-    DEFAULT_STUB_EXPIRATION_INTERVAL
+    DEFAULT_DOCUMENT_EXPORT_EXPIRATION, DEFAULT_DOCUMENTS_CACHE_MAXIMUM_SIZE,
+    DEFAULT_DOCUMENTS_HASH_BLOCK_SIZE,
+    DEFAULT_DOCUMENTS_PAGE_IMAGE_BATCH_SIZE,
+    DEFAULT_DOCUMENTS_STORAGE_TIER_BATCH_SIZE, DEFAULT_LANGUAGE,
+    DEFAULT_LANGUAGE_CODES, DEFAULT_STUB_EXPIRATION_INTERVAL
 )
 from .setting_callbacks import callback_update_cache_size
 from .setting_migrations import DocumentsSettingMigration
@@ -62,6 +64,27 @@ setting_display_height = namespace.add_setting(
 setting_display_width = namespace.add_setting(
     global_name='DOCUMENTS_DISPLAY_WIDTH', default='3600'
 )
+setting_export_expiration = namespace.add_setting(
+    global_name='DOCUMENTS_EXPORT_EXPIRATION',
+    default=DEFAULT_DOCUMENT_EXPORT_EXPIRATION, help_text=_(
+        'Time in seconds after which a finished document export and its '
+        'archive file are deleted.'
+    )
+)
+setting_export_storage_backend = namespace.add_setting(
+    global_name='DOCUMENTS_EXPORT_STORAGE_BACKEND',
+    default='django.core.files.storage.FileSystemStorage', help_text=_(
+        'Path to the Storage subclass to use when storing the archives '
+        'of the document exports.'
+    )
+)
+setting_export_storage_backend_arguments = namespace.add_setting(
+    global_name='DOCUMENTS_EXPORT_STORAGE_BACKEND_ARGUMENTS',
+    default={'location': os.path.join(settings.MEDIA_ROOT, 'document_exports')},
+    help_text=_(
+        'Arguments to pass to the DOCUMENTS_EXPORT_STORAGE_BACKEND.'
+    )
+)
 setting_favorite_count = namespace.add_setting(
     global_name='DOCUMENTS_FAVORITE_COUNT', default=400,
     help_text=_(
@@ -93,6 +116,15 @@ setting_language_codes = namespace.add_setting(
     global_name='DOCUMENTS_LANGUAGE_CODES', default=DEFAULT_LANGUAGE_CODES,
     help_text=_('List of supported document languages. In ISO639-3 format.')
 )
+setting_page_image_batch_size = namespace.add_setting(
+    global_name='DOCUMENTS_PAGE_IMAGE_BATCH_SIZE',
+    default=DEFAULT_DOCUMENTS_PAGE_IMAGE_BATCH_SIZE, help_text=_(
+        'Number of consecutive pages whose base image will be rendered in '
+        'a single conversion pass when a page image is not found in the '
+        'cache. Higher values reduce the conversion overhead of sequential '
+        'page access at the cost of a slower first page.'
+    )
+)
 settings_document_page_image_cache_time = namespace.add_setting(
     global_name='DOCUMENTS_PAGE_IMAGE_CACHE_TIME', default='31556926',
     help_text=_(
@@ -143,6 +175,36 @@ setting_storage_backend_arguments = namespace.add_setting(
     default={'location': os.path.join(settings.MEDIA_ROOT, 'document_storage')},
     help_text=_('Arguments to pass to the DOCUMENT_STORAGE_BACKEND.')
 )
+setting_storage_content_addressed = namespace.add_setting(
+    global_name='DOCUMENTS_STORAGE_CONTENT_ADDRESSED', default=False,
+    help_text=_(
+        'Store the files of new document versions under their checksum. '
+        'Versions with identical files share a single stored file that '
+        'is deleted when the last version referencing it is deleted. '
+        'Use the deduplicatedocumentfiles command to convert the '
+        'existing files.'
+    )
+)
+setting_storage_tier_batch_size = namespace.add_setting(
+    global_name='DOCUMENTS_STORAGE_TIER_BATCH_SIZE',
+    default=DEFAULT_DOCUMENTS_STORAGE_TIER_BATCH_SIZE, help_text=_(
+        'Maximum number of document version files moved between storage '
+        'tiers by each run of the tier migration task.'
+    )
+)
+setting_storage_tiers = namespace.add_setting(
+    global_name='DOCUMENTS_STORAGE_TIERS', default=[], help_text=_(
+        'List of storage tiers, from the warmest to the coldest, where '
+        'document version files are moved according to their policy. '
+        'Each entry is a dictionary with the keys: "name", "label", '
+        '"backend", "backend_arguments" and "policy". The policy is a '
+        'dictionary with the keys "inactive_days", the number of days '
+        'since the file was last read, and "non_latest", true to select '
+        'the versions that are not the latest of their document. Files '
+        'move to the coldest tier whose policy matches and back to the '
+        'DOCUMENTS_STORAGE_BACKEND when none does.'
+    )
+)
 setting_stub_expiration_interval = namespace.add_setting(
     global_name='DOCUMENTS_STUB_EXPIRATION_INTERVAL',
     default=DEFAULT_STUB_EXPIRATION_INTERVAL,
@@ -1,14 +1,31 @@
 from django.utils.translation import ugettext_lazy as _
 
-from mayan.apps.storage.classes import DefinedStorage
+from mayan.apps.storage.classes import DefinedStorage, DefinedStorageTier
 
 from .literals import (
-    STORAGE_NAME_DOCUMENT_IMAGE, STORAGE_NAME_DOCUMENT_VERSION
+    STORAGE_NAME_DOCUMENT_EXPORT, STORAGE_NAME_DOCUMENT_IMAGE,
+    STORAGE_NAME_DOCUMENT_VERSION
 )
 from .settings import (
     setting_documentimagecache_storage,
     setting_documentimagecache_storage_arguments,
-    setting_storage_backend, setting_storage_backend_arguments
+    setting_export_storage_backend, setting_export_storage_backend_arguments,
+    setting_storage_backend, setting_storage_backend_arguments,
+    setting_storage_tiers
+)
+
+storage_document_exports = DefinedStorage(
+    dotted_path=setting_export_storage_backend.value,
+    error_message=_(
+        'Unable to initialize the document export storage. Check '
+        'the settings {} and {} for formatting errors.'.format(
+            setting_export_storage_backend.global_name,
+            setting_export_storage_backend_arguments.global_name
+        )
+    ),
+    label=_('Document exports'),
+    name=STORAGE_NAME_DOCUMENT_EXPORT,
+    kwargs=setting_export_storage_backend_arguments.value
 )
 
 storage_document_image_cache = DefinedStorage(
@@ -38,3 +55,16 @@ storage_document_versions = DefinedStorage(
     name=STORAGE_NAME_DOCUMENT_VERSION,
     kwargs=setting_storage_backend_arguments.value
 )
+
+for tier in setting_storage_tiers.value:
+    DefinedStorageTier(
+        defined_storage_name=STORAGE_NAME_DOCUMENT_VERSION,
+        dotted_path=tier['backend'], error_message=_(
+            'Unable to initialize the document version storage tier "{}". '
+            'Check the setting {} for formatting errors.'.format(
+                tier['name'], setting_storage_tiers.global_name
+            )
+        ), label=tier.get('label', tier['name']),
+        kwargs=tier.get('backend_arguments'), policy=tier.get('policy'),
+        tier_name=tier['name']
+    )
@@ -9,6 +9,7 @@ from mayan.celery import app
 from .literals import (
     UPDATE_PAGE_COUNT_RETRY_DELAY, UPLOAD_NEW_VERSION_RETRY_DELAY
 )
+from .settings import setting_storage_tier_batch_size
 
 logger = logging.getLogger(name=__name__)
 
@@ -51,6 +52,15 @@ def task_delete_document(trashed_document_id):
     logger.debug(msg='Finshed')
 
 
+@app.task(ignore_result=True)
+def task_delete_expired_document_exports():
+    DocumentExport = apps.get_model(
+        app_label='documents', model_name='DocumentExport'
+    )
+
+    DocumentExport.objects.delete_expired()
+
+
 @app.task(ignore_result=True)
 def task_delete_stubs():
     Document = apps.get_model(
@@ -62,6 +72,16 @@ def task_delete_stubs():
     logger.info(msg='Finshed')
 
 
+@app.task(ignore_result=True)
+def task_document_export(document_export_id):
+    DocumentExport = apps.get_model(
+        app_label='documents', model_name='DocumentExport'
+    )
+
+    document_export = DocumentExport.objects.get(pk=document_export_id)
+    document_export.export()
+
+
 @app.task()
 def task_generate_document_page_image(document_page_id, user_id=None, **kwargs):
     DocumentPage = apps.get_model(
@@ -78,6 +98,22 @@ def task_generate_document_page_image(document_page_id, user_id=None, **kwargs):
     return document_page.generate_image(user=user, **kwargs)
 
 
+@app.task(ignore_result=True)
+def task_migrate_storage_tiers():
+    DocumentVersion = apps.get_model(
+        app_label='documents', model_name='DocumentVersion'
+    )
+
+    batch_size = setting_storage_tier_batch_size.value
+    file_count = DocumentVersion.objects.migrate_storage_tiers(
+        batch_size=batch_size
+    )
+
+    # Continue with the next batch right away while there is a backlog.
+    if file_count >= batch_size:
+        task_migrate_storage_tiers.apply_async()
+
+
 @app.task(ignore_result=True)
 def task_scan_duplicates_all():
     DuplicatedDocument = apps.get_model(
@@ -190,3 +226,44 @@ def task_upload_new_version(self, document_id, shared_uploaded_file_id, user_id,
                     'Operational error during attempt to delete shared '
                     'file: %s; %s.', shared_file, exception
                 )
+
+
+@app.task(ignore_result=True)
+def task_warm_cache(
+    date_added_from=None, date_added_to=None, document_type_id_list=None,
+    index_instance_node_id=None, start_id=None
+):
+    Document = apps.get_model(
+        app_label='documents', model_name='Document'
+    )
+
+    queryset = Document.objects.get_for_cache_warming(
+        date_added_from=date_added_from, date_added_to=date_added_to,
+        document_type_id_list=document_type_id_list,
+        index_instance_node_id=index_instance_node_id, start_id=start_id
+    )
+
+    for document_id in queryset.values_list('pk', flat=True).iterator():
+        task_warm_document_cache.apply_async(
+            kwargs={'document_id': document_id}
+        )
+
+
+@app.task(ignore_result=True)
+def task_warm_document_cache(document_id):
+    Document = apps.get_model(
+        app_label='documents', model_name='Document'
+    )
+
+    try:
+        document = Document.objects.get(pk=document_id)
+    except Document.DoesNotExist:
+        logger.debug('Document %s deleted before cache warming', document_id)
+    else:
+        document_version = document.latest_version
+        if document_version:
+            rendered_count = document_version.warm_cache()
+            logger.debug(
+                'Rendered %d page images for document: %s', rendered_count,
+                document
+            )
@@ -12,6 +12,7 @@ TEST_COMPRESSED_DOCUMENTS_FILENAME = 'compressed_documents.zip'
 TEST_DEU_DOCUMENT_FILENAME = 'deu_website.png'
 TEST_DOCUMENT_DESCRIPTION = 'test description'
 TEST_DOCUMENT_DESCRIPTION_EDITED = 'test document description edited'
+TEST_DOCUMENT_EXPORT_LABEL = 'test_document_export.zip'
 TEST_DOCUMENT_LABEL_EDITED = 'test document label edited'
 TEST_DOCUMENT_TYPE_DELETE_PERIOD = 30
 TEST_DOCUMENT_TYPE_DELETE_TIME_UNIT = TIME_DELTA_UNIT_DAYS
@@ -6,10 +6,10 @@ from mayan.apps.converter.classes import Layer
 from mayan.apps.converter.layers import layer_saved_transformations
 
 from ..literals import PAGE_RANGE_ALL
-from ..models import DocumentType, FavoriteDocument
+from ..models import Document, DocumentExport, DocumentType, FavoriteDocument
 
 from .literals import (
-    TEST_DOCUMENT_TYPE_DELETE_PERIOD, TEST_DOCUMENT_TYPE_DELETE_TIME_UNIT,
+    TEST_DOCUMENT_EXPORT_LABEL, TEST_DOCUMENT_TYPE_DELETE_PERIOD, TEST_DOCUMENT_TYPE_DELETE_TIME_UNIT,
     TEST_DOCUMENT_TYPE_LABEL, TEST_DOCUMENT_TYPE_LABEL_EDITED,
     TEST_DOCUMENT_TYPE_QUICK_LABEL, TEST_DOCUMENT_TYPE_QUICK_LABEL_EDITED,
     TEST_SMALL_DOCUMENT_FILENAME, TEST_SMALL_DOCUMENT_PATH,
@@ -20,6 +20,60 @@ from .literals import (
 __all__ = ('DocumentTestMixin',)
 
 
+class DocumentExportTestMixin(object):
+    def _create_test_document_export(self):
+        self.test_document_export = DocumentExport.objects.create_for(
+            label=TEST_DOCUMENT_EXPORT_LABEL,
+            queryset=Document.objects.filter(
+                pk__in=[document.pk for document in self.test_documents]
+            ), user=self._test_case_user
+        )
+        # The export task runs eagerly and updates the instance in the
+        # database.
+        self.test_document_export.refresh_from_db()
+
+    def _create_test_document_export_queued(self):
+        self.test_document_export = DocumentExport.objects.create(
+            document_count=len(self.test_documents),
+            label=TEST_DOCUMENT_EXPORT_LABEL, user=self._test_case_user
+        )
+        self.test_document_export.documents.add(*self.test_documents)
+
+
+class DocumentExportViewTestMixin(object):
+    def _request_test_document_export_cancel_view(self):
+        return self.post(
+            viewname='documents:document_export_cancel', kwargs={
+                'document_export_id': self.test_document_export.pk
+            }
+        )
+
+    def _request_test_document_export_delete_view(self):
+        return self.post(
+            viewname='documents:document_export_delete', kwargs={
+                'document_export_id': self.test_document_export.pk
+            }
+        )
+
+    def _request_test_document_export_download_view(self, headers=None):
+        return self.get(
+            viewname='documents:document_export_download', headers=headers,
+            kwargs={'document_export_id': self.test_document_export.pk}
+        )
+
+    def _request_test_document_export_list_view(self):
+        return self.get(viewname='documents:document_export_list')
+
+    def _request_test_document_multiple_export_view(self):
+        return self.post(
+            viewname='documents:document_multiple_export', data={
+                'id_list': ','.join(
+                    str(document.pk) for document in self.test_documents
+                ), 'label': TEST_DOCUMENT_EXPORT_LABEL
+            }
+        )
+
+
 class DocumentPageDisableViewTestMixin(object):
     def _disable_test_document_page(self):
         self.test_document_page.enabled = False
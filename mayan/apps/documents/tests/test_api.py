@@ -1,12 +1,17 @@
 import time
 
+import mock
+
 from django.utils.encoding import force_text
 
 from rest_framework import status
 
 from mayan.apps.rest_api.tests.base import BaseAPITestCase
 
-from ..models import Document, DocumentType
+from ..literals import (
+    DOCUMENT_EXPORT_STATE_CANCELED, DOCUMENT_EXPORT_STATE_FINISHED
+)
+from ..models import Document, DocumentExport, DocumentType, DocumentVersion
 from ..permissions import (
     permission_document_create, permission_document_download,
     permission_document_delete, permission_document_edit,
@@ -18,12 +23,15 @@ from ..permissions import (
 )
 
 from .literals import (
-    TEST_DOCUMENT_DESCRIPTION_EDITED, TEST_PDF_DOCUMENT_FILENAME,
+    TEST_DOCUMENT_DESCRIPTION_EDITED, TEST_DOCUMENT_EXPORT_LABEL,
+    TEST_PDF_DOCUMENT_FILENAME,
     TEST_DOCUMENT_PATH, TEST_DOCUMENT_TYPE_LABEL, TEST_DOCUMENT_TYPE_2_LABEL,
     TEST_DOCUMENT_TYPE_LABEL_EDITED, TEST_DOCUMENT_VERSION_COMMENT_EDITED,
     TEST_SMALL_DOCUMENT_FILENAME
 )
-from .mixins import DocumentTestMixin, DocumentVersionTestMixin
+from .mixins import (
+    DocumentExportTestMixin, DocumentTestMixin, DocumentVersionTestMixin
+)
 
 
 class DocumentTypeAPIViewTestMixin(object):
@@ -151,11 +159,10 @@ class DocumentTypeAPIViewTestCase(
 
 
 class DocumentAPIViewTestMixin(object):
-    def _request_test_document_api_download_view(self):
+    def _request_test_document_api_download_view(self, headers=None):
         return self.get(
-            viewname='rest_api:document-download', kwargs={
-                'pk': self.test_document.pk
-            }
+            viewname='rest_api:document-download', headers=headers,
+            kwargs={'pk': self.test_document.pk}
         )
 
     def _request_test_document_api_upload_view(self):
@@ -216,6 +223,45 @@ class DocumentAPIViewTestCase(
                 mime_type=self.test_document.file_mimetype
             )
 
+    def test_document_api_download_view_not_modified(self):
+        self._upload_test_document()
+        self.grant_access(
+            obj=self.test_document, permission=permission_document_download
+        )
+
+        response = self._request_test_document_api_download_view(
+            headers={
+                'HTTP_IF_NONE_MATCH': '"{}"'.format(
+                    self.test_document.checksum
+                )
+            }
+        )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(
+            response['ETag'], '"{}"'.format(self.test_document.checksum)
+        )
+
+    def test_document_api_download_view_range(self):
+        self._upload_test_document()
+        self.grant_access(
+            obj=self.test_document, permission=permission_document_download
+        )
+
+        response = self._request_test_document_api_download_view(
+            headers={'HTTP_RANGE': 'bytes=10-19'}
+        )
+        self.assertEqual(
+            response.status_code, status.HTTP_206_PARTIAL_CONTENT
+        )
+
+        with self.test_document.open() as file_object:
+            content = file_object.read()
+
+        self.assertEqual(b''.join(response), content[10:20])
+        self.assertEqual(
+            response['Content-Range'], 'bytes 10-19/{}'.format(len(content))
+        )
+
     def test_document_api_upload_view_no_permission(self):
         response = self._request_test_document_api_upload_view()
         self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
@@ -335,10 +381,147 @@ class DocumentAPIViewTestCase(
         )
 
 
+class DocumentExportAPIViewTestMixin(object):
+    def _request_test_document_export_api_cancel_view(self):
+        return self.post(
+            viewname='rest_api:documentexport-cancel', kwargs={
+                'pk': self.test_document_export.pk
+            }
+        )
+
+    def _request_test_document_export_api_create_view(self):
+        return self.post(
+            viewname='rest_api:documentexport-list', data={
+                'documents_pk_list': self.test_document.pk,
+                'label': TEST_DOCUMENT_EXPORT_LABEL
+            }
+        )
+
+    def _request_test_document_export_api_delete_view(self):
+        return self.delete(
+            viewname='rest_api:documentexport-detail', kwargs={
+                'pk': self.test_document_export.pk
+            }
+        )
+
+    def _request_test_document_export_api_download_view(self, headers=None):
+        return self.get(
+            viewname='rest_api:documentexport-download', headers=headers,
+            kwargs={'pk': self.test_document_export.pk}
+        )
+
+    def _request_test_document_export_api_list_view(self):
+        return self.get(viewname='rest_api:documentexport-list')
+
+
+class DocumentExportAPIViewTestCase(
+    DocumentExportAPIViewTestMixin, DocumentExportTestMixin,
+    DocumentTestMixin, BaseAPITestCase
+):
+    def test_document_export_api_cancel_view(self):
+        self._create_test_document_export_queued()
+
+        response = self._request_test_document_export_api_cancel_view()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.test_document_export.refresh_from_db()
+        self.assertEqual(
+            self.test_document_export.state, DOCUMENT_EXPORT_STATE_CANCELED
+        )
+
+    def test_document_export_api_create_view_no_permission(self):
+        response = self._request_test_document_export_api_create_view()
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        self.assertEqual(DocumentExport.objects.count(), 0)
+
+    def test_document_export_api_create_view_with_access(self):
+        self.grant_access(
+            obj=self.test_document, permission=permission_document_download
+        )
+
+        response = self._request_test_document_export_api_create_view()
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        document_export = DocumentExport.objects.get()
+        self.assertEqual(response.data['id'], document_export.pk)
+        self.assertEqual(
+            document_export.state, DOCUMENT_EXPORT_STATE_FINISHED
+        )
+        self.assertEqual(
+            list(document_export.documents.all()), [self.test_document]
+        )
+
+    def test_document_export_api_create_view_invalid_documents_pk_list(self):
+        self.grant_access(
+            obj=self.test_document, permission=permission_document_download
+        )
+
+        response = self.post(
+            viewname='rest_api:documentexport-list', data={
+                'documents_pk_list': '{},a'.format(self.test_document.pk),
+                'label': TEST_DOCUMENT_EXPORT_LABEL
+            }
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        self.assertEqual(DocumentExport.objects.count(), 0)
+
+    def test_document_export_api_create_view_search_query(self):
+        self.grant_access(
+            obj=self.test_document, permission=permission_document_download
+        )
+        self.grant_access(
+            obj=self.test_document, permission=permission_document_view
+        )
+
+        response = self.post(
+            viewname='rest_api:documentexport-list', data={
+                'search_query': self.test_document.label
+            }
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        self.assertEqual(
+            list(DocumentExport.objects.get().documents.all()),
+            [self.test_document]
+        )
+
+    def test_document_export_api_delete_view(self):
+        self._create_test_document_export()
+
+        response = self._request_test_document_export_api_delete_view()
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+
+        self.assertEqual(DocumentExport.objects.count(), 0)
+
+    def test_document_export_api_download_view_range(self):
+        self._create_test_document_export()
+
+        response = self._request_test_document_export_api_download_view(
+            headers={'HTTP_RANGE': 'bytes=-10'}
+        )
+        self.assertEqual(response.status_code, 206)
+
+        with self.test_document_export.open() as file_object:
+            file_object.seek(self.test_document_export.file_size - 10)
+            self.assertEqual(b''.join(response), file_object.read())
+
+    def test_document_export_api_list_view(self):
+        self._create_test_document_export()
+
+        response = self._request_test_document_export_api_list_view()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data['results'][0]['label'], TEST_DOCUMENT_EXPORT_LABEL
+        )
+
+
 class DocumentVersionAPIViewTestMixin(object):
-    def _request_test_document_version_api_download_view(self):
+    def _request_test_document_version_api_download_view(self, headers=None):
         return self.get(
-            viewname='rest_api:documentversion-download', kwargs={
+            viewname='rest_api:documentversion-download', headers=headers,
+            kwargs={
                 'pk': self.test_document.pk,
                 'version_pk': self.test_document.latest_version.pk,
             }
@@ -409,6 +592,8 @@ class DocumentVersionAPIViewTestCase(
             obj=self.test_document, permission=permission_document_download
         )
 
+        DocumentVersion.objects.update(timestamp_accessed=None)
+
         response = self._request_test_document_version_api_download_view()
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
@@ -419,6 +604,101 @@ class DocumentVersionAPIViewTestCase(
                 mime_type=self.test_document.file_mimetype
             )
 
+        self.assertTrue(
+            DocumentVersion.objects.get(
+                pk=self.test_document.latest_version.pk
+            ).timestamp_accessed
+        )
+
+    def test_document_version_api_download_view_if_range_changed(self):
+        self._upload_test_document()
+        self.grant_access(
+            obj=self.test_document, permission=permission_document_download
+        )
+
+        response = self._request_test_document_version_api_download_view(
+            headers={'HTTP_IF_RANGE': '"outdated"', 'HTTP_RANGE': 'bytes=0-9'}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        with self.test_document.latest_version.open() as file_object:
+            self.assertEqual(b''.join(response), file_object.read())
+
+    def test_document_version_api_download_view_if_range_unchanged(self):
+        self._upload_test_document()
+        self.grant_access(
+            obj=self.test_document, permission=permission_document_download
+        )
+
+        response = self._request_test_document_version_api_download_view(
+            headers={
+                'HTTP_IF_RANGE': '"{}"'.format(
+                    self.test_document.latest_version.checksum
+                ), 'HTTP_RANGE': 'bytes=0-9'
+            }
+        )
+        self.assertEqual(
+            response.status_code, status.HTTP_206_PARTIAL_CONTENT
+        )
+
+        with self.test_document.latest_version.open() as file_object:
+            self.assertEqual(b''.join(response), file_object.read(10))
+
+    def test_document_version_api_download_view_multiple_ranges(self):
+        self._upload_test_document()
+        self.grant_access(
+            obj=self.test_document, permission=permission_document_download
+        )
+
+        response = self._request_test_document_version_api_download_view(
+            headers={'HTTP_RANGE': 'bytes=0-9,-10'}
+        )
+        self.assertEqual(
+            response.status_code, status.HTTP_206_PARTIAL_CONTENT
+        )
+        self.assertTrue(
+            response['Content-Type'].startswith('multipart/byteranges')
+        )
+
+        content = b''.join(response)
+        self.assertEqual(len(content), int(response['Content-Length']))
+
+        with self.test_document.latest_version.open() as file_object:
+            file_content = file_object.read()
+
+        size = len(file_content)
+        self.assertTrue(file_content[:10] in content)
+        self.assertTrue(file_content[-10:] in content)
+        self.assertTrue(
+            'Content-Range: bytes {}-{}/{}'.format(
+                size - 10, size - 1, size
+            ).encode() in content
+        )
+
+    def test_document_version_api_download_view_no_range(self):
+        self._upload_test_document()
+        self.grant_access(
+            obj=self.test_document, permission=permission_document_download
+        )
+
+        test_file_object = mock.Mock(
+            wraps=self.test_document.latest_version.open()
+        )
+
+        with mock.patch.object(
+            DocumentVersion, 'open', return_value=test_file_object
+        ):
+            response = self._request_test_document_version_api_download_view()
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(response['Accept-Ranges'], 'bytes')
+            content = b''.join(response)
+
+        # The size of the file is not calculated by seeking to its end.
+        test_file_object.seek.assert_not_called()
+
+        with self.test_document.latest_version.open() as file_object:
+            self.assertEqual(content, file_object.read())
+
     def test_document_version_api_download_preserve_extension_view(self):
         self._upload_test_document()
         self.grant_access(
@@ -524,6 +804,7 @@ class DocumentVersionAPIViewTestCase(
         response = self._request_test_document_version_api_revert_view()
         self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
 
+        self.test_document.refresh_from_db()
         self.assertEqual(self.test_document.versions.count(), 1)
         self.assertEqual(
             self.test_document.versions.first(), self.test_document.latest_version
@@ -544,6 +825,7 @@ class DocumentVersionAPIViewTestCase(
         response = self._request_test_document_version_api_upload_view()
         self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
 
+        self.test_document.refresh_from_db()
         self.assertEqual(self.test_document.versions.count(), 2)
         self.assertEqual(self.test_document.exists(), True)
         self.assertEqual(self.test_document.size, 272213)
@@ -557,13 +839,13 @@ class DocumentVersionAPIViewTestCase(
 
 
 class DocumentPageAPIViewTestMixin(object):
-    def _request_document_page_image(self):
+    def _request_document_page_image(self, headers=None):
         page = self.test_document.pages.first()
         return self.get(
             viewname='rest_api:documentpage-image', kwargs={
                 'pk': page.document.pk, 'version_pk': page.document_version.pk,
                 'page_pk': page.pk
-            }
+            }, headers=headers
         )
 
 
@@ -582,6 +864,38 @@ class DocumentPageAPIViewTestCase(
         response = self._request_document_page_image()
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
+    @mock.patch('mayan.apps.documents.api_views.task_generate_document_page_image')
+    def test_document_page_api_image_view_cached(
+        self, mock_task_generate_document_page_image
+    ):
+        self.test_document.pages.first().generate_image()
+
+        self.grant_access(
+            obj=self.test_document, permission=permission_document_view
+        )
+
+        response = self._request_document_page_image()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(mock_task_generate_document_page_image.apply_async.called)
+
+    def test_document_page_api_image_view_etag(self):
+        self.grant_access(
+            obj=self.test_document, permission=permission_document_view
+        )
+
+        response = self._request_document_page_image()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.has_header('ETag'))
+        self.assertEqual(
+            int(response['Content-Length']),
+            len(b''.join(response.streaming_content))
+        )
+
+        response = self._request_document_page_image(
+            headers={'HTTP_IF_NONE_MATCH': response['ETag']}
+        )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
 
 class TrashedDocumentAPIViewTestMixin(object):
     def _request_test_document_api_trash_view(self):
@@ -0,0 +1,144 @@
+import zipfile
+
+from django.utils.six import BytesIO
+
+from ..literals import (
+    DOCUMENT_EXPORT_STATE_CANCELED, DOCUMENT_EXPORT_STATE_FINISHED
+)
+from ..models import DocumentExport
+from ..permissions import permission_document_download
+
+from .base import GenericDocumentViewTestCase
+from .literals import TEST_DOCUMENT_EXPORT_LABEL
+from .mixins import DocumentExportTestMixin, DocumentExportViewTestMixin
+
+
+class DocumentExportViewTestCase(
+    DocumentExportTestMixin, DocumentExportViewTestMixin,
+    GenericDocumentViewTestCase
+):
+    def test_document_export_cancel_view(self):
+        self._create_test_document_export_queued()
+
+        response = self._request_test_document_export_cancel_view()
+        self.assertEqual(response.status_code, 302)
+
+        self.test_document_export.refresh_from_db()
+        self.assertEqual(
+            self.test_document_export.state, DOCUMENT_EXPORT_STATE_CANCELED
+        )
+
+    def test_document_export_cancel_view_other_user(self):
+        self._create_test_document_export_queued()
+        self._create_test_user()
+        self.test_document_export.user = self.test_user
+        self.test_document_export.save()
+
+        response = self._request_test_document_export_cancel_view()
+        self.assertEqual(response.status_code, 404)
+
+    def test_document_export_delete_view(self):
+        self._create_test_document_export()
+        file_name = self.test_document_export.file.name
+
+        response = self._request_test_document_export_delete_view()
+        self.assertEqual(response.status_code, 302)
+
+        self.assertEqual(DocumentExport.objects.count(), 0)
+        self.assertFalse(
+            self.test_document_export.file.storage.exists(name=file_name)
+        )
+
+    def test_document_export_download_view(self):
+        self.expected_content_types = ('application/zip',)
+        self._create_test_document_export()
+
+        response = self._request_test_document_export_download_view()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        self.assert_download_response(
+            response=response, filename=TEST_DOCUMENT_EXPORT_LABEL
+        )
+
+        with zipfile.ZipFile(BytesIO(b''.join(response))) as zip_file:
+            self.assertEqual(zip_file.testzip(), None)
+            with self.test_document.open() as file_object:
+                self.assertEqual(
+                    zip_file.read(self.test_document.label),
+                    file_object.read()
+                )
+
+    def test_document_export_download_view_range(self):
+        self.expected_content_types = ('application/zip',)
+        self._create_test_document_export()
+
+        response = self._request_test_document_export_download_view(
+            headers={'HTTP_RANGE': 'bytes=10-19'}
+        )
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(
+            response['Content-Range'], 'bytes 10-19/{}'.format(
+                self.test_document_export.file_size
+            )
+        )
+
+        with self.test_document_export.open() as file_object:
+            file_object.seek(10)
+            self.assertEqual(b''.join(response), file_object.read(10))
+
+    def test_document_export_download_view_range_not_satisfiable(self):
+        self.expected_content_types = ('text/html; charset=utf-8',)
+        self._create_test_document_export()
+
+        response = self._request_test_document_export_download_view(
+            headers={
+                'HTTP_RANGE': 'bytes={}-'.format(
+                    self.test_document_export.file_size
+                )
+            }
+        )
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(
+            response['Content-Range'], 'bytes */{}'.format(
+                self.test_document_export.file_size
+            )
+        )
+
+    def test_document_export_download_view_queued(self):
+        self._create_test_document_export_queued()
+
+        response = self._request_test_document_export_download_view()
+        self.assertEqual(response.status_code, 404)
+
+    def test_document_export_list_view(self):
+        self._create_test_document_export()
+
+        response = self._request_test_document_export_list_view()
+        self.assertContains(
+            response=response, status_code=200,
+            text=TEST_DOCUMENT_EXPORT_LABEL
+        )
+
+    def test_document_multiple_export_view_no_permission(self):
+        response = self._request_test_document_multiple_export_view()
+        self.assertEqual(response.status_code, 404)
+
+        self.assertEqual(DocumentExport.objects.count(), 0)
+
+    def test_document_multiple_export_view_with_access(self):
+        self.grant_access(
+            obj=self.test_document, permission=permission_document_download
+        )
+
+        response = self._request_test_document_multiple_export_view()
+        self.assertEqual(response.status_code, 302)
+
+        document_export = DocumentExport.objects.get()
+        self.assertEqual(document_export.label, TEST_DOCUMENT_EXPORT_LABEL)
+        self.assertEqual(document_export.user, self._test_case_user)
+        self.assertEqual(
+            document_export.state, DOCUMENT_EXPORT_STATE_FINISHED
+        )
+        self.assertEqual(
+            list(document_export.documents.all()), [self.test_document]
+        )
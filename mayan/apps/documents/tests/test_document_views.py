@@ -1,9 +1,13 @@
+import zipfile
+
 from django.test import override_settings
+from django.utils.six import BytesIO
 
 from mayan.apps.converter.layers import layer_saved_transformations
 from mayan.apps.converter.permissions import permission_transformation_delete
 from mayan.apps.converter.tests.mixins import LayerTestMixin
 
+from ..literals import DEFAULT_ZIP_FILENAME
 from ..models import DeletedDocument, Document, DocumentType
 from ..permissions import (
     permission_document_create, permission_document_download,
@@ -265,6 +269,43 @@ class DocumentViewTestCase(
                 mime_type=self.test_document.file_mimetype
             )
 
+    def test_document_multiple_download_view_compressed_with_permission(self):
+        # Set the expected_content_types for
+        # common.tests.mixins.ContentTypeCheckMixin
+        self.expected_content_types = ('application/zip',)
+        self._upload_test_document(
+            label='{}_2'.format(TEST_SMALL_DOCUMENT_FILENAME)
+        )
+        for test_document in self.test_documents:
+            self.grant_access(
+                obj=test_document, permission=permission_document_download
+            )
+
+        response = self.get(
+            viewname='documents:document_multiple_download', data={
+                'id_list': ','.join(
+                    str(test_document.pk) for test_document in self.test_documents
+                )
+            }
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assert_download_response(
+            response=response, filename=DEFAULT_ZIP_FILENAME
+        )
+
+        with zipfile.ZipFile(BytesIO(b''.join(response))) as zip_file:
+            self.assertEqual(zip_file.testzip(), None)
+            self.assertEqual(
+                zip_file.namelist(), [
+                    test_document.label for test_document in self.test_documents
+                ]
+            )
+            with self.test_document.open() as file_object:
+                self.assertEqual(
+                    zip_file.read(self.test_document.label),
+                    file_object.read()
+                )
+
     def test_document_update_page_count_view_no_permission(self):
         self.test_document.pages.all().delete()
         self.assertEqual(self.test_document.pages.count(), 0)
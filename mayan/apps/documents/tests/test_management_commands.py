@@ -0,0 +1,113 @@
+from django.core import management
+from django.utils.six import StringIO
+
+from ..models import Document, DocumentVersion
+
+from .base import GenericDocumentTestCase
+from .literals import TEST_SMALL_DOCUMENT_SIZE
+
+
+class DeduplicateDocumentFilesManagementCommandTestCase(
+    GenericDocumentTestCase
+):
+    def _call_command(self, **kwargs):
+        output = StringIO()
+        management.call_command(
+            command_name='deduplicatedocumentfiles', stdout=output, **kwargs
+        )
+        return output.getvalue()
+
+    def test_deduplicate_document_files_command(self):
+        self._upload_test_document()
+
+        output = self._call_command()
+
+        self.assertTrue(
+            'Document versions processed: 2, bytes reclaimed: {}'.format(
+                TEST_SMALL_DOCUMENT_SIZE
+            ) in output
+        )
+        self.assertTrue('stored files: 1, shared files: 1' in output)
+
+        self.assertEqual(
+            DocumentVersion.objects.values('file').distinct().count(), 1
+        )
+        for document_version in DocumentVersion.objects.all():
+            self.assertEqual(
+                document_version.checksum,
+                document_version.update_checksum(save=False)
+            )
+
+    def test_deduplicate_document_files_command_statistics(self):
+        self._upload_test_document()
+
+        output = self._call_command(statistics=True)
+
+        self.assertFalse('Document versions processed' in output)
+        self.assertTrue('stored files: 2, shared files: 0' in output)
+
+
+class RepairDocumentsManagementCommandTestCase(GenericDocumentTestCase):
+    def _call_command(self):
+        output = StringIO()
+        management.call_command(command_name='repairdocuments', stdout=output)
+        return output.getvalue()
+
+    def test_repair_documents_command(self):
+        Document.passthrough.filter(pk=self.test_document.pk).update(
+            latest_version=None
+        )
+        DocumentVersion.objects.filter(
+            pk=self.test_document.latest_version.pk
+        ).update(page_count=0)
+
+        output = self._call_command()
+
+        self.assertTrue(
+            'Document versions with repaired page count: 1' in output
+        )
+        self.assertTrue('Documents with repaired latest version: 1' in output)
+
+        self.test_document.refresh_from_db()
+        self.assertEqual(
+            self.test_document.latest_version,
+            self.test_document.versions.first()
+        )
+        self.assertEqual(self.test_document.latest_version.page_count, 1)
+
+    def test_repair_documents_command_no_changes(self):
+        output = self._call_command()
+
+        self.assertTrue(
+            'Document versions with repaired page count: 0' in output
+        )
+        self.assertTrue('Documents with repaired latest version: 0' in output)
+
+
+class WarmCacheManagementCommandTestCase(GenericDocumentTestCase):
+    def _call_command(self, **kwargs):
+        output = StringIO()
+        management.call_command(
+            command_name='warmcache', foreground=True, stdout=output,
+            **kwargs
+        )
+        return output.getvalue()
+
+    def test_warm_cache_command(self):
+        output = self._call_command()
+
+        self.assertTrue(
+            'Document ID {}'.format(self.test_document.pk) in output
+        )
+        self.assertEqual(
+            self.test_document.latest_version.warm_cache(), 0
+        )
+
+    def test_warm_cache_command_document_type_filter(self):
+        output = self._call_command(
+            document_type_id_list=[self.test_document_type.pk + 1]
+        )
+
+        self.assertFalse(
+            'Document ID {}'.format(self.test_document.pk) in output
+        )
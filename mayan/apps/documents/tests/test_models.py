@@ -1,20 +1,42 @@
 from datetime import timedelta
 import time
+import zipfile
 
 from django.test import override_settings
+from django.utils.timezone import now
 
-from mayan.apps.common.tests.base import BaseTestCase
-from mayan.apps.converter.layers import layer_saved_transformations
+from actstream.models import Action
+import mock
 
+from mayan.apps.common.tests.base import (
+    BaseTestCase, BaseTransactionTestCase
+)
+from mayan.apps.converter.layers import layer_saved_transformations
+from mayan.apps.lock_manager.exceptions import LockError
+from mayan.apps.lock_manager.runtime import locking_backend
+from mayan.apps.storage.tests.mixins import DefinedStorageTierTestMixin
+
+from ..events import event_document_export_finished
+from ..literals import (
+    DOCUMENT_EXPORT_STATE_CANCELED, DOCUMENT_EXPORT_STATE_FINISHED,
+    DOCUMENT_PAGE_BASE_IMAGE_CACHE_FILENAME, DOCUMENT_VERSION_FILE_LOCK_NAME,
+    STORAGE_NAME_DOCUMENT_VERSION
+)
 from ..models import (
-    DeletedDocument, Document, DocumentType, DuplicatedDocument
+    DeletedDocument, Document, DocumentExport, DocumentType,
+    DocumentVersion, DuplicatedDocument
+)
+from ..settings import (
+    setting_storage_content_addressed, setting_stub_expiration_interval
 )
-from ..settings import setting_stub_expiration_interval
 
 from .base import GenericDocumentTestCase
+from .mixins import (
+    DocumentExportTestMixin, DocumentTestMixin, DocumentVersionTestMixin
+)
 from .literals import (
     TEST_DOCUMENT_TYPE_LABEL, TEST_MULTI_PAGE_TIFF,
-    TEST_OFFICE_DOCUMENT, TEST_PDF_INDIRECT_ROTATE_LABEL,
+    TEST_MULTI_PAGE_TIFF_PATH, TEST_OFFICE_DOCUMENT, TEST_PDF_INDIRECT_ROTATE_LABEL,
     TEST_PDF_ROTATE_ALTERNATE_LABEL, TEST_SMALL_DOCUMENT_CHECKSUM,
     TEST_SMALL_DOCUMENT_FILENAME, TEST_SMALL_DOCUMENT_MIMETYPE,
     TEST_SMALL_DOCUMENT_PATH, TEST_SMALL_DOCUMENT_SIZE
@@ -188,6 +210,72 @@ class MultiPageTiffTestCase(GenericDocumentTestCase):
         )
         self.assertEqual(self.test_document.page_count, 2)
 
+    def test_method_cache_page_images(self):
+        test_document_version = self.test_document.latest_version
+
+        self.assertEqual(test_document_version.cache_page_images(), 2)
+
+        for document_page in test_document_version.pages.all():
+            self.assertTrue(
+                document_page.cache_partition.get_file(
+                    filename=DOCUMENT_PAGE_BASE_IMAGE_CACHE_FILENAME
+                )
+            )
+
+        self.assertEqual(test_document_version.cache_page_images(), 0)
+
+    def test_method_page_get_label_disabled_page(self):
+        test_document_version = self.test_document.latest_version
+
+        test_document_page = test_document_version.pages.first()
+        test_document_page.enabled = False
+        test_document_page.save()
+
+        self.assertTrue(
+            'Page 2 out of 2 ' in test_document_version.pages_all.get(
+                page_number=2
+            ).get_label()
+        )
+
+    def test_method_refresh_page_count(self):
+        test_document_version = self.test_document.latest_version
+        self.assertEqual(test_document_version.page_count, 2)
+
+        test_document_page = test_document_version.pages.first()
+        test_document_page.enabled = False
+        test_document_page.save()
+
+        test_document_version.refresh_from_db()
+        self.assertEqual(test_document_version.page_count, 1)
+
+        test_document_page.enabled = True
+        test_document_page.save()
+
+        test_document_version.refresh_from_db()
+        self.assertEqual(test_document_version.page_count, 2)
+
+    def test_method_update_page_count(self):
+        test_document_version = self.test_document.latest_version
+        test_document_version.cache_page_images()
+
+        cache_partition_names = [
+            document_page.cache_partition.name for document_page in test_document_version.pages.all()
+        ]
+
+        self.assertEqual(test_document_version.update_page_count(), 2)
+        self.assertEqual(test_document_version.pages.count(), 2)
+        self.assertFalse(
+            test_document_version.cache.partitions.filter(
+                name__in=cache_partition_names
+            ).exists()
+        )
+
+    def test_method_warm_cache(self):
+        test_document_version = self.test_document.latest_version
+
+        self.assertTrue(test_document_version.warm_cache() > 0)
+        self.assertEqual(test_document_version.warm_cache(), 0)
+
 
 class DocumentVersionTestCase(GenericDocumentTestCase):
     def test_add_new_version(self):
@@ -205,6 +293,31 @@ class DocumentVersionTestCase(GenericDocumentTestCase):
             TEST_SMALL_DOCUMENT_CHECKSUM
         )
 
+        self.test_document.refresh_from_db()
+        self.assertEqual(
+            self.test_document.latest_version,
+            self.test_document.versions.order_by('timestamp').last()
+        )
+
+    def test_delete_latest_version(self):
+        test_document_version = self.test_document.latest_version
+
+        with open(TEST_SMALL_DOCUMENT_PATH, mode='rb') as file_object:
+            test_new_document_version = self.test_document.new_version(
+                file_object=file_object
+            )
+
+        self.assertEqual(
+            self.test_document.latest_version, test_new_document_version
+        )
+
+        test_new_document_version.delete()
+
+        self.test_document.refresh_from_db()
+        self.assertEqual(
+            self.test_document.latest_version, test_document_version
+        )
+
     def test_revert_version(self):
         self.assertEqual(self.test_document.versions.count(), 1)
 
@@ -223,11 +336,292 @@ class DocumentVersionTestCase(GenericDocumentTestCase):
 
         self.assertEqual(self.test_document.versions.count(), 1)
 
+        self.test_document.refresh_from_db()
+        self.assertEqual(
+            self.test_document.latest_version,
+            self.test_document.versions.first()
+        )
+
     def test_method_get_absolute_url(self):
         self._upload_test_document()
 
         self.assertTrue(self.test_document.latest_version.get_absolute_url())
 
+    def test_method_ingest_file(self):
+        test_document_version = self.test_document.latest_version
+        test_document_version.checksum = ''
+        test_document_version.mimetype = ''
+
+        with mock.patch('mayan.apps.documents.models.document_version_models.get_mimetype') as mock_get_mimetype:
+            test_document_version.ingest_file()
+
+        self.assertFalse(mock_get_mimetype.called)
+        self.assertEqual(
+            test_document_version.checksum, TEST_SMALL_DOCUMENT_CHECKSUM
+        )
+        self.assertEqual(
+            test_document_version.mimetype, TEST_SMALL_DOCUMENT_MIMETYPE
+        )
+        self.assertEqual(test_document_version.pages.count(), 1)
+
+
+class DocumentVersionContentAddressedTestCase(
+    DocumentTestMixin, BaseTransactionTestCase
+):
+    auto_upload_test_document = False
+
+    def setUp(self):
+        super(DocumentVersionContentAddressedTestCase, self).setUp()
+        self.old_value = setting_storage_content_addressed.value
+        setting_storage_content_addressed.value = 'true'
+        self._upload_test_document()
+        self._upload_test_document()
+        self.test_document_versions = [
+            document.latest_version for document in self.test_documents
+        ]
+
+    def tearDown(self):
+        setting_storage_content_addressed.value = '{}'.format(
+            self.old_value
+        )
+        super(DocumentVersionContentAddressedTestCase, self).tearDown()
+
+    def test_file_sharing(self):
+        self.assertEqual(
+            self.test_document_versions[0].file.name,
+            self.test_document_versions[0].get_content_addressed_name()
+        )
+        self.assertEqual(
+            self.test_document_versions[0].file.name,
+            self.test_document_versions[1].file.name
+        )
+
+        self.assertEqual(
+            DocumentVersion.objects.get_file_statistics(), {
+                'file_count': 1, 'reclaimed_size': TEST_SMALL_DOCUMENT_SIZE,
+                'shared_file_count': 1, 'version_count': 2
+            }
+        )
+
+    def test_file_sharing_delete(self):
+        self.test_documents[0].delete(to_trash=False)
+        self.assertTrue(self.test_document_versions[1].exists())
+
+        self.test_documents[1].delete(to_trash=False)
+        self.assertFalse(self.test_document_versions[1].exists())
+
+    def test_file_sharing_delete_locked(self):
+        # Another process holds the lock of the file.
+        lock = locking_backend.acquire_lock(
+            name=DOCUMENT_VERSION_FILE_LOCK_NAME.format(
+                checksum=self.test_document_versions[0].checksum[:40]
+            )
+        )
+        try:
+            with mock.patch(
+                'mayan.apps.documents.utils.DOCUMENT_VERSION_FILE_LOCK_WAIT',
+                0
+            ):
+                with self.assertRaises(expected_exception=LockError):
+                    self.test_documents[0].delete(to_trash=False)
+        finally:
+            lock.release()
+
+        self.assertTrue(self.test_document_versions[0].exists())
+
+    def test_file_sharing_lock_released(self):
+        self.test_documents[0].delete(to_trash=False)
+
+        # The lock of the file is released when the block exits.
+        locking_backend.acquire_lock(
+            name=DOCUMENT_VERSION_FILE_LOCK_NAME.format(
+                checksum=self.test_document_versions[1].checksum[:40]
+            )
+        ).release()
+
+
+class DocumentVersionStorageTierTestCase(
+    DefinedStorageTierTestMixin, DocumentVersionTestMixin,
+    GenericDocumentTestCase
+):
+    def setUp(self):
+        super(DocumentVersionStorageTierTestCase, self).setUp()
+        self._create_test_storage_tier(
+            defined_storage_name=STORAGE_NAME_DOCUMENT_VERSION,
+            policy={'non_latest': True}
+        )
+        self._upload_new_version()
+        self.test_document_version = self.test_document.versions.first()
+
+    def test_migrate_storage_tiers(self):
+        self.assertEqual(
+            DocumentVersion.objects.migrate_storage_tiers(batch_size=10), 1
+        )
+
+        self.test_document_version.refresh_from_db()
+        self.assertTrue(
+            self.test_document_version.file.name.startswith(
+                self.test_storage_tier.get_file_name(file_name='')
+            )
+        )
+        self.assertEqual(
+            self.test_document_version.checksum,
+            self.test_document_version.update_checksum(save=False)
+        )
+        self.assertEqual(
+            self.test_storage_tier.get_usage()['file_count'], 1
+        )
+        self.assertFalse(
+            self.test_document.latest_version.file.name.startswith('tiers/')
+        )
+
+    def test_migrate_storage_tiers_back(self):
+        DocumentVersion.objects.migrate_storage_tiers(batch_size=10)
+
+        self.test_storage_tier.policy = {'inactive_days': 1}
+
+        self.assertEqual(
+            DocumentVersion.objects.migrate_storage_tiers(batch_size=10), 1
+        )
+
+        self.test_document_version.refresh_from_db()
+        self.assertFalse(
+            self.test_document_version.file.name.startswith('tiers/')
+        )
+        self.assertTrue(self.test_document_version.exists())
+        self.assertEqual(
+            self.test_storage_tier.get_usage()['file_count'], 0
+        )
+
+    def test_migrate_storage_tiers_batch_size(self):
+        self._upload_new_version()
+
+        self.assertEqual(
+            DocumentVersion.objects.migrate_storage_tiers(batch_size=1), 1
+        )
+        self.assertEqual(
+            DocumentVersion.objects.migrate_storage_tiers(batch_size=1), 1
+        )
+        self.assertEqual(
+            DocumentVersion.objects.migrate_storage_tiers(batch_size=1), 0
+        )
+
+    def test_timestamp_accessed(self):
+        self.test_document_version.timestamp_accessed = None
+
+        with self.test_document_version.open(track_access=True):
+            pass
+
+        self.test_document_version.refresh_from_db()
+        self.assertTrue(self.test_document_version.timestamp_accessed)
+
+    def test_timestamp_accessed_warm_cache(self):
+        DocumentVersion.objects.filter(
+            pk=self.test_document_version.pk
+        ).update(timestamp_accessed=None)
+        self.test_document_version.refresh_from_db()
+        self.test_document_version.cache_partition.purge()
+
+        self.assertTrue(self.test_document_version.warm_cache())
+
+        self.test_document_version.refresh_from_db()
+        self.assertEqual(self.test_document_version.timestamp_accessed, None)
+
+
+class DocumentExportTestCase(
+    DocumentExportTestMixin, GenericDocumentTestCase
+):
+    def test_method_cancel_queued(self):
+        self._create_test_document_export_queued()
+
+        self.test_document_export.cancel()
+        self.test_document_export.export()
+
+        self.assertEqual(
+            self.test_document_export.state, DOCUMENT_EXPORT_STATE_CANCELED
+        )
+        self.assertEqual(self.test_document_export.processed_count, 0)
+        self.assertFalse(self.test_document_export.file)
+
+    def test_method_cancel_running(self):
+        self._upload_test_document(
+            label='{}_2'.format(TEST_SMALL_DOCUMENT_FILENAME)
+        )
+        self._create_test_document_export_queued()
+
+        document_open = Document.open
+
+        def open_and_cancel(document, *args, **kwargs):
+            DocumentExport.objects.get(
+                pk=self.test_document_export.pk
+            ).cancel()
+            return document_open(document, *args, **kwargs)
+
+        with mock.patch.object(Document, 'open', autospec=True) as mock_open:
+            mock_open.side_effect = open_and_cancel
+            self.test_document_export.export()
+
+        self.assertEqual(
+            self.test_document_export.state, DOCUMENT_EXPORT_STATE_CANCELED
+        )
+        self.assertEqual(self.test_document_export.processed_count, 0)
+        self.assertFalse(self.test_document_export.file)
+        self.assertEqual(mock_open.call_count, 1)
+
+    def test_method_create_for(self):
+        self._upload_test_document(
+            label='{}_2'.format(TEST_SMALL_DOCUMENT_FILENAME)
+        )
+        self._create_test_document_export()
+
+        self.assertEqual(
+            self.test_document_export.state, DOCUMENT_EXPORT_STATE_FINISHED
+        )
+        self.assertEqual(self.test_document_export.document_count, 2)
+        self.assertEqual(self.test_document_export.processed_count, 2)
+        self.assertEqual(self.test_document_export.get_progress(), 100)
+        self.assertTrue(self.test_document_export.datetime_expiration)
+
+        with self.test_document_export.open() as file_object:
+            self.assertEqual(
+                len(file_object.read()), self.test_document_export.file_size
+            )
+            file_object.seek(0)
+
+            with zipfile.ZipFile(file_object) as zip_file:
+                self.assertEqual(zip_file.testzip(), None)
+                self.assertEqual(
+                    sorted(zip_file.namelist()), sorted(
+                        [document.label for document in self.test_documents]
+                    )
+                )
+
+    def test_method_create_for_event(self):
+        Action.objects.all().delete()
+        self._create_test_document_export()
+
+        action = Action.objects.get()
+        self.assertEqual(action.actor, self._test_case_user)
+        self.assertEqual(action.target, self.test_document_export)
+        self.assertEqual(action.verb, event_document_export_finished.id)
+
+    def test_method_delete_expired(self):
+        self._create_test_document_export()
+        file_name = self.test_document_export.file.name
+
+        DocumentExport.objects.delete_expired()
+        self.assertEqual(DocumentExport.objects.count(), 1)
+
+        DocumentExport.objects.filter(
+            pk=self.test_document_export.pk
+        ).update(datetime_expiration=now() - timedelta(seconds=1))
+
+        DocumentExport.objects.delete_expired()
+        self.assertEqual(DocumentExport.objects.count(), 0)
+        self.assertFalse(
+            self.test_document_export.file.storage.exists(name=file_name)
+        )
+
 
 class DocumentManagerTestCase(BaseTestCase):
     def setUp(self):
@@ -296,3 +690,47 @@ class DuplicatedDocumentsTestCase(GenericDocumentTestCase):
                 document=self.test_documents[0]
             ).documents.all()
         )
+
+    def test_duplicate_scan_after_new_version(self):
+        self._upload_test_document()
+
+        with open(TEST_MULTI_PAGE_TIFF_PATH, mode='rb') as file_object:
+            self.test_documents[1].new_version(file_object=file_object)
+
+        self.assertFalse(
+            DuplicatedDocument.objects.filter(
+                document__in=self.test_documents
+            ).exists()
+        )
+
+    def test_method_scan(self):
+        self._upload_test_document()
+        self.test_document_path = TEST_MULTI_PAGE_TIFF_PATH
+        self._upload_test_document()
+        DuplicatedDocument.objects.all().delete()
+        # Stale list of a document that is not duplicated.
+        DuplicatedDocument.objects.create(
+            document=self.test_documents[2]
+        ).documents.add(self.test_documents[0])
+
+        DuplicatedDocument.objects.scan()
+
+        self.assertEqual(
+            list(
+                DuplicatedDocument.objects.get(
+                    document=self.test_documents[0]
+                ).documents.all()
+            ), [self.test_documents[1]]
+        )
+        self.assertEqual(
+            list(
+                DuplicatedDocument.objects.get(
+                    document=self.test_documents[1]
+                ).documents.all()
+            ), [self.test_documents[0]]
+        )
+        self.assertFalse(
+            DuplicatedDocument.objects.filter(
+                document=self.test_documents[2]
+            ).exists()
+        )
@@ -3,13 +3,20 @@ from django.conf.urls import url
 from .api_views import (
     APITrashedDocumentListView, APIDeletedDocumentRestoreView,
     APIDeletedDocumentView, APIDocumentDocumentTypeChangeView,
-    APIDocumentDownloadView, APIDocumentView, APIDocumentListView,
+    APIDocumentDownloadView, APIDocumentExportCancelView,
+    APIDocumentExportDownloadView, APIDocumentExportListView,
+    APIDocumentExportView, APIDocumentView, APIDocumentListView,
     APIDocumentVersionDownloadView, APIDocumentPageImageView,
     APIDocumentPageView, APIDocumentTypeDocumentListView,
     APIDocumentTypeListView, APIDocumentTypeView,
     APIDocumentVersionsListView, APIDocumentVersionPageListView,
     APIDocumentVersionView, APIRecentDocumentListView
 )
+from .views.document_export_views import (
+    DocumentExportCancelView, DocumentExportDeleteView,
+    DocumentExportDownloadView, DocumentExportListView,
+    DocumentMultipleExportView
+)
 from .views.document_page_views import (
     DocumentPageDisable, DocumentPageEnable, DocumentPageListView,
     DocumentPageNavigationFirst, DocumentPageNavigationLast,
@@ -49,6 +56,33 @@ from .views.trashed_document_views import (
     TrashedDocumentListView, TrashedDocumentRestoreView
 )
 
+urlpatterns_document_exports = [
+    url(
+        regex=r'^documents/exports/$', name='document_export_list',
+        view=DocumentExportListView.as_view()
+    ),
+    url(
+        regex=r'^documents/exports/(?P<document_export_id>\d+)/cancel/$',
+        name='document_export_cancel',
+        view=DocumentExportCancelView.as_view()
+    ),
+    url(
+        regex=r'^documents/exports/(?P<document_export_id>\d+)/delete/$',
+        name='document_export_delete',
+        view=DocumentExportDeleteView.as_view()
+    ),
+    url(
+        regex=r'^documents/exports/(?P<document_export_id>\d+)/download/$',
+        name='document_export_download',
+        view=DocumentExportDownloadView.as_view()
+    ),
+    url(
+        regex=r'^documents/multiple/export/$',
+        name='document_multiple_export',
+        view=DocumentMultipleExportView.as_view()
+    ),
+]
+
 urlpatterns_document_types = [
     url(
         regex=r'^document_types/$', name='document_type_list',
@@ -370,6 +404,7 @@ urlpatterns_trashed_documents = [
 ]
 
 urlpatterns = []
+urlpatterns.extend(urlpatterns_document_exports)
 urlpatterns.extend(urlpatterns_document_pages)
 urlpatterns.extend(urlpatterns_document_types)
 urlpatterns.extend(urlpatterns_document_versions)
@@ -404,6 +439,24 @@ api_urls = [
         regex=r'^documents/(?P<pk>[0-9]+)/download/$',
         view=APIDocumentDownloadView.as_view(), name='document-download'
     ),
+    url(
+        regex=r'^documents/exports/$', view=APIDocumentExportListView.as_view(),
+        name='documentexport-list'
+    ),
+    url(
+        regex=r'^documents/exports/(?P<pk>[0-9]+)/$',
+        view=APIDocumentExportView.as_view(), name='documentexport-detail'
+    ),
+    url(
+        regex=r'^documents/exports/(?P<pk>[0-9]+)/cancel/$',
+        view=APIDocumentExportCancelView.as_view(),
+        name='documentexport-cancel'
+    ),
+    url(
+        regex=r'^documents/exports/(?P<pk>[0-9]+)/download/$',
+        view=APIDocumentExportDownloadView.as_view(),
+        name='documentexport-download'
+    ),
     url(
         regex=r'^documents/(?P<pk>[0-9]+)/type/change/$',
         view=APIDocumentDocumentTypeChangeView.as_view(),
@@ -1,14 +1,43 @@
+from contextlib import contextmanager
 import logging
+import time
 
 import pycountry
 
 from django.utils.translation import ugettext_lazy as _
 
-from .settings import setting_language_codes
+from mayan.apps.lock_manager.exceptions import LockError
+from mayan.apps.lock_manager.runtime import locking_backend
+
+from .literals import (
+    DOCUMENT_VERSION_FILE_LOCK_NAME, DOCUMENT_VERSION_FILE_LOCK_POLL_INTERVAL,
+    DOCUMENT_VERSION_FILE_LOCK_TIMEOUT, DOCUMENT_VERSION_FILE_LOCK_WAIT
+)
+from .settings import (
+    setting_display_height, setting_display_width, setting_language_codes,
+    setting_preview_height, setting_preview_width, setting_thumbnail_height,
+    setting_thumbnail_width
+)
 
 logger = logging.getLogger(name=__name__)
 
 
+def _acquire_document_version_file_lock(checksum):
+    lock_id = DOCUMENT_VERSION_FILE_LOCK_NAME.format(checksum=checksum[:40])
+    start_time = time.time()
+
+    while True:
+        try:
+            return locking_backend.acquire_lock(
+                name=lock_id, timeout=DOCUMENT_VERSION_FILE_LOCK_TIMEOUT
+            )
+        except LockError:
+            if time.time() - start_time > DOCUMENT_VERSION_FILE_LOCK_WAIT:
+                raise
+
+            time.sleep(DOCUMENT_VERSION_FILE_LOCK_POLL_INTERVAL)
+
+
 def get_language(language_code):
     language = getattr(
         pycountry.languages.get(alpha_3=language_code), 'name', None
@@ -20,6 +49,25 @@ def get_language(language_code):
         return _('Unknown language "%s"') % language_code
 
 
+def get_page_image_size_presets():
+    """
+    Return the image arguments of the display, preview and thumbnail sizes
+    requested by the user interface.
+    """
+    result = []
+
+    for width, height in (
+        (setting_display_width.value, setting_display_height.value),
+        (setting_preview_width.value, setting_preview_height.value),
+        (setting_thumbnail_width.value, setting_thumbnail_height.value),
+    ):
+        image_kwargs = {'height': height, 'width': width}
+        if image_kwargs not in result:
+            result.append(image_kwargs)
+
+    return result
+
+
 def get_language_choices():
     result = []
 
@@ -44,3 +92,24 @@ def parse_range(astr):
         x = part.split('-')
         result.update(range(int(x[0]), int(x[-1]) + 1))
     return sorted(result)
+
+
+@contextmanager
+def lock_document_version_file(checksum):
+    """
+    Serialize the changes to the references of the stored files with the
+    checksum. Versions gain a reference to a shared file and unreferenced
+    files are deleted only while holding this lock. The changes to the
+    references must be committed before the block exits.
+    """
+    if not checksum:
+        # Files without a checksum are never shared.
+        yield
+        return
+
+    lock = _acquire_document_version_file_lock(checksum=checksum)
+
+    try:
+        yield
+    finally:
+        locking_backend.release_lock(name=lock.name, token=lock.token)
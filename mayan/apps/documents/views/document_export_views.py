@@ -0,0 +1,130 @@
+import logging
+
+from django.contrib import messages
+from django.urls import reverse_lazy
+from django.utils.translation import ugettext_lazy as _, ungettext
+
+from mayan.apps.common.generics import (
+    MultipleObjectConfirmActionView, MultipleObjectFormActionView,
+    SingleObjectDeleteView, SingleObjectDownloadView, SingleObjectListView
+)
+
+from ..forms import DocumentExportCreateForm
+from ..icons import icon_document_export_list
+from ..literals import DOCUMENT_EXPORT_STATE_FINISHED
+from ..models import Document, DocumentExport
+from ..permissions import permission_document_download
+
+__all__ = (
+    'DocumentExportCancelView', 'DocumentExportDeleteView',
+    'DocumentExportDownloadView', 'DocumentExportListView',
+    'DocumentMultipleExportView'
+)
+logger = logging.getLogger(name=__name__)
+
+
+class DocumentExportCancelView(MultipleObjectConfirmActionView):
+    pk_url_kwarg = 'document_export_id'
+    post_action_redirect = reverse_lazy(
+        viewname='documents:document_export_list'
+    )
+    success_message_singular = _('%(count)d document export canceled.')
+    success_message_plural = _('%(count)d document exports canceled.')
+
+    def get_extra_context(self):
+        return {
+            'title': ungettext(
+                singular='Cancel the selected document export?',
+                plural='Cancel the selected document exports?',
+                number=self.object_list.count()
+            )
+        }
+
+    def get_source_queryset(self):
+        return DocumentExport.objects.filter(user=self.request.user)
+
+    def object_action(self, form, instance):
+        instance.cancel()
+
+
+class DocumentExportDeleteView(SingleObjectDeleteView):
+    pk_url_kwarg = 'document_export_id'
+    post_action_redirect = reverse_lazy(
+        viewname='documents:document_export_list'
+    )
+
+    def get_extra_context(self):
+        return {
+            'object': self.object,
+            'title': _('Delete the document export: %s?') % self.object,
+        }
+
+    def get_source_queryset(self):
+        return DocumentExport.objects.filter(user=self.request.user)
+
+
+class DocumentExportDownloadView(SingleObjectDownloadView):
+    pk_url_kwarg = 'document_export_id'
+    range_requests = True
+
+    def get_download_file_size(self):
+        return self.object.file_size
+
+    def get_download_filename(self):
+        return self.object.label
+
+    def get_source_queryset(self):
+        return DocumentExport.objects.filter(
+            state=DOCUMENT_EXPORT_STATE_FINISHED, user=self.request.user
+        )
+
+
+class DocumentExportListView(SingleObjectListView):
+    def get_extra_context(self):
+        return {
+            'no_results_icon': icon_document_export_list,
+            'no_results_text': _(
+                'Exports are compressed files with a selection of '
+                'documents that are produced in the background. Once '
+                'finished, the compressed file can be downloaded until it '
+                'expires.'
+            ),
+            'no_results_title': _('There are no document exports'),
+            'title': _('Document exports'),
+        }
+
+    def get_source_queryset(self):
+        return DocumentExport.objects.filter(user=self.request.user)
+
+
+class DocumentMultipleExportView(MultipleObjectFormActionView):
+    form_class = DocumentExportCreateForm
+    model = Document
+    object_permission = permission_document_download
+    pk_url_kwarg = 'document_id'
+    post_action_redirect = reverse_lazy(
+        viewname='documents:document_export_list'
+    )
+
+    def get_extra_context(self):
+        return {
+            'submit_label': _('Export'),
+            'title': ungettext(
+                singular='Export the selected document',
+                plural='Export the selected documents',
+                number=self.object_list.count()
+            )
+        }
+
+    def view_action(self, form):
+        DocumentExport.objects.create_for(
+            label=form.cleaned_data['label'], queryset=self.object_list,
+            user=self.request.user
+        )
+        messages.success(
+            message=_(
+                'Document export queued successfully. The compressed file '
+                'will be available in the document exports list when '
+                'finished.'
+            ), request=self.request
+        )
@@ -12,7 +12,7 @@ from django.utils.encoding import force_text
 from django.utils.translation import ugettext_lazy as _, ungettext
 
 from mayan.apps.acls.models import AccessControlList
-from mayan.apps.common.compressed_files import ZipArchive
+from mayan.apps.common.compressed_files import ZipArchiveStream
 from mayan.apps.common.generics import (
     FormView, MultipleObjectConfirmActionView, MultipleObjectDownloadView,
     MultipleObjectFormActionView, SingleObjectDetailView,
@@ -78,7 +78,7 @@ class DocumentListView(SingleObjectListView):
         return Document.objects.defer(
             'description', 'uuid', 'date_added', 'language', 'in_trash',
             'deleted_date_time'
-        ).all()
+        ).select_related('latest_version')
 
     def get_extra_context(self):
         return {
@@ -239,32 +239,41 @@ class DocumentDownloadView(MultipleObjectDownloadView):
             'zip_filename', DEFAULT_ZIP_FILENAME
         )
 
+    def get_archive_stream(self, queryset):
+        """
+        Generator that reads each item from storage in chunks and yields
+        the ZIP archive as it is produced, keeping the memory usage
+        constant regardless of the number and size of the items.
+        """
+        zip_archive_stream = ZipArchiveStream()
+
+        for item in queryset:
+            with item.open(track_access=True) as file_object:
+                for chunk in zip_archive_stream.add_file(
+                    file_object=file_object,
+                    filename=self.get_item_filename(item=item)
+                ):
+                    yield chunk
+
+        for chunk in zip_archive_stream.close():
+            yield chunk
+
     def get_download_file_object(self):
         queryset = self.get_object_list()
-        zip_filename = self.get_archive_filename()
 
         if self.request.GET.get('compressed') == 'True' or queryset.count() > 1:
-            compressed_file = ZipArchive()
-            compressed_file.create()
             for item in queryset:
-                with item.open() as file_object:
-                    compressed_file.add_file(
-                        file_object=file_object,
-                        filename=self.get_item_filename(item=item)
-                    )
-                    DocumentDownloadView.commit_event(
-                        item=item, request=self.request
-                    )
-
-            compressed_file.close()
-
-            return compressed_file.as_file(zip_filename)
+                DocumentDownloadView.commit_event(
+                    item=item, request=self.request
+                )
+
+            return self.get_archive_stream(queryset=queryset)
         else:
             item = queryset.first()
             DocumentDownloadView.commit_event(
                 item=item, request=self.request
             )
-            return item.open()
+            return item.open(track_access=True)
 
     def get_download_filename(self):
         queryset = self.get_object_list()
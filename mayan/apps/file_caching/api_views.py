@@ -0,0 +1,48 @@
+from rest_framework import status
+from rest_framework.response import Response
+
+from mayan.apps.rest_api import generics
+
+from .models import Cache
+from .permissions import (
+    permission_cache_statistics_reset, permission_cache_view
+)
+from .serializers import CacheSerializer
+
+
+class APICacheListView(generics.ListAPIView):
+    """
+    get: Returns a list of all the file caches and their statistics.
+    """
+    mayan_object_permissions = {'GET': (permission_cache_view,)}
+    queryset = Cache.objects.all()
+    serializer_class = CacheSerializer
+
+
+class APICacheView(generics.RetrieveAPIView):
+    """
+    get: Return the details and statistics of the selected file cache.
+    """
+    mayan_object_permissions = {'GET': (permission_cache_view,)}
+    queryset = Cache.objects.all()
+    serializer_class = CacheSerializer
+
+
+class APICacheStatisticsResetView(generics.GenericAPIView):
+    """
+    post: Reset the statistics of the selected file cache.
+    """
+    mayan_object_permissions = {
+        'POST': (permission_cache_statistics_reset,)
+    }
+    queryset = Cache.objects.all()
+
+    def get_serializer(self, *args, **kwargs):
+        return None
+
+    def get_serializer_class(self):
+        return None
+
+    def post(self, request, *args, **kwargs):
+        self.get_object().reset_statistics(_user=request.user)
+        return Response(status=status.HTTP_200_OK)
@@ -13,16 +13,24 @@ from mayan.apps.events.links import (
 )
 from mayan.apps.navigation.classes import SourceColumn
 
-from .events import event_cache_edited, event_cache_purged
+from .events import (
+    event_cache_edited, event_cache_purged, event_cache_statistics_reset
+)
 from .links import (
-    link_caches_list, link_cache_multiple_purge, link_cache_purge
+    link_caches_list, link_cache_multiple_purge,
+    link_cache_multiple_statistics_reset, link_cache_purge,
+    link_cache_statistics_reset
+)
+from .permissions import (
+    permission_cache_purge, permission_cache_statistics_reset,
+    permission_cache_view
 )
-from .permissions import permission_cache_purge, permission_cache_view
 
 
 class FileCachingConfig(MayanAppConfig):
     app_namespace = 'file_caching'
     app_url = 'file_caching'
+    has_rest_api = True
     has_tests = True
     name = 'mayan.apps.file_caching'
     verbose_name = _('File caching')
@@ -35,14 +43,18 @@ class FileCachingConfig(MayanAppConfig):
         EventModelRegistry.register(model=Cache)
 
         ModelEventType.register(
-            event_types=(event_cache_edited, event_cache_purged,),
+            event_types=(
+                event_cache_edited, event_cache_purged,
+                event_cache_statistics_reset
+            ),
             model=Cache
         )
 
         ModelPermission.register(
             model=Cache, permissions=(
                 permission_acl_edit, permission_acl_view,
-                permission_cache_purge, permission_cache_view
+                permission_cache_purge, permission_cache_statistics_reset,
+                permission_cache_view
             )
         )
 
@@ -57,6 +69,30 @@ class FileCachingConfig(MayanAppConfig):
             attribute='get_total_size_display', include_label=True,
             source=Cache
         )
+        SourceColumn(
+            attribute='get_eviction_policy_display', include_label=True,
+            is_sortable=True, sort_field='eviction_policy', source=Cache
+        )
+        SourceColumn(
+            attribute='get_hit_ratio_display', include_label=True,
+            source=Cache
+        )
+        SourceColumn(
+            attribute='memory_tier_hits', include_label=True,
+            is_sortable=True, source=Cache
+        )
+        SourceColumn(
+            attribute='get_bytes_written_display', include_label=True,
+            is_sortable=True, sort_field='bytes_written', source=Cache
+        )
+        SourceColumn(
+            attribute='evictions', include_label=True, is_sortable=True,
+            source=Cache
+        )
+        SourceColumn(
+            attribute='get_average_eviction_age_display',
+            include_label=True, source=Cache
+        )
 
         menu_list_facet.bind_links(
             links=(
@@ -66,12 +102,14 @@ class FileCachingConfig(MayanAppConfig):
         )
 
         menu_object.bind_links(
-            links=(link_cache_purge,),
+            links=(link_cache_purge, link_cache_statistics_reset),
             sources=(Cache,)
         )
         menu_multi_item.bind_links(
-            links=(link_cache_multiple_purge,),
-            sources=(Cache,)
+            links=(
+                link_cache_multiple_purge,
+                link_cache_multiple_statistics_reset
+            ), sources=(Cache,)
         )
         menu_secondary.bind_links(
             links=(link_caches_list,), sources=(
@@ -0,0 +1,158 @@
+import atexit
+import hashlib
+import logging
+import threading
+import time
+
+from django.apps import apps
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models import F
+from django.utils.timezone import now
+
+from .settings import (
+    setting_access_tracking_batch_size,
+    setting_access_tracking_flush_interval, setting_memory_tier_cache_alias,
+    setting_memory_tier_maximum_file_size
+)
+
+logger = logging.getLogger(name=__name__)
+
+
+class CacheFileAccessTracker(object):
+    """
+    Keep the accesses to cache files and the cache lookup counters in
+    memory and write them to the database in batches instead of issuing an
+    UPDATE query for each read.
+    """
+    _accesses = {}
+    _last_flush_time = time.time()
+    _lock = threading.Lock()
+    _lookups = {}
+
+    @classmethod
+    def _should_flush(cls):
+        return (
+            len(cls._accesses) >= setting_access_tracking_batch_size.value
+        ) or (
+            time.time() - cls._last_flush_time >= setting_access_tracking_flush_interval.value
+        )
+
+    @classmethod
+    def flush(cls):
+        with cls._lock:
+            accesses = cls._accesses
+            lookups = cls._lookups
+            cls._accesses = {}
+            cls._lookups = {}
+            cls._last_flush_time = time.time()
+
+        if not accesses and not lookups:
+            return
+
+        Cache = apps.get_model(app_label='file_caching', model_name='Cache')
+        CachePartitionFile = apps.get_model(
+            app_label='file_caching', model_name='CachePartitionFile'
+        )
+
+        logger.debug('Flushing accesses for %d cache files', len(accesses))
+
+        with transaction.atomic():
+            for partition_file_id, (hits, accessed) in accesses.items():
+                CachePartitionFile.objects.filter(pk=partition_file_id).update(
+                    accessed=accessed, hits=F('hits') + hits
+                )
+
+            for cache_id, (hits, memory_tier_hits, misses) in lookups.items():
+                Cache.objects.filter(pk=cache_id).update(
+                    hits=F('hits') + hits,
+                    memory_tier_hits=F('memory_tier_hits') + memory_tier_hits,
+                    misses=F('misses') + misses
+                )
+
+    @classmethod
+    def record(cls, partition_file_id):
+        with cls._lock:
+            hits, accessed = cls._accesses.get(partition_file_id, (0, None))
+            cls._accesses[partition_file_id] = (hits + 1, now())
+            should_flush = cls._should_flush()
+
+        if should_flush:
+            cls.flush()
+
+    @classmethod
+    def record_lookup(cls, cache_id, hit, memory_tier_hit=False):
+        with cls._lock:
+            hits, memory_tier_hits, misses = cls._lookups.get(
+                cache_id, (0, 0, 0)
+            )
+            if hit:
+                hits += 1
+                if memory_tier_hit:
+                    memory_tier_hits += 1
+            else:
+                misses += 1
+
+            cls._lookups[cache_id] = (hits, memory_tier_hits, misses)
+            should_flush = cls._should_flush()
+
+        if should_flush:
+            cls.flush()
+
+    @classmethod
+    def shutdown(cls):
+        try:
+            cls.flush()
+        except Exception as exception:
+            logger.warning(
+                'Unable to flush cache file accesses on exit; %s', exception
+            )
+
+
+class CacheFileMemoryTier(object):
+    """
+    Keep the content of small cache files in memory to avoid the database
+    lookup and the storage access of each cache hit. Entries are stored in
+    the Django cache selected by alias. The cache must be shared by all the
+    processes, deleted and purged files are invalidated only in it.
+    """
+    @staticmethod
+    def get_cache():
+        return caches[setting_memory_tier_cache_alias.value]
+
+    @staticmethod
+    def get_key(cache_id, full_filename):
+        return 'file_caching-memory_tier-{}'.format(
+            hashlib.sha256(
+                '{}-{}'.format(cache_id, full_filename).encode('utf-8')
+            ).hexdigest()
+        )
+
+    @classmethod
+    def accepts(cls, file_size):
+        return 0 < file_size <= setting_memory_tier_maximum_file_size.value
+
+    @classmethod
+    def delete(cls, key):
+        cls.get_cache().delete(key=key)
+
+    @classmethod
+    def get(cls, key):
+        """
+        Return a tuple with the cache file ID and its content or None if
+        the file is not in memory.
+        """
+        return cls.get_cache().get(key=key)
+
+    @classmethod
+    def is_enabled(cls):
+        return bool(
+            setting_memory_tier_cache_alias.value
+        ) and setting_memory_tier_maximum_file_size.value > 0
+
+    @classmethod
+    def set(cls, key, partition_file_id, content):
+        cls.get_cache().set(key=key, value=(partition_file_id, content))
+
+
+atexit.register(CacheFileAccessTracker.shutdown)
@@ -15,3 +15,6 @@ event_cache_edited = namespace.add_event_type(
 event_cache_purged = namespace.add_event_type(
     label=_('Cache purged'), name='cache_purged'
 )
+event_cache_statistics_reset = namespace.add_event_type(
+    label=_('Cache statistics reset'), name='cache_statistics_reset'
+)
@@ -7,3 +7,7 @@ icon_cache_purge = Icon(
     driver_name='fontawesome-dual', primary_symbol='warehouse',
     secondary_symbol='check'
 )
+icon_cache_statistics_reset = Icon(
+    driver_name='fontawesome-dual', primary_symbol='warehouse',
+    secondary_symbol='undo'
+)
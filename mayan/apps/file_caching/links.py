@@ -2,8 +2,13 @@ from django.utils.translation import ugettext_lazy as _
 
 from mayan.apps.navigation.classes import Link
 
-from .icons import icon_cache_purge, icon_file_caching
-from .permissions import permission_cache_purge, permission_cache_view
+from .icons import (
+    icon_cache_purge, icon_cache_statistics_reset, icon_file_caching
+)
+from .permissions import (
+    permission_cache_purge, permission_cache_statistics_reset,
+    permission_cache_view
+)
 
 link_caches_list = Link(
     icon_class=icon_file_caching, permissions=(permission_cache_view,),
@@ -18,3 +23,13 @@ link_cache_multiple_purge = Link(
     icon_class=icon_cache_purge, text=_('Purge cache'),
     view='file_caching:cache_multiple_purge'
 )
+link_cache_statistics_reset = Link(
+    icon_class=icon_cache_statistics_reset,
+    kwargs={'cache_id': 'resolved_object.id'},
+    permissions=(permission_cache_statistics_reset,),
+    text=_('Reset statistics'), view='file_caching:cache_statistics_reset'
+)
+link_cache_multiple_statistics_reset = Link(
+    icon_class=icon_cache_statistics_reset, text=_('Reset statistics'),
+    view='file_caching:cache_multiple_statistics_reset'
+)
@@ -0,0 +1,27 @@
+from django.utils.translation import ugettext_lazy as _
+
+CACHE_EVICTION_POLICY_FIFO = 'fifo'
+CACHE_EVICTION_POLICY_LFU = 'lfu'
+CACHE_EVICTION_POLICY_LRU = 'lru'
+CACHE_EVICTION_POLICY_SLRU = 'slru'
+
+CACHE_EVICTION_POLICY_CHOICES = (
+    (CACHE_EVICTION_POLICY_FIFO, _('First in, first out')),
+    (CACHE_EVICTION_POLICY_LFU, _('Least frequently used')),
+    (CACHE_EVICTION_POLICY_LRU, _('Least recently used')),
+    (CACHE_EVICTION_POLICY_SLRU, _('Segmented least recently used')),
+)
+
+# Number of hits after which a file is moved to the protected segment of
+# the segmented LRU policy.
+CACHE_EVICTION_POLICY_SLRU_PROTECTED_HITS = 2
+
+DEFAULT_CACHE_EVICTION_POLICY = CACHE_EVICTION_POLICY_LRU
+DEFAULT_FILE_CACHING_ACCESS_TRACKING_BATCH_SIZE = 100
+DEFAULT_FILE_CACHING_ACCESS_TRACKING_FLUSH_INTERVAL = 60
+DEFAULT_FILE_CACHING_HIGH_WATERMARK = 100
+DEFAULT_FILE_CACHING_LOW_WATERMARK = 90
+DEFAULT_FILE_CACHING_MEMORY_TIER_CACHE_ALIAS = None
+DEFAULT_FILE_CACHING_MEMORY_TIER_MAXIMUM_FILE_SIZE = 0
+LOCK_EXPIRE_CACHE_PRUNE = 60 * 10  # 10 minutes
+PRUNE_DELETE_BATCH_SIZE = 500
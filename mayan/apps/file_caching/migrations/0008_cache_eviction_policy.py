@@ -0,0 +1,55 @@
+from django.db import migrations, models
+from django.db.models import F
+import django.utils.timezone
+
+
+def code_copy_cache_partition_file_datetime(apps, schema_editor):
+    CachePartitionFile = apps.get_model(
+        app_label='file_caching', model_name='CachePartitionFile'
+    )
+
+    CachePartitionFile.objects.using(
+        schema_editor.connection.alias
+    ).update(accessed=F('datetime'))
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('file_caching', '0007_cache_total_size'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cache',
+            name='eviction_policy',
+            field=models.CharField(
+                choices=[
+                    ('fifo', 'First in, first out'),
+                    ('lfu', 'Least frequently used'),
+                    ('lru', 'Least recently used'),
+                    ('slru', 'Segmented least recently used')
+                ], default='lru', help_text='Order in which the files are '
+                'deleted when the cache is pruned.', max_length=8,
+                verbose_name='Eviction policy'
+            ),
+        ),
+        migrations.AddField(
+            model_name='cachepartitionfile',
+            name='accessed',
+            field=models.DateTimeField(
+                db_index=True, default=django.utils.timezone.now,
+                verbose_name='Accessed'
+            ),
+        ),
+        migrations.AddField(
+            model_name='cachepartitionfile',
+            name='hits',
+            field=models.PositiveIntegerField(
+                default=0, verbose_name='Hits'
+            ),
+        ),
+        migrations.RunPython(
+            code=code_copy_cache_partition_file_datetime,
+            reverse_code=migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,64 @@
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('file_caching', '0008_cache_eviction_policy'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cache',
+            name='bytes_written',
+            field=models.BigIntegerField(
+                default=0, editable=False, help_text='Total size in bytes '
+                'of the files written to the cache.',
+                verbose_name='Bytes written'
+            ),
+        ),
+        migrations.AddField(
+            model_name='cache',
+            name='eviction_age_total',
+            field=models.BigIntegerField(
+                default=0, editable=False, help_text='Sum of the ages in '
+                'seconds of the evicted files.',
+                verbose_name='Eviction age total'
+            ),
+        ),
+        migrations.AddField(
+            model_name='cache',
+            name='evictions',
+            field=models.BigIntegerField(
+                default=0, editable=False, help_text='Number of files '
+                'deleted to keep the cache below its maximum size.',
+                verbose_name='Evictions'
+            ),
+        ),
+        migrations.AddField(
+            model_name='cache',
+            name='hits',
+            field=models.BigIntegerField(
+                default=0, editable=False, help_text='Number of lookups '
+                'that found the requested file.', verbose_name='Hits'
+            ),
+        ),
+        migrations.AddField(
+            model_name='cache',
+            name='misses',
+            field=models.BigIntegerField(
+                default=0, editable=False, help_text='Number of lookups '
+                'that did not find the requested file.',
+                verbose_name='Misses'
+            ),
+        ),
+        migrations.AddField(
+            model_name='cache',
+            name='statistics_reset',
+            field=models.DateTimeField(
+                default=django.utils.timezone.now, editable=False,
+                help_text='Date and time since when the statistics are '
+                'collected.', verbose_name='Statistics reset'
+            ),
+        ),
+    ]
@@ -0,0 +1,19 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('file_caching', '0009_cache_statistics'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cache',
+            name='memory_tier_hits',
+            field=models.BigIntegerField(
+                default=0, editable=False, help_text='Number of hits served '
+                'from the memory tier without accessing the database or the '
+                'storage.', verbose_name='Memory tier hits'
+            ),
+        ),
+    ]
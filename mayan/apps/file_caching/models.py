@@ -1,13 +1,16 @@
 from contextlib import contextmanager
+from datetime import timedelta
+from io import BytesIO
 import logging
 
 from django.core import validators
 from django.core.files.base import ContentFile
 from django.db import models, transaction
-from django.db.models import Sum
+from django.db.models import BooleanField, Case, F, Value, When
 from django.template.defaultfilters import filesizeformat
 from django.utils.encoding import force_text, python_2_unicode_compatible
 from django.utils.functional import cached_property
+from django.utils.timezone import now
 from django.utils.text import format_lazy
 from django.utils.translation import ugettext_lazy as _
 
@@ -15,9 +18,19 @@ from mayan.apps.lock_manager.exceptions import LockError
 from mayan.apps.lock_manager.runtime import locking_backend
 from mayan.apps.storage.classes import DefinedStorage
 
+from .classes import CacheFileAccessTracker, CacheFileMemoryTier
 from .events import (
-    event_cache_created, event_cache_edited, event_cache_purged
+    event_cache_created, event_cache_edited, event_cache_purged,
+    event_cache_statistics_reset
 )
+from .literals import (
+    CACHE_EVICTION_POLICY_CHOICES, CACHE_EVICTION_POLICY_FIFO,
+    CACHE_EVICTION_POLICY_LFU, CACHE_EVICTION_POLICY_SLRU,
+    CACHE_EVICTION_POLICY_SLRU_PROTECTED_HITS, DEFAULT_CACHE_EVICTION_POLICY,
+    PRUNE_DELETE_BATCH_SIZE
+)
+from .settings import setting_high_watermark, setting_low_watermark
+from .tasks import task_cache_prune
 
 logger = logging.getLogger(name=__name__)
 
@@ -34,6 +47,54 @@ class Cache(models.Model):
             validators.MinValueValidator(limit_value=1)
         ], verbose_name=_('Maximum size')
     )
+    eviction_policy = models.CharField(
+        choices=CACHE_EVICTION_POLICY_CHOICES,
+        default=DEFAULT_CACHE_EVICTION_POLICY, help_text=_(
+            'Order in which the files are deleted when the cache is pruned.'
+        ), max_length=8, verbose_name=_('Eviction policy')
+    )
+    total_size = models.BigIntegerField(
+        default=0, editable=False, help_text=_(
+            'Current size of the cache in bytes.'
+        ), verbose_name=_('Total size')
+    )
+    hits = models.BigIntegerField(
+        default=0, editable=False, help_text=_(
+            'Number of lookups that found the requested file.'
+        ), verbose_name=_('Hits')
+    )
+    memory_tier_hits = models.BigIntegerField(
+        default=0, editable=False, help_text=_(
+            'Number of hits served from the memory tier without accessing '
+            'the database or the storage.'
+        ), verbose_name=_('Memory tier hits')
+    )
+    misses = models.BigIntegerField(
+        default=0, editable=False, help_text=_(
+            'Number of lookups that did not find the requested file.'
+        ), verbose_name=_('Misses')
+    )
+    bytes_written = models.BigIntegerField(
+        default=0, editable=False, help_text=_(
+            'Total size in bytes of the files written to the cache.'
+        ), verbose_name=_('Bytes written')
+    )
+    evictions = models.BigIntegerField(
+        default=0, editable=False, help_text=_(
+            'Number of files deleted to keep the cache below its maximum '
+            'size.'
+        ), verbose_name=_('Evictions')
+    )
+    eviction_age_total = models.BigIntegerField(
+        default=0, editable=False, help_text=_(
+            'Sum of the ages in seconds of the evicted files.'
+        ), verbose_name=_('Eviction age total')
+    )
+    statistics_reset = models.DateTimeField(
+        default=now, editable=False, help_text=_(
+            'Date and time since when the statistics are collected.'
+        ), verbose_name=_('Statistics reset')
+    )
 
     class Meta:
         verbose_name = _('Cache')
@@ -42,9 +103,132 @@ class Cache(models.Model):
     def __str__(self):
         return force_text(self.label)
 
+    def _delete_files(self, partition_files, is_eviction=False):
+        for partition_file in partition_files:
+            partition_file.delete_from_memory_tier()
+            self.storage.delete(name=partition_file.full_filename)
+
+        counters = {
+            'total_size': -sum(
+                partition_file.file_size for partition_file in partition_files
+            )
+        }
+
+        if is_eviction:
+            datetime_now = now()
+            counters['eviction_age_total'] = sum(
+                int((datetime_now - partition_file.datetime).total_seconds())
+                for partition_file in partition_files
+            )
+            counters['evictions'] = len(partition_files)
+
+        with transaction.atomic():
+            CachePartitionFile.objects.filter(
+                pk__in=[partition_file.pk for partition_file in partition_files]
+            ).delete()
+            self.update_counters(**counters)
+
+    def delete_partitions(self, partition_name_list):
+        """
+        Delete the partitions and their files, removing the file rows in
+        batches instead of one partition file at a time.
+        """
+        queryset = self.partitions.filter(name__in=partition_name_list)
+        file_ids = list(
+            CachePartitionFile.objects.filter(
+                partition__in=queryset
+            ).values_list('pk', flat=True)
+        )
+
+        for index in range(0, len(file_ids), PRUNE_DELETE_BATCH_SIZE):
+            self._delete_files(
+                partition_files=CachePartitionFile.objects.filter(
+                    pk__in=file_ids[index:index + PRUNE_DELETE_BATCH_SIZE]
+                ).select_related('partition')
+            )
+
+        queryset.delete()
+
+    def get_average_eviction_age(self):
+        """
+        Return the average time in seconds the evicted files stayed in the
+        cache.
+        """
+        if self.evictions:
+            return self.eviction_age_total / self.evictions
+
+    def get_average_eviction_age_display(self):
+        average_eviction_age = self.get_average_eviction_age()
+        if average_eviction_age is None:
+            return _('None')
+        else:
+            return force_text(
+                timedelta(seconds=int(average_eviction_age))
+            )
+
+    get_average_eviction_age_display.help_text = _(
+        'Average time the evicted files stayed in the cache.'
+    )
+    get_average_eviction_age_display.short_description = _(
+        'Average eviction age'
+    )
+
+    def get_bytes_written_display(self):
+        return filesizeformat(bytes_=self.bytes_written)
+
+    get_bytes_written_display.short_description = _('Bytes written')
+
     def get_files(self):
         return CachePartitionFile.objects.filter(partition__cache__id=self.pk)
 
+    def get_files_in_eviction_order(self):
+        """
+        Return the files of the cache sorted by the eviction policy, the
+        first file being the next to be deleted. The segmented LRU policy
+        evicts the files in the probationary segment before those in the
+        protected segment, each segment in least recently used order.
+        """
+        queryset = self.get_files()
+
+        if self.eviction_policy == CACHE_EVICTION_POLICY_FIFO:
+            return queryset.order_by('datetime')
+        elif self.eviction_policy == CACHE_EVICTION_POLICY_LFU:
+            return queryset.order_by('hits', 'accessed')
+        elif self.eviction_policy == CACHE_EVICTION_POLICY_SLRU:
+            return queryset.annotate(
+                is_protected=Case(
+                    When(
+                        hits__gte=CACHE_EVICTION_POLICY_SLRU_PROTECTED_HITS,
+                        then=Value(True)
+                    ), default=Value(False), output_field=BooleanField()
+                )
+            ).order_by('is_protected', 'accessed')
+        else:
+            return queryset.order_by('accessed')
+
+    def get_hit_ratio(self):
+        lookups = self.hits + self.misses
+        if lookups:
+            return self.hits / lookups
+
+    def get_hit_ratio_display(self):
+        hit_ratio = self.get_hit_ratio()
+        if hit_ratio is None:
+            return _('None')
+        else:
+            return '{:0.1f}%'.format(hit_ratio * 100)
+
+    get_hit_ratio_display.help_text = _(
+        'Percentage of lookups that found the requested file.'
+    )
+    get_hit_ratio_display.short_description = _('Hit ratio')
+
+    def get_high_watermark(self):
+        return self.maximum_size * setting_high_watermark.value / 100
+
+    def get_low_watermark(self):
+        return self.maximum_size * setting_low_watermark.value / 100
+
     def get_maximum_size_display(self):
         return filesizeformat(bytes_=self.maximum_size)
 
@@ -58,11 +242,11 @@ class Cache(models.Model):
 
     def get_total_size(self):
         """
-        Return the actual usage of the cache.
+        Return the actual usage of the cache as tracked by the running
+        size counter.
         """
-        return self.get_files().aggregate(
-            file_size__sum=Sum('file_size')
-        )['file_size__sum'] or 0
+        self.refresh_from_db(fields=('total_size',))
+        return self.total_size
 
     def get_total_size_display(self):
         return format_lazy(
@@ -78,13 +262,49 @@ class Cache(models.Model):
     def label(self):
         return self.get_defined_storage().label
 
+    def is_over_high_watermark(self):
+        return self.get_total_size() > self.get_high_watermark()
+
     def prune(self):
         """
-        Deletes files until the total size of the cache is below the allowed
-        maximum size of the cache.
+        Deletes files in eviction order in a single pass until the total
+        size of the cache is below the low watermark. Does nothing while the
+        total size of the cache is below the high watermark.
         """
-        while self.get_total_size() > self.maximum_size:
-            self.get_files().earliest().delete()
+        if not self.is_over_high_watermark():
+            return
+
+        # Write the pending accesses so that the eviction order reflects
+        # the latest cache hits of this process.
+        CacheFileAccessTracker.flush()
+
+        size_to_free = self.total_size - self.get_low_watermark()
+        freed_size = 0
+        file_ids = []
+
+        queryset = self.get_files_in_eviction_order().values_list(
+            'pk', 'file_size'
+        )
+
+        for file_id, file_size in queryset.iterator():
+            if freed_size >= size_to_free:
+                break
+
+            file_ids.append(file_id)
+            freed_size += file_size
+
+        logger.debug(
+            'Pruning %d files (%d bytes) from cache: %s', len(file_ids),
+            freed_size, self
+        )
+
+        for index in range(0, len(file_ids), PRUNE_DELETE_BATCH_SIZE):
+            self._delete_files(
+                is_eviction=True,
+                partition_files=CachePartitionFile.objects.filter(
+                    pk__in=file_ids[index:index + PRUNE_DELETE_BATCH_SIZE]
+                ).select_related('partition')
+            )
 
     def purge(self, _user=None):
         """
@@ -95,6 +315,21 @@ class Cache(models.Model):
 
         event_cache_purged.commit(actor=_user, target=self)
 
+    def reset_statistics(self, _user=None):
+        """
+        Set the statistics counters back to zero.
+        """
+        CacheFileAccessTracker.flush()
+
+        with transaction.atomic():
+            Cache.objects.filter(pk=self.pk).update(
+                bytes_written=0, eviction_age_total=0, evictions=0, hits=0,
+                memory_tier_hits=0, misses=0, statistics_reset=now()
+            )
+            event_cache_statistics_reset.commit(actor=_user, target=self)
+
+        self.refresh_from_db()
+
     def save(self, *args, **kwargs):
         _user = kwargs.pop('_user', None)
         with transaction.atomic():
@@ -116,6 +351,16 @@ class Cache(models.Model):
     def storage(self):
         return self.get_defined_storage().get_storage_instance()
 
+    def update_counters(self, **deltas):
+        """
+        Atomically add the deltas to the running counters of the cache.
+        """
+        Cache.objects.filter(pk=self.pk).update(
+            **{
+                name: F(name) + delta for name, delta in deltas.items()
+            }
+        )
+
 
 class CachePartition(models.Model):
     cache = models.ForeignKey(
@@ -143,8 +388,6 @@ class CachePartition(models.Model):
             lock = locking_backend.acquire_lock(lock_id)
             logger.debug('acquired lock: %s', lock_id)
             try:
-                self.cache.prune()
-
                 # Since open "wb+" doesn't create files force the creation of an
                 # empty file.
                 self.cache.storage.delete(
@@ -178,21 +421,61 @@ class CachePartition(models.Model):
             logger.debug('unable to obtain lock: %s' % lock_id)
             raise
 
+        # Pruning is deferred to a background task to keep the write path
+        # from waiting on the eviction of old files.
+        if self.cache.is_over_high_watermark():
+            task_cache_prune.apply_async(kwargs={'cache_id': self.cache.pk})
+
     def delete(self, *args, **kwargs):
         self.purge()
         return super(CachePartition, self).delete(*args, **kwargs)
 
     def get_file(self, filename):
+        if CacheFileMemoryTier.is_enabled():
+            entry = CacheFileMemoryTier.get(
+                key=self.get_memory_tier_key(filename=filename)
+            )
+            if entry:
+                CacheFileAccessTracker.record_lookup(
+                    cache_id=self.cache_id, hit=True, memory_tier_hit=True
+                )
+                partition_file_id, content = entry
+                partition_file = CachePartitionFile(
+                    file_size=len(content), filename=filename,
+                    id=partition_file_id, partition=self
+                )
+                partition_file._memory_tier_content = content
+                return partition_file
+
         try:
-            return self.files.get(filename=filename)
+            partition_file = self.files.get(filename=filename)
         except self.files.model.DoesNotExist:
+            CacheFileAccessTracker.record_lookup(
+                cache_id=self.cache_id, hit=False
+            )
             return None
+        else:
+            CacheFileAccessTracker.record_lookup(
+                cache_id=self.cache_id, hit=True
+            )
+
+            if CacheFileMemoryTier.is_enabled():
+                partition_file.add_to_memory_tier()
+
+            return partition_file
 
     def get_full_filename(self, filename):
         return CachePartition.get_combined_filename(
             parent=self.name, filename=filename
         )
 
+    def get_memory_tier_key(self, filename):
+        return CacheFileMemoryTier.get_key(
+            cache_id=self.cache_id, full_filename=self.get_full_filename(
+                filename=filename
+            )
+        )
+
     def purge(self):
         for parition_file in self.files.all():
             parition_file.delete()
@@ -206,11 +489,16 @@ class CachePartitionFile(models.Model):
     datetime = models.DateTimeField(
         auto_now_add=True, db_index=True, verbose_name=_('Date time')
     )
+    accessed = models.DateTimeField(
+        db_index=True, default=now, verbose_name=_('Accessed')
+    )
+    hits = models.PositiveIntegerField(default=0, verbose_name=_('Hits'))
     filename = models.CharField(max_length=255, verbose_name=_('Filename'))
     file_size = models.PositiveIntegerField(
         default=0, verbose_name=_('File size')
     )
 
+    _memory_tier_content = None
     _storage_object = None
 
     class Meta:
@@ -219,9 +507,36 @@ class CachePartitionFile(models.Model):
         verbose_name = _('Cache partition file')
         verbose_name_plural = _('Cache partition files')
 
+    def add_to_memory_tier(self):
+        """
+        Load the content of the file into the memory tier if the file is
+        small enough. The content is kept in the instance so that the
+        storage is not accessed again when the file is opened.
+        """
+        if CacheFileMemoryTier.accepts(file_size=self.file_size):
+            with self.partition.cache.storage.open(name=self.full_filename, mode='rb') as file_object:
+                content = file_object.read()
+
+            # Skip files that are still being written.
+            if len(content) == self.file_size:
+                CacheFileMemoryTier.set(
+                    content=content, key=self.memory_tier_key,
+                    partition_file_id=self.pk
+                )
+                self._memory_tier_content = content
+
     def delete(self, *args, **kwargs):
+        self.delete_from_memory_tier()
         self.partition.cache.storage.delete(name=self.full_filename)
-        return super(CachePartitionFile, self).delete(*args, **kwargs)
+        with transaction.atomic():
+            result = super(CachePartitionFile, self).delete(*args, **kwargs)
+            self.partition.cache.update_counters(total_size=-self.file_size)
+
+        return result
+
+    def delete_from_memory_tier(self):
+        if CacheFileMemoryTier.is_enabled():
+            CacheFileMemoryTier.delete(key=self.memory_tier_key)
 
     def exists(self):
         return self.partition.cache.storage.exists(name=self.full_filename)
@@ -232,13 +547,24 @@ class CachePartitionFile(models.Model):
             parent=self.partition.name, filename=self.filename
         )
 
+    @cached_property
+    def memory_tier_key(self):
+        return self.partition.get_memory_tier_key(filename=self.filename)
+
     def open(self, mode='rb'):
         # Open the file for reading. If the file is written to, the
         # .update_size() must be called.
         try:
-            self._storage_object = self.partition.cache.storage.open(
-                name=self.full_filename, mode=mode
-            )
+            if mode == 'rb' and self._memory_tier_content is not None:
+                self._storage_object = BytesIO(self._memory_tier_content)
+            else:
+                self._storage_object = self.partition.cache.storage.open(
+                    name=self.full_filename, mode=mode
+                )
+
+            if mode == 'rb':
+                CacheFileAccessTracker.record(partition_file_id=self.pk)
+
             return self._storage_object
         except Exception as exception:
             logger.error(
@@ -252,7 +578,13 @@ class CachePartitionFile(models.Model):
         self._storage_object = None
 
     def update_size(self):
+        previous_file_size = self.file_size
         self.file_size = self.partition.cache.storage.size(
             name=self.full_filename
         )
-        self.save()
+        with transaction.atomic():
+            self.save()
+            self.partition.cache.update_counters(
+                bytes_written=self.file_size,
+                total_size=self.file_size - previous_file_size
+            )
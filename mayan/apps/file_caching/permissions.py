@@ -7,6 +7,10 @@ namespace = PermissionNamespace(label=_('File caching'), name='file_caching')
 permission_cache_purge = namespace.add_permission(
     label=_('Purge a file cache'), name='file_caching_cache_purge'
 )
+permission_cache_statistics_reset = namespace.add_permission(
+    label=_('Reset the statistics of a file cache'),
+    name='file_caching_cache_statistics_reset'
+)
 permission_cache_view = namespace.add_permission(
     label=_('View a file cache'), name='file_caching_cache_view'
 )
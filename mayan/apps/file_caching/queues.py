@@ -1,6 +1,21 @@
 from django.utils.translation import ugettext_lazy as _
 
 from mayan.apps.common.queues import queue_tools
+from mayan.apps.task_manager.classes import CeleryQueue
+from mayan.apps.task_manager.workers import worker_medium
+
+queue_file_caching = CeleryQueue(
+    label=_('File caching'), name='file_caching', transient=True,
+    worker=worker_medium
+)
+queue_file_caching.add_task_type(
+    dotted_path='mayan.apps.file_caching.tasks.task_cache_partitions_delete',
+    label=_('Delete file cache partitions')
+)
+queue_file_caching.add_task_type(
+    dotted_path='mayan.apps.file_caching.tasks.task_cache_prune',
+    label=_('Prune a file cache')
+)
 
 queue_tools.add_task_type(
     dotted_path='mayan.apps.file_caching.tasks.task_cache_purge',
@@ -0,0 +1,30 @@
+from rest_framework import serializers
+
+from .models import Cache
+
+
+class CacheSerializer(serializers.HyperlinkedModelSerializer):
+    average_eviction_age = serializers.SerializerMethodField()
+    hit_ratio = serializers.SerializerMethodField()
+    label = serializers.CharField(read_only=True)
+    statistics_reset_url = serializers.HyperlinkedIdentityField(
+        view_name='rest_api:cache-statistics-reset'
+    )
+
+    class Meta:
+        extra_kwargs = {
+            'url': {'view_name': 'rest_api:cache-detail'},
+        }
+        fields = (
+            'average_eviction_age', 'bytes_written', 'defined_storage_name',
+            'eviction_policy', 'evictions', 'hit_ratio', 'hits', 'id',
+            'label', 'maximum_size', 'memory_tier_hits', 'misses',
+            'statistics_reset', 'statistics_reset_url', 'total_size', 'url'
+        )
+        model = Cache
+
+    def get_average_eviction_age(self, instance):
+        return instance.get_average_eviction_age()
+
+    def get_hit_ratio(self, instance):
+        return instance.get_hit_ratio()
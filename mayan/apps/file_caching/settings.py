@@ -0,0 +1,59 @@
+from django.utils.translation import ugettext_lazy as _
+
+from mayan.apps.smart_settings.classes import Namespace
+
+from .literals import (
+    DEFAULT_FILE_CACHING_ACCESS_TRACKING_BATCH_SIZE,
+    DEFAULT_FILE_CACHING_ACCESS_TRACKING_FLUSH_INTERVAL,
+    DEFAULT_FILE_CACHING_HIGH_WATERMARK, DEFAULT_FILE_CACHING_LOW_WATERMARK,
+    DEFAULT_FILE_CACHING_MEMORY_TIER_CACHE_ALIAS,
+    DEFAULT_FILE_CACHING_MEMORY_TIER_MAXIMUM_FILE_SIZE
+)
+
+namespace = Namespace(label=_('File caching'), name='file_caching')
+
+setting_access_tracking_batch_size = namespace.add_setting(
+    default=DEFAULT_FILE_CACHING_ACCESS_TRACKING_BATCH_SIZE,
+    global_name='FILE_CACHING_ACCESS_TRACKING_BATCH_SIZE', help_text=_(
+        'Number of distinct cache files whose accesses are kept in memory '
+        'before being written to the database.'
+    )
+)
+setting_access_tracking_flush_interval = namespace.add_setting(
+    default=DEFAULT_FILE_CACHING_ACCESS_TRACKING_FLUSH_INTERVAL,
+    global_name='FILE_CACHING_ACCESS_TRACKING_FLUSH_INTERVAL', help_text=_(
+        'Maximum time in seconds that cache file accesses are kept in '
+        'memory before being written to the database.'
+    )
+)
+
+setting_high_watermark = namespace.add_setting(
+    default=DEFAULT_FILE_CACHING_HIGH_WATERMARK,
+    global_name='FILE_CACHING_HIGH_WATERMARK', help_text=_(
+        'Percentage of the maximum size of a cache at which the oldest '
+        'cache files will start being deleted.'
+    )
+)
+setting_low_watermark = namespace.add_setting(
+    default=DEFAULT_FILE_CACHING_LOW_WATERMARK,
+    global_name='FILE_CACHING_LOW_WATERMARK', help_text=_(
+        'Percentage of the maximum size of a cache down to which cache '
+        'files will be deleted once the high watermark is exceeded.'
+    )
+)
+setting_memory_tier_cache_alias = namespace.add_setting(
+    default=DEFAULT_FILE_CACHING_MEMORY_TIER_CACHE_ALIAS,
+    global_name='FILE_CACHING_MEMORY_TIER_CACHE_ALIAS', help_text=_(
+        'Alias of the Django cache used to keep small cache files in '
+        'memory. The cache must be shared by all the processes, like a '
+        'Memcached or Redis cache, for deleted files to be invalidated in '
+        'every process. The memory tier is disabled when left empty.'
+    )
+)
+setting_memory_tier_maximum_file_size = namespace.add_setting(
+    default=DEFAULT_FILE_CACHING_MEMORY_TIER_MAXIMUM_FILE_SIZE,
+    global_name='FILE_CACHING_MEMORY_TIER_MAXIMUM_FILE_SIZE', help_text=_(
+        'Size in bytes of the largest cache file that will be kept in '
+        'memory. A value of 0 disables the memory tier.'
+    )
+)
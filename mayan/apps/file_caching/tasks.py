@@ -3,11 +3,46 @@ import logging
 from django.apps import apps
 from django.contrib.auth import get_user_model
 
+from mayan.apps.lock_manager.exceptions import LockError
+from mayan.apps.lock_manager.runtime import locking_backend
 from mayan.celery import app
 
+from .literals import LOCK_EXPIRE_CACHE_PRUNE
+
 logger = logging.getLogger(name=__name__)
 
 
+@app.task(ignore_result=True)
+def task_cache_partitions_delete(cache_id, partition_name_list):
+    Cache = apps.get_model(
+        app_label='file_caching', model_name='Cache'
+    )
+
+    cache = Cache.objects.get(pk=cache_id)
+    cache.delete_partitions(partition_name_list=partition_name_list)
+
+
+@app.task(ignore_result=True)
+def task_cache_prune(cache_id):
+    Cache = apps.get_model(
+        app_label='file_caching', model_name='Cache'
+    )
+
+    lock_id = 'task_cache_prune-{}'.format(cache_id)
+    try:
+        logger.debug('trying to acquire lock: %s', lock_id)
+        lock = locking_backend.acquire_lock(
+            name=lock_id, timeout=LOCK_EXPIRE_CACHE_PRUNE
+        )
+        logger.debug('acquired lock: %s', lock_id)
+        try:
+            Cache.objects.get(pk=cache_id).prune()
+        finally:
+            lock.release()
+    except LockError:
+        logger.debug('unable to obtain lock: %s', lock_id)
+
+
 @app.task(ignore_result=True)
 def task_cache_purge(cache_id, user_id=None):
     Cache = apps.get_model(
@@ -39,14 +39,31 @@ class CacheTestMixin(object):
             name=TEST_CACHE_PARTITION_NAME
         )
 
-    def _create_test_cache_partition_file(self):
-        with self.test_cache_partition.create_file(filename=TEST_CACHE_PARTITION_FILE_FILENAME) as file_object:
+    def _create_test_cache_partition_file(self, filename=None, file_size=None):
+        filename = filename or TEST_CACHE_PARTITION_FILE_FILENAME
+        file_size = file_size or TEST_CACHE_PARTITION_FILE_SIZE
+
+        with self.test_cache_partition.create_file(filename=filename) as file_object:
             file_object.write(
-                force_bytes(' ' * TEST_CACHE_PARTITION_FILE_SIZE)
+                force_bytes(' ' * file_size)
             )
 
         self.test_cache_partition_file = self.test_cache_partition.files.get(
-            filename=TEST_CACHE_PARTITION_FILE_FILENAME
+            filename=filename
+        )
+
+
+class CacheAPIViewTestMixin(object):
+    def _request_test_cache_detail_api_view(self):
+        return self.get(
+            viewname='rest_api:cache-detail', kwargs={'pk': self.test_cache.pk}
+        )
+
+    def _request_test_cache_statistics_reset_api_view(self):
+        return self.post(
+            viewname='rest_api:cache-statistics-reset', kwargs={
+                'pk': self.test_cache.pk
+            }
         )
 
 
@@ -61,6 +78,13 @@ class CacheViewTestMixin(object):
             }
         )
 
+    def _request_test_cache_statistics_reset_view(self):
+        return self.post(
+            viewname='file_caching:cache_statistics_reset', kwargs={
+                'cache_id': self.test_cache.pk
+            }
+        )
+
     def _request_test_cache_multiple_purge_view(self):
         return self.post(
             viewname='file_caching:cache_multiple_purge', data={
@@ -0,0 +1,56 @@
+from rest_framework import status
+
+from mayan.apps.rest_api.tests.base import BaseAPITestCase
+
+from ..classes import CacheFileAccessTracker
+from ..permissions import (
+    permission_cache_statistics_reset, permission_cache_view
+)
+
+from .literals import TEST_CACHE_PARTITION_FILE_FILENAME
+from .mixins import CacheAPIViewTestMixin, CacheTestMixin
+
+
+class CacheAPIViewTestCase(
+    CacheAPIViewTestMixin, CacheTestMixin, BaseAPITestCase
+):
+    def setUp(self):
+        super(CacheAPIViewTestCase, self).setUp()
+        self._create_test_cache()
+        self._create_test_cache_partition()
+        self._create_test_cache_partition_file()
+        self.test_cache_partition.get_file(
+            filename=TEST_CACHE_PARTITION_FILE_FILENAME
+        )
+        CacheFileAccessTracker.flush()
+
+    def test_cache_detail_api_view_no_permission(self):
+        response = self._request_test_cache_detail_api_view()
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_cache_detail_api_view_with_access(self):
+        self.grant_access(
+            obj=self.test_cache, permission=permission_cache_view
+        )
+
+        response = self._request_test_cache_detail_api_view()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['hits'], 1)
+
+    def test_cache_statistics_reset_api_view_no_permission(self):
+        response = self._request_test_cache_statistics_reset_api_view()
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+        self.test_cache.refresh_from_db()
+        self.assertEqual(self.test_cache.hits, 1)
+
+    def test_cache_statistics_reset_api_view_with_access(self):
+        self.grant_access(
+            obj=self.test_cache, permission=permission_cache_statistics_reset
+        )
+
+        response = self._request_test_cache_statistics_reset_api_view()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.test_cache.refresh_from_db()
+        self.assertEqual(self.test_cache.hits, 0)
@@ -0,0 +1,103 @@
+import mock
+
+from django.core.cache import caches
+
+from mayan.apps.common.tests.base import BaseTestCase
+
+from ..classes import CacheFileAccessTracker, CacheFileMemoryTier
+
+from .literals import (
+    TEST_CACHE_PARTITION_FILE_FILENAME, TEST_CACHE_PARTITION_FILE_SIZE,
+    TEST_MEMORY_TIER_CACHE_ALIAS
+)
+from .mixins import CacheTestMixin
+
+
+class CacheFileAccessTrackerTestCase(CacheTestMixin, BaseTestCase):
+    def setUp(self):
+        super(CacheFileAccessTrackerTestCase, self).setUp()
+        self._create_test_cache()
+        self._create_test_cache_partition()
+        self._create_test_cache_partition_file()
+        CacheFileAccessTracker.flush()
+
+    def test_access_batching(self):
+        self.test_cache_partition_file.open().close()
+        self.test_cache_partition_file.open().close()
+
+        self.test_cache_partition_file.refresh_from_db()
+        self.assertEqual(self.test_cache_partition_file.hits, 0)
+
+        CacheFileAccessTracker.flush()
+
+        self.test_cache_partition_file.refresh_from_db()
+        self.assertEqual(self.test_cache_partition_file.hits, 2)
+
+
+class CacheFileMemoryTierTestCase(CacheTestMixin, BaseTestCase):
+    def setUp(self):
+        super(CacheFileMemoryTierTestCase, self).setUp()
+        for name, value in (
+            ('setting_memory_tier_cache_alias', TEST_MEMORY_TIER_CACHE_ALIAS),
+            (
+                'setting_memory_tier_maximum_file_size',
+                TEST_CACHE_PARTITION_FILE_SIZE
+            )
+        ):
+            patcher = mock.patch(
+                'mayan.apps.file_caching.classes.{}'.format(name),
+                value=value
+            )
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        caches[TEST_MEMORY_TIER_CACHE_ALIAS].clear()
+        self.addCleanup(caches[TEST_MEMORY_TIER_CACHE_ALIAS].clear)
+
+        self._create_test_cache()
+        self._create_test_cache_partition()
+        self._create_test_cache_partition_file()
+        CacheFileAccessTracker.flush()
+
+    def test_memory_tier_disabled_without_cache_alias(self):
+        with mock.patch(
+            'mayan.apps.file_caching.classes.setting_memory_tier_cache_alias',
+            value=None
+        ):
+            self.assertFalse(CacheFileMemoryTier.is_enabled())
+
+    def test_memory_tier_hit(self):
+        self.test_cache_partition.get_file(
+            filename=TEST_CACHE_PARTITION_FILE_FILENAME
+        )
+
+        with self.assertNumQueries(0):
+            partition_file = self.test_cache_partition.get_file(
+                filename=TEST_CACHE_PARTITION_FILE_FILENAME
+            )
+
+        with partition_file.open() as file_object:
+            self.assertEqual(
+                len(file_object.read()), TEST_CACHE_PARTITION_FILE_SIZE
+            )
+
+        CacheFileAccessTracker.flush()
+        self.test_cache.refresh_from_db()
+        self.assertEqual(self.test_cache.hits, 2)
+        self.assertEqual(self.test_cache.memory_tier_hits, 1)
+
+    def test_memory_tier_invalidation(self):
+        self.test_cache_partition.get_file(
+            filename=TEST_CACHE_PARTITION_FILE_FILENAME
+        ).delete()
+
+        self.assertEqual(
+            self.test_cache_partition.get_file(
+                filename=TEST_CACHE_PARTITION_FILE_FILENAME
+            ), None
+        )
+
+        CacheFileAccessTracker.flush()
+        self.test_cache.refresh_from_db()
+        self.assertEqual(self.test_cache.memory_tier_hits, 0)
+        self.assertEqual(self.test_cache.misses, 1)
@@ -2,10 +2,82 @@ import mock
 
 from mayan.apps.common.tests.base import BaseTestCase
 
+from ..classes import CacheFileAccessTracker
+
+from .literals import (
+    TEST_CACHE_MAXIMUM_SIZE, TEST_CACHE_PARTITION_FILE_FILENAME,
+    TEST_CACHE_PARTITION_FILE_SIZE
+)
 from .mixins import CacheTestMixin
 
 
 class CacheModelTestCase(CacheTestMixin, BaseTestCase):
+    def test_cache_delete_partitions(self):
+        self._create_test_cache()
+        self._create_test_cache_partition()
+        self._create_test_cache_partition_file()
+
+        self.test_cache.delete_partitions(
+            partition_name_list=(self.test_cache_partition.name,)
+        )
+
+        self.assertEqual(self.test_cache.partitions.count(), 0)
+        self.assertEqual(self.test_cache.get_total_size(), 0)
+
+    def test_cache_prune_least_recently_used(self):
+        self._create_test_cache()
+        self._create_test_cache_partition()
+
+        file_size = TEST_CACHE_MAXIMUM_SIZE // 10
+
+        for index in range(10):
+            self._create_test_cache_partition_file(
+                filename='test_file_{}'.format(index), file_size=file_size
+            )
+
+        self.test_cache_partition.get_file(filename='test_file_0').open().close()
+
+        self._create_test_cache_partition_file(
+            filename='test_file_10', file_size=file_size
+        )
+
+        self.assertTrue(
+            self.test_cache_partition.get_file(filename='test_file_0')
+        )
+        self.assertFalse(
+            self.test_cache_partition.get_file(filename='test_file_1')
+        )
+        self.assertFalse(
+            self.test_cache_partition.get_file(filename='test_file_2')
+        )
+
+    def test_cache_prune_to_low_watermark(self):
+        self._create_test_cache()
+        self._create_test_cache_partition()
+
+        file_size = TEST_CACHE_MAXIMUM_SIZE // 10
+
+        for index in range(10):
+            self._create_test_cache_partition_file(
+                filename='test_file_{}'.format(index), file_size=file_size
+            )
+
+        self.assertEqual(self.test_cache.get_files().count(), 10)
+
+        self._create_test_cache_partition_file(
+            filename='test_file_10', file_size=file_size
+        )
+
+        self.assertEqual(self.test_cache.get_files().count(), 9)
+        self.test_cache.refresh_from_db()
+        self.assertEqual(self.test_cache.evictions, 2)
+        self.assertTrue(
+            self.test_cache.get_total_size() <= self.test_cache.get_low_watermark()
+        )
+        self.assertEqual(
+            self.test_cache.get_total_size(), file_size * 9
+        )
+
     def test_cache_purge(self):
         self._create_test_cache()
         self._create_test_cache_partition()
@@ -17,6 +89,40 @@ class CacheModelTestCase(CacheTestMixin, BaseTestCase):
 
         self.assertNotEqual(cache_total_size, self.test_cache.get_total_size())
 
+    def test_cache_statistics(self):
+        self._create_test_cache()
+        self._create_test_cache_partition()
+        self._create_test_cache_partition_file()
+
+        self.test_cache_partition.get_file(
+            filename=TEST_CACHE_PARTITION_FILE_FILENAME
+        )
+        self.test_cache_partition.get_file(filename='non_existent')
+        CacheFileAccessTracker.flush()
+
+        self.test_cache.refresh_from_db()
+        self.assertEqual(
+            self.test_cache.bytes_written, TEST_CACHE_PARTITION_FILE_SIZE
+        )
+        self.assertEqual(self.test_cache.get_hit_ratio(), 0.5)
+
+        self.test_cache.reset_statistics()
+        self.assertEqual(self.test_cache.bytes_written, 0)
+        self.assertEqual(self.test_cache.get_hit_ratio(), None)
+
+    def test_cache_total_size(self):
+        self._create_test_cache()
+        self._create_test_cache_partition()
+        self._create_test_cache_partition_file()
+
+        self.assertEqual(
+            self.test_cache.get_total_size(), TEST_CACHE_PARTITION_FILE_SIZE
+        )
+
+        self.test_cache_partition_file.delete()
+
+        self.assertEqual(self.test_cache.get_total_size(), 0)
+
     @mock.patch('django.core.files.File.close')
     def test_storage_file_close(self, mock_storage_file_close_method):
         self._create_test_cache()
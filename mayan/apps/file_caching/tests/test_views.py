@@ -1,7 +1,8 @@
 from mayan.apps.common.tests.base import GenericViewTestCase
 
 from ..permissions import (
-    permission_cache_purge, permission_cache_view
+    permission_cache_purge, permission_cache_statistics_reset,
+    permission_cache_view
 )
 
 from .mixins import CacheTestMixin, CacheViewTestMixin
@@ -85,3 +86,29 @@ class CacheViewTestCase(
         self.assertEqual(response.status_code, 302)
 
         self.assertNotEqual(cache_total_size, self.test_cache.get_total_size())
+
+    def test_cache_statistics_reset_view_no_permissions(self):
+        self._create_test_cache()
+        self._create_test_cache_partition()
+        self._create_test_cache_partition_file()
+
+        response = self._request_test_cache_statistics_reset_view()
+        self.assertEqual(response.status_code, 404)
+
+        self.test_cache.refresh_from_db()
+        self.assertNotEqual(self.test_cache.bytes_written, 0)
+
+    def test_cache_statistics_reset_view_with_access(self):
+        self._create_test_cache()
+        self._create_test_cache_partition()
+        self._create_test_cache_partition_file()
+
+        self.grant_access(
+            obj=self.test_cache, permission=permission_cache_statistics_reset
+        )
+
+        response = self._request_test_cache_statistics_reset_view()
+        self.assertEqual(response.status_code, 302)
+
+        self.test_cache.refresh_from_db()
+        self.assertEqual(self.test_cache.bytes_written, 0)
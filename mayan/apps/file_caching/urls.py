@@ -1,6 +1,9 @@
 from django.conf.urls import url
 
-from .views import CacheListView, CachePurgeView
+from .api_views import (
+    APICacheListView, APICacheStatisticsResetView, APICacheView
+)
+from .views import CacheListView, CachePurgeView, CacheStatisticsResetView
 
 urlpatterns = [
     url(
@@ -14,4 +17,30 @@ urlpatterns = [
         regex=r'^caches/multiple/purge/$', name='cache_multiple_purge',
         view=CachePurgeView.as_view()
     ),
+    url(
+        regex=r'^caches/(?P<cache_id>\d+)/statistics/reset/$',
+        name='cache_statistics_reset',
+        view=CacheStatisticsResetView.as_view()
+    ),
+    url(
+        regex=r'^caches/multiple/statistics/reset/$',
+        name='cache_multiple_statistics_reset',
+        view=CacheStatisticsResetView.as_view()
+    ),
+]
+
+api_urls = [
+    url(
+        regex=r'^caches/$', name='cache-list',
+        view=APICacheListView.as_view()
+    ),
+    url(
+        regex=r'^caches/(?P<pk>[0-9]+)/$', name='cache-detail',
+        view=APICacheView.as_view()
+    ),
+    url(
+        regex=r'^caches/(?P<pk>[0-9]+)/statistics/reset/$',
+        name='cache-statistics-reset',
+        view=APICacheStatisticsResetView.as_view()
+    ),
 ]
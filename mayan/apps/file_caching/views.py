@@ -6,7 +6,10 @@ from mayan.apps.common.generics import (
 )
 
 from .models import Cache
-from .permissions import permission_cache_purge, permission_cache_view
+from .permissions import (
+    permission_cache_purge, permission_cache_statistics_reset,
+    permission_cache_view
+)
 
 from .tasks import task_cache_purge
 
@@ -49,3 +52,30 @@ class CachePurgeView(MultipleObjectConfirmActionView):
         task_cache_purge.apply_async(
             kwargs={'cache_id': instance.pk, 'user_id': self.request.user.pk}
         )
+
+
+class CacheStatisticsResetView(MultipleObjectConfirmActionView):
+    model = Cache
+    object_permission = permission_cache_statistics_reset
+    pk_url_kwarg = 'cache_id'
+    success_message_singular = '%(count)d cache statistics reset.'
+    success_message_plural = '%(count)d caches statistics reset.'
+
+    def get_extra_context(self):
+        queryset = self.object_list
+
+        result = {
+            'title': ungettext(
+                singular='Reset the statistics of the selected cache?',
+                plural='Reset the statistics of the selected caches?',
+                number=queryset.count()
+            )
+        }
+
+        if queryset.count() == 1:
+            result['object'] = queryset.first()
+
+        return result
+
+    def object_action(self, form, instance):
+        instance.reset_statistics(_user=self.request.user)
@@ -16,5 +16,24 @@ class LockingBackend(object):
     def purge_locks(cls):
         logger.debug('purging locks')
 
+    @classmethod
+    def refresh_lock(cls, name, token, timeout):
+        """
+        Extend the expiration of a lock to timeout seconds from now. The
+        token identifies the owner and is the value of the token attribute
+        of the lock instance. Raises LockError if the lock has expired and
+        was acquired by someone else.
+        """
+        logger.debug('refreshing lock: %s, timeout: %s', name, timeout)
+
+    @classmethod
+    def release_lock(cls, name, token):
+        """
+        Release a lock without holding its instance, only if it is still
+        owned by the token. Used when a lock is acquired by one task and
+        released by another one.
+        """
+        logger.debug('releasing lock by token: %s', name)
+
     def release(self):
         logger.debug('releasing lock: %s', self.name)
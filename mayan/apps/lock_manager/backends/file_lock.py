@@ -50,6 +50,60 @@ class FileLock(LockingBackend):
             file_object.truncate()
             lock.release()
 
+    @classmethod
+    def refresh_lock(cls, name, token, timeout):
+        super(FileLock, cls).refresh_lock(
+            name=name, token=token, timeout=timeout
+        )
+        lock.acquire()
+        try:
+            with open(cls.lock_file, 'r+') as file_object:
+                locks.lock(f=file_object, flags=locks.LOCK_EX)
+                data = file_object.read()
+
+                if data:
+                    file_locks = json.loads(s=data)
+                else:
+                    file_locks = {}
+
+                if file_locks.get(name, {}).get('uuid') != token:
+                    # Lock expired and someone else acquired or released it
+                    raise LockError
+
+                file_locks[name]['expiration'] = time.time() + timeout
+
+                file_object.seek(0)
+                file_object.truncate()
+                file_object.write(json.dumps(obj=file_locks))
+        finally:
+            lock.release()
+
+    @classmethod
+    def release_lock(cls, name, token):
+        super(FileLock, cls).release_lock(name=name, token=token)
+        lock.acquire()
+        try:
+            with open(cls.lock_file, 'r+') as file_object:
+                locks.lock(f=file_object, flags=locks.LOCK_EX)
+                data = file_object.read()
+
+                if data:
+                    file_locks = json.loads(s=data)
+                else:
+                    file_locks = {}
+
+                if file_locks.get(name, {}).get('uuid') == token:
+                    file_locks.pop(name)
+                else:
+                    # Lock expired and someone else acquired or released it
+                    pass
+
+                file_object.seek(0)
+                file_object.truncate()
+                file_object.write(json.dumps(obj=file_locks))
+        finally:
+            lock.release()
+
     def _get_lock_dictionary(self):
         if self.timeout:
             result = {
@@ -68,6 +122,7 @@ class FileLock(LockingBackend):
         self.name = name
         self.timeout = timeout or setting_default_lock_timeout.value
         self.uuid = force_text(uuid.uuid4())
+        self.token = self.uuid
 
         lock.acquire()
         with open(self.__class__.lock_file, 'r+') as file_object:
@@ -1,4 +1,10 @@
+import math
+
 from django.apps import apps
+from django.utils.dateparse import parse_datetime
+from django.utils.timezone import now
+
+from ..exceptions import LockError
 
 from .base import LockingBackend
 
@@ -20,9 +26,37 @@ class ModelLock(LockingBackend):
         Lock = apps.get_model(app_label='lock_manager', model_name='Lock')
         Lock.objects.select_for_update().delete()
 
+    @classmethod
+    def refresh_lock(cls, name, token, timeout):
+        super(ModelLock, cls).refresh_lock(
+            name=name, token=token, timeout=timeout
+        )
+        Lock = apps.get_model(app_label='lock_manager', model_name='Lock')
+        creation_datetime = parse_datetime(token)
+        # The creation date is the owner token, extend the timeout instead.
+        updated = Lock.objects.filter(
+            creation_datetime=creation_datetime, name=name
+        ).update(
+            timeout=int(
+                math.ceil((now() - creation_datetime).total_seconds())
+            ) + timeout
+        )
+
+        if not updated:
+            raise LockError
+
+    @classmethod
+    def release_lock(cls, name, token):
+        super(ModelLock, cls).release_lock(name=name, token=token)
+        Lock = apps.get_model(app_label='lock_manager', model_name='Lock')
+        Lock.objects.filter(
+            creation_datetime=parse_datetime(token), name=name
+        ).delete()
+
     def __init__(self, model_instance):
         self.model_instance = model_instance
         self.name = model_instance.name
+        self.token = model_instance.creation_datetime.isoformat()
 
     def release(self):
         super(ModelLock, self).release()
@@ -1,6 +1,6 @@
 import redis
 
-from django.utils.encoding import force_text
+from django.utils.encoding import force_bytes, force_text
 
 from mayan.apps.dependencies.exceptions import DependenciesException
 
@@ -29,6 +29,34 @@ class RedisLock(LockingBackend):
     def purge_locks(cls):
         super(RedisLock, cls).purge_locks()
 
+    @classmethod
+    def refresh_lock(cls, name, token, timeout):
+        super(RedisLock, cls).refresh_lock(
+            name=name, token=token, timeout=timeout
+        )
+        with cls.get_redis_connection().pipeline() as pipeline:
+            try:
+                pipeline.watch(name)
+                if pipeline.get(name) != force_bytes(token):
+                    raise LockError
+
+                pipeline.multi()
+                pipeline.expire(name, timeout)
+                pipeline.execute()
+            except redis.exceptions.WatchError:
+                raise LockError
+
+    @classmethod
+    def release_lock(cls, name, token):
+        super(RedisLock, cls).release_lock(name=name, token=token)
+        redis_lock_instance = cls.get_redis_connection().lock(name=name)
+        redis_lock_instance.local.token = force_bytes(token)
+        try:
+            redis_lock_instance.release()
+        except redis.exceptions.LockError:
+            # Lock expired and someone else acquired or released it
+            return
+
     def __init__(self, name, timeout):
         if redis.VERSION < REDIS_LOCK_VERSION_REQUIRED:
             raise DependenciesException(
@@ -44,6 +72,7 @@ class RedisLock(LockingBackend):
         )
         if redis_lock_instance.acquire():
             self.redis_lock_instance = redis_lock_instance
+            self.token = force_text(redis_lock_instance.local.token)
         else:
             raise LockError
 
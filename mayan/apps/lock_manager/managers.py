@@ -36,6 +36,8 @@ class LockManager(models.Manager):
 
             if now() > lock.creation_datetime + datetime.timedelta(seconds=lock.timeout):
                 logger.debug('reseting deleting stale lock: %s', name)
+                # A new creation date identifies the new owner.
+                lock.creation_datetime = now()
                 lock.timeout = timeout
                 logger.debug('trying to reacquire stale lock: %s', name)
                 lock.save()
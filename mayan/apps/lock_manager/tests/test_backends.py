@@ -34,6 +34,54 @@ class FileLockTestCase(BaseTestCase):
         # Cleanup
         lock_2.release()
 
+    def test_refresh(self):
+        lock_1 = self.locking_backend.acquire_lock(name=TEST_LOCK_1, timeout=1)
+        self.locking_backend.refresh_lock(
+            name=TEST_LOCK_1, token=lock_1.token, timeout=60
+        )
+
+        time.sleep(1.01)
+        # lock_1 was refreshed and has not expired, should raise LockError
+        with self.assertRaises(expected_exception=LockError):
+            self.locking_backend.acquire_lock(name=TEST_LOCK_1)
+
+        # Cleanup
+        lock_1.release()
+
+    def test_refresh_expired_reacquired(self):
+        lock_1 = self.locking_backend.acquire_lock(name=TEST_LOCK_1, timeout=1)
+        time.sleep(1.01)
+        lock_2 = self.locking_backend.acquire_lock(name=TEST_LOCK_1)
+
+        with self.assertRaises(expected_exception=LockError):
+            self.locking_backend.refresh_lock(
+                name=TEST_LOCK_1, token=lock_1.token, timeout=60
+            )
+
+        # Cleanup
+        lock_2.release()
+
+    def test_release_by_token(self):
+        lock_1 = self.locking_backend.acquire_lock(name=TEST_LOCK_1)
+        self.locking_backend.release_lock(name=TEST_LOCK_1, token=lock_1.token)
+        lock_2 = self.locking_backend.acquire_lock(name=TEST_LOCK_1)
+
+        # Cleanup
+        lock_2.release()
+
+    def test_release_by_token_expired_reacquired(self):
+        lock_1 = self.locking_backend.acquire_lock(name=TEST_LOCK_1, timeout=1)
+        time.sleep(1.01)
+        lock_2 = self.locking_backend.acquire_lock(name=TEST_LOCK_1)
+
+        # The token of lock_1 must not release the lock of lock_2.
+        self.locking_backend.release_lock(name=TEST_LOCK_1, token=lock_1.token)
+        with self.assertRaises(expected_exception=LockError):
+            self.locking_backend.acquire_lock(name=TEST_LOCK_1)
+
+        # Cleanup
+        lock_2.release()
+
     def test_timeout_expired(self):
         self.locking_backend.acquire_lock(name=TEST_LOCK_1, timeout=1)
 
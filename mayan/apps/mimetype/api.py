@@ -1,39 +1,44 @@
-from shutil import copyfileobj
-
 import magic
 
-from mayan.apps.storage.utils import NamedTemporaryFile
+from .settings import setting_file_read_size
 
 
 def get_mimetype(file_object, mimetype_only=False):
     """
     Determine a file's mimetype by calling the system's libmagic
-    library via python-magic.
+    library via python-magic. Only the leading bytes of the file are read.
     """
-    file_mimetype = None
-    file_mime_encoding = None
-
-    temporary_file_object = NamedTemporaryFile()
     file_object.seek(0)
-    copyfileobj(fsrc=file_object, fdst=temporary_file_object)
+    if setting_file_read_size.value:
+        buffer = file_object.read(setting_file_read_size.value)
+    else:
+        buffer = file_object.read()
     file_object.seek(0)
-    temporary_file_object.seek(0)
+
+    return get_mimetype_from_buffer(
+        buffer=buffer, mimetype_only=mimetype_only
+    )
+
+
+def get_mimetype_from_buffer(buffer, mimetype_only=False):
+    """
+    Determine the mimetype of a file from its leading bytes.
+    """
+    file_mimetype = None
+    file_mime_encoding = None
 
     kwargs = {'mime': True}
 
     if not mimetype_only:
         kwargs['mime_encoding'] = True
 
-    try:
-        mime = magic.Magic(**kwargs)
-
-        if mimetype_only:
-            file_mimetype = mime.from_file(filename=temporary_file_object.name)
-        else:
-            file_mimetype, file_mime_encoding = mime.from_file(
-                filename=temporary_file_object.name
-            ).split('; charset=')
-    finally:
-        temporary_file_object.close()
+    mime = magic.Magic(**kwargs)
+
+    if mimetype_only:
+        file_mimetype = mime.from_buffer(buffer)
+    else:
+        file_mimetype, file_mime_encoding = mime.from_buffer(
+            buffer
+        ).split('; charset=')
 
     return file_mimetype, file_mime_encoding
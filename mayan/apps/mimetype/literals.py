@@ -0,0 +1 @@
+DEFAULT_MIMETYPE_FILE_READ_SIZE = 1048576  # 1 Megabyte
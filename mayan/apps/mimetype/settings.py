@@ -0,0 +1,15 @@
+from django.utils.translation import ugettext_lazy as _
+
+from mayan.apps.smart_settings.classes import Namespace
+
+from .literals import DEFAULT_MIMETYPE_FILE_READ_SIZE
+
+namespace = Namespace(label=_('MIME types'), name='mimetype')
+
+setting_file_read_size = namespace.add_setting(
+    default=DEFAULT_MIMETYPE_FILE_READ_SIZE,
+    global_name='MIMETYPE_FILE_READ_SIZE', help_text=_(
+        'Amount of bytes to read from the start of a file to determine its '
+        'MIME type. Setting it to 0 reads the entire file.'
+    )
+)
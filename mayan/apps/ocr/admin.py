@@ -7,12 +7,15 @@ from .models import (
 
 @admin.register(DocumentPageOCRContent)
 class DocumentPageOCRContentAdmin(admin.ModelAdmin):
-    list_display = ('document_page',)
+    list_display = ('document_page', 'source')
 
 
 @admin.register(DocumentTypeSettings)
 class DocumentTypeSettingsAdmin(admin.ModelAdmin):
-    list_display = ('document_type', 'auto_ocr')
+    list_display = (
+        'document_type', 'auto_ocr', 'skip_parsed_pages',
+        'get_skipped_page_count'
+    )
 
 
 @admin.register(DocumentVersionOCRError)
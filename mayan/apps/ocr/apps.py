@@ -121,6 +121,11 @@ class OCRApp(MayanAppConfig):
             model=DocumentTypeSettings, related='document_type',
         )
 
+        SourceColumn(
+            func=lambda context: context['object'].ocr_settings.get_skipped_page_count(),
+            label=_('Pages with OCR skipped'), source=DocumentType
+        )
+
         SourceColumn(
             attribute='document_version__document', is_attribute_absolute_url=True,
             is_identifier=True, is_sortable=True, source=DocumentVersionOCRError
@@ -6,3 +6,7 @@ else:
     DEFAULT_TESSERACT_BINARY_PATH = '/usr/bin/tesseract'
 
 DEFAULT_TESSERACT_TIMEOUT = 600  # 600 seconds, 10 minutes
+
+DEFAULT_TESSERACT_POOL_MAXIMUM_PAGES = 500
+DEFAULT_TESSERACT_POOL_SIZE = 2
+TESSERACT_POOL_ACQUIRE_TIMEOUT = 120
@@ -0,0 +1,261 @@
+import atexit
+import logging
+import os
+import threading
+
+from PIL import Image
+
+from django.utils.translation import ugettext_lazy as _
+
+from ..classes import OCRBackendBase
+from ..exceptions import OCRError, TesseractPoolError
+from ..settings import setting_ocr_backend_arguments
+
+from .literals import (
+    DEFAULT_TESSERACT_POOL_MAXIMUM_PAGES, DEFAULT_TESSERACT_POOL_SIZE,
+    TESSERACT_POOL_ACQUIRE_TIMEOUT
+)
+
+try:
+    import tesserocr
+except ImportError:
+    tesserocr = None
+
+logger = logging.getLogger(name=__name__)
+
+
+class TesseractEngine(object):
+    """
+    Long lived Tesseract engine that keeps the language models loaded in
+    memory between pages.
+    """
+    def __init__(self, language, tessdata_path=None):
+        self.api = None
+        self.language = language
+        self.page_count = 0
+        self.tessdata_path = tessdata_path
+
+    def execute(self, image):
+        try:
+            self.api.SetImage(image)
+            return self.api.GetUTF8Text()
+        finally:
+            self.api.Clear()
+            self.page_count += 1
+
+    def is_alive(self):
+        if not self.api:
+            return False
+
+        try:
+            # An engine that lost its initialization reports no languages.
+            return bool(self.api.GetInitLanguagesAsString())
+        except Exception as exception:
+            logger.debug(
+                'Exception checking Tesseract engine health; %s', exception
+            )
+            return False
+
+    def start(self):
+        keyword_arguments = {}
+
+        if self.language:
+            keyword_arguments['lang'] = self.language
+
+        if self.tessdata_path:
+            keyword_arguments['path'] = self.tessdata_path
+
+        self.api = tesserocr.PyTessBaseAPI(**keyword_arguments)
+
+    def stop(self):
+        if self.api:
+            try:
+                self.api.End()
+            except Exception as exception:
+                logger.debug(
+                    'Exception stopping Tesseract engine; %s', exception
+                )
+
+        self.api = None
+
+
+class TesseractEnginePool(object):
+    """
+    Bounded pool of long lived Tesseract engines per language. Engines are
+    started on demand, checked before being reused, recycled after a
+    number of pages or after an error and are owned by the operating
+    system process that created the pool.
+    """
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    @classmethod
+    def get_instance(cls, maximum_pages, size, tessdata_path=None):
+        """
+        Return the pool of the current process, creating it if needed.
+        """
+        with cls._instance_lock:
+            # Pools are not inherited across process forks.
+            if not cls._instance or cls._instance.pid != os.getpid():
+                cls._instance = cls(
+                    maximum_pages=maximum_pages, size=size,
+                    tessdata_path=tessdata_path
+                )
+                atexit.register(cls._instance.shutdown)
+
+            return cls._instance
+
+    def __init__(self, size, maximum_pages, tessdata_path=None):
+        self.condition = threading.Condition()
+        self.engine_counts = {}
+        self.idle_engines = {}
+        self.maximum_pages = maximum_pages
+        self.pid = os.getpid()
+        self.size = size
+        self.tessdata_path = tessdata_path
+
+    def acquire(self, language):
+        with self.condition:
+            while True:
+                idle_engines = self.idle_engines.get(language, [])
+
+                while idle_engines:
+                    engine = idle_engines.pop()
+                    if engine.is_alive():
+                        return engine
+                    else:
+                        logger.debug(
+                            'Discarding unhealthy Tesseract engine for '
+                            'language: %s', language
+                        )
+                        engine.stop()
+                        self.engine_counts[language] -= 1
+
+                if self.engine_counts.get(language, 0) < self.size:
+                    break
+
+                if not self.condition.wait(
+                    timeout=TESSERACT_POOL_ACQUIRE_TIMEOUT
+                ):
+                    raise TesseractPoolError(
+                        'Timeout waiting for an idle Tesseract engine.'
+                    )
+
+            self.engine_counts[language] = self.engine_counts.get(
+                language, 0
+            ) + 1
+
+        # Start the new engine outside the lock.
+        engine = TesseractEngine(
+            language=language, tessdata_path=self.tessdata_path
+        )
+        try:
+            engine.start()
+        except Exception:
+            self.discard(engine=engine)
+            raise
+
+        return engine
+
+    def discard(self, engine):
+        engine.stop()
+        with self.condition:
+            self.engine_counts[engine.language] -= 1
+            self.condition.notify_all()
+
+    def execute(self, image, language):
+        engine = self.acquire(language=language)
+        try:
+            result = engine.execute(image=image)
+        except Exception as exception:
+            # Recycle the engine in case its state is corrupted.
+            self.discard(engine=engine)
+            raise TesseractPoolError(
+                'Error performing OCR; {}'.format(exception)
+            )
+        else:
+            self.release(engine=engine)
+            return result
+
+    def release(self, engine):
+        if engine.page_count >= self.maximum_pages:
+            self.discard(engine=engine)
+        else:
+            with self.condition:
+                self.idle_engines.setdefault(engine.language, []).append(
+                    engine
+                )
+                self.condition.notify_all()
+
+    def shutdown(self):
+        with self.condition:
+            idle_engines = self.idle_engines
+            self.idle_engines = {}
+
+        for engines in idle_engines.values():
+            for engine in engines:
+                self.discard(engine=engine)
+
+
+class TesseractPool(OCRBackendBase):
+    """
+    Tesseract backend that reuses a pool of engines with the language
+    models already loaded instead of launching a tesseract process per
+    page. Requires the tesserocr Python bindings.
+    """
+    def __init__(self, *args, **kwargs):
+        super(TesseractPool, self).__init__()
+        self.languages = ()
+
+        if not tesserocr:
+            raise OCRError(
+                _('The tesserocr Python library is not installed.')
+            )
+
+        self.read_settings()
+
+        if self.tessdata_path:
+            self.languages = tesserocr.get_languages(self.tessdata_path)[1]
+        else:
+            self.languages = tesserocr.get_languages()[1]
+
+        logger.debug('Available languages: %s', ', '.join(self.languages))
+
+    def execute(self, *args, **kwargs):
+        super(TesseractPool, self).execute(*args, **kwargs)
+
+        engine_pool = TesseractEnginePool.get_instance(
+            maximum_pages=self.pool_maximum_pages, size=self.pool_size,
+            tessdata_path=self.tessdata_path
+        )
+
+        image = Image.open(self.converter.get_page())
+
+        try:
+            return engine_pool.execute(image=image, language=self.language)
+        except Exception as exception:
+            error_message = (
+                'Exception calling Tesseract with language option: {}; {}'
+            ).format(self.language, exception)
+
+            if self.language not in self.languages:
+                error_message = (
+                    '{}\nThe requested OCR language "{}" is not '
+                    'available and needs to be installed.\n'
+                ).format(
+                    error_message, self.language
+                )
+
+            logger.error(error_message)
+            raise OCRError(error_message)
+
+    def read_settings(self):
+        self.pool_maximum_pages = setting_ocr_backend_arguments.value.get(
+            'pool_maximum_pages', DEFAULT_TESSERACT_POOL_MAXIMUM_PAGES
+        )
+        self.pool_size = setting_ocr_backend_arguments.value.get(
+            'pool_size', DEFAULT_TESSERACT_POOL_SIZE
+        )
+        self.tessdata_path = setting_ocr_backend_arguments.value.get(
+            'tessdata_path', None
+        )
@@ -4,3 +4,11 @@ class OCRError(Exception):
     Raised by the OCR backend
     """
     pass
+
+
+class TesseractPoolError(OCRError):
+    """
+    Raised when the Tesseract engine pool is unable to perform the OCR
+    of a page.
+    """
+    pass
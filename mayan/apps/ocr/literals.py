@@ -1,2 +1,14 @@
+from django.utils.translation import ugettext_lazy as _
+
+DEFAULT_OCR_PAGE_CONCURRENCY = 4
+DEFAULT_PARSED_CONTENT_MINIMUM_LENGTH = 100
 DO_OCR_RETRY_DELAY = 10
 LOCK_EXPIRE = 60 * 10  # Adjust to worst case scenario
+
+OCR_CONTENT_SOURCE_OCR = 'ocr'
+OCR_CONTENT_SOURCE_PARSING = 'parsing'
+
+OCR_CONTENT_SOURCE_CHOICES = (
+    (OCR_CONTENT_SOURCE_OCR, _('OCR')),
+    (OCR_CONTENT_SOURCE_PARSING, _('Parsing')),
+)
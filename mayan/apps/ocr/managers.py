@@ -1,24 +1,43 @@
 import logging
-import sys
-import traceback
 
 from django.apps import apps
-from django.conf import settings
 from django.db import models, transaction
 
-from mayan.apps.documents.literals import DOCUMENT_IMAGE_TASK_TIMEOUT
-from mayan.apps.documents.tasks import task_generate_document_page_image
+from mayan.apps.document_parsing.parsers import Parser
 
 from .events import (
     event_ocr_document_content_deleted, event_ocr_document_version_finish
 )
+from .literals import OCR_CONTENT_SOURCE_OCR, OCR_CONTENT_SOURCE_PARSING
 from .runtime import ocr_backend
 from .signals import post_document_version_ocr
+from .utils import get_exception_text
 
 logger = logging.getLogger(name=__name__)
 
 
 class DocumentPageOCRContentManager(models.Manager):
+    def _get_parsed_content(self, document_page):
+        DocumentPageContent = apps.get_model(
+            app_label='document_parsing', model_name='DocumentPageContent'
+        )
+
+        try:
+            return DocumentPageContent.objects.get(
+                document_page=document_page
+            ).content
+        except DocumentPageContent.DoesNotExist:
+            # The parsing of the document version might not have run yet.
+            # Parsing a single page is still much cheaper than its OCR.
+            Parser.parse_document_page(document_page=document_page)
+
+        try:
+            return DocumentPageContent.objects.get(
+                document_page=document_page
+            ).content
+        except DocumentPageContent.DoesNotExist:
+            return ''
+
     def delete_content_for(self, document, user=None):
         with transaction.atomic():
             for document_page in document.pages.all():
@@ -28,6 +47,39 @@ class DocumentPageOCRContentManager(models.Manager):
                 actor=user, target=document
             )
 
+    def finish_document_version(self, document_version, errors=None):
+        """
+        Record the outcome of the OCR of a document version. The errors of
+        the pages are stored as OCR errors of the version, otherwise the
+        previous errors are cleared and the finish event and signal are
+        triggered.
+        """
+        if errors:
+            logger.error(
+                'OCR errors for document version: %d; %d pages failed',
+                document_version.pk, len(errors)
+            )
+            for error in errors:
+                document_version.ocr_errors.create(result=error)
+        else:
+            logger.info(
+                'OCR complete for document version: %s', document_version
+            )
+            document_version.ocr_errors.all().delete()
+
+            with transaction.atomic():
+                event_ocr_document_version_finish.commit(
+                    action_object=document_version.document,
+                    target=document_version
+                )
+
+                transaction.on_commit(
+                    lambda: post_document_version_ocr.send(
+                        sender=document_version.__class__,
+                        instance=document_version
+                    )
+                )
+
     def process_document_page(self, document_page):
         logger.info(
             'Processing page: %d of document version: %s',
@@ -38,15 +90,30 @@ class DocumentPageOCRContentManager(models.Manager):
             app_label='ocr', model_name='DocumentPageOCRContent'
         )
 
-        task = task_generate_document_page_image.apply_async(
-            kwargs=dict(
-                document_page_id=document_page.pk
+        ocr_settings = document_page.document.document_type.ocr_settings
+
+        if ocr_settings.skip_parsed_pages:
+            parsed_content = self._get_parsed_content(
+                document_page=document_page
             )
-        )
 
-        cache_filename = task.get(
-            timeout=DOCUMENT_IMAGE_TASK_TIMEOUT, disable_sync_subtasks=False
-        )
+            if len(''.join(parsed_content.split())) >= ocr_settings.parsed_content_minimum_length:
+                logger.info(
+                    'Skipping OCR of page: %d of document version: %s; '
+                    'using its parsed text', document_page.page_number,
+                    document_page.document_version
+                )
+                DocumentPageOCRContent.objects.update_or_create(
+                    document_page=document_page, defaults={
+                        'content': parsed_content,
+                        'source': OCR_CONTENT_SOURCE_PARSING
+                    }
+                )
+                return
+
+        # Generate the image in the same worker instead of dispatching and
+        # waiting for a subtask.
+        cache_filename = document_page.generate_image()
 
         with document_page.cache_partition.get_file(filename=cache_filename).open() as file_object:
             ocr_content = ocr_backend.execute(
@@ -55,7 +122,7 @@ class DocumentPageOCRContentManager(models.Manager):
             )
             DocumentPageOCRContent.objects.update_or_create(
                 document_page=document_page, defaults={
-                    'content': ocr_content
+                    'content': ocr_content, 'source': OCR_CONTENT_SOURCE_OCR
                 }
             )
 
@@ -65,46 +132,30 @@ class DocumentPageOCRContentManager(models.Manager):
         )
 
     def process_document_version(self, document_version):
+        """
+        OCR all the pages of a document version in the current process.
+        The task queue uses the per page tasks instead.
+        """
         logger.info('Starting OCR for document version: %s', document_version)
         logger.debug('document version: %d', document_version.pk)
 
+        errors = []
+
         try:
+            # Rasterize all the base page images in a single converter pass
+            # instead of one conversion per page. Not done when pages with
+            # parsed text are skipped to avoid rasterizing them.
+            if not document_version.document.document_type.ocr_settings.skip_parsed_pages:
+                document_version.cache_page_images()
+
             for document_page in document_version.pages.all():
                 self.process_document_page(document_page=document_page)
-
-            logger.info(
-                'OCR complete for document version: %s', document_version
-            )
-            document_version.ocr_errors.all().delete()
-
-            with transaction.atomic():
-                event_ocr_document_version_finish.commit(
-                    action_object=document_version.document,
-                    target=document_version
-                )
-
-                transaction.on_commit(
-                    lambda: post_document_version_ocr.send(
-                        sender=document_version.__class__,
-                        instance=document_version
-                    )
-                )
         except Exception as exception:
-            logger.error(
-                'OCR error for document version: %d; %s', document_version.pk,
-                exception
-            )
+            errors.append(get_exception_text(exception=exception))
 
-            if settings.DEBUG:
-                result = []
-                type, value, tb = sys.exc_info()
-                result.append('%s: %s' % (type.__name__, value))
-                result.extend(traceback.format_tb(tb))
-                document_version.ocr_errors.create(
-                    result='\n'.join(result)
-                )
-            else:
-                document_version.ocr_errors.create(result=exception)
+        self.finish_document_version(
+            document_version=document_version, errors=errors
+        )
 
 
 class DocumentTypeSettingsManager(models.Manager):
@@ -0,0 +1,39 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('ocr', '0008_auto_20180917_0646'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='documentpageocrcontent',
+            name='source',
+            field=models.CharField(
+                choices=[('ocr', 'OCR'), ('parsing', 'Parsing')],
+                default='ocr', help_text='Process that produced the '
+                'content. Pages with a text layer can use the content '
+                'obtained by parsing instead of OCR.', max_length=16,
+                verbose_name='Source'
+            ),
+        ),
+        migrations.AddField(
+            model_name='documenttypesettings',
+            name='parsed_content_minimum_length',
+            field=models.PositiveIntegerField(
+                default=100, help_text='Minimum number of non whitespace '
+                'characters the parsed text of a page must have for its OCR '
+                'to be skipped.', verbose_name='Parsed text minimum length'
+            ),
+        ),
+        migrations.AddField(
+            model_name='documenttypesettings',
+            name='skip_parsed_pages',
+            field=models.BooleanField(
+                default=False, help_text='Use the parsed text of the pages '
+                'that already have a text layer instead of performing OCR on '
+                'them.', verbose_name='Skip OCR of pages with parsed text'
+            ),
+        ),
+    ]
@@ -4,6 +4,10 @@ from django.utils.translation import ugettext_lazy as _
 
 from mayan.apps.documents.models import DocumentPage, DocumentType, DocumentVersion
 
+from .literals import (
+    DEFAULT_PARSED_CONTENT_MINIMUM_LENGTH, OCR_CONTENT_SOURCE_CHOICES,
+    OCR_CONTENT_SOURCE_OCR, OCR_CONTENT_SOURCE_PARSING
+)
 from .managers import (
     DocumentPageOCRContentManager, DocumentTypeSettingsManager
 )
@@ -21,6 +25,18 @@ class DocumentTypeSettings(models.Model):
         default=True,
         verbose_name=_('Automatically queue newly created documents for OCR.')
     )
+    skip_parsed_pages = models.BooleanField(
+        default=False, help_text=_(
+            'Use the parsed text of the pages that already have a text layer '
+            'instead of performing OCR on them.'
+        ), verbose_name=_('Skip OCR of pages with parsed text')
+    )
+    parsed_content_minimum_length = models.PositiveIntegerField(
+        default=DEFAULT_PARSED_CONTENT_MINIMUM_LENGTH, help_text=_(
+            'Minimum number of non whitespace characters the parsed text of '
+            'a page must have for its OCR to be skipped.'
+        ), verbose_name=_('Parsed text minimum length')
+    )
 
     objects = DocumentTypeSettingsManager()
 
@@ -28,6 +44,17 @@ class DocumentTypeSettings(models.Model):
         verbose_name = _('Document type settings')
         verbose_name_plural = _('Document types settings')
 
+    def get_skipped_page_count(self):
+        """
+        Return the number of pages of the document type whose OCR was
+        skipped in favor of their parsed text.
+        """
+        return DocumentPageOCRContent.objects.filter(
+            document_page__document_version__document__document_type=self.document_type,
+            source=OCR_CONTENT_SOURCE_PARSING
+        ).count()
+    get_skipped_page_count.short_description = _('Pages with OCR skipped')
+
     def natural_key(self):
         return self.document_type.natural_key()
     natural_key.dependencies = ['documents.DocumentType']
@@ -47,6 +74,13 @@ class DocumentPageOCRContent(models.Model):
             'The actual text content extracted by the OCR backend.'
         ), verbose_name=_('Content')
     )
+    source = models.CharField(
+        choices=OCR_CONTENT_SOURCE_CHOICES, default=OCR_CONTENT_SOURCE_OCR,
+        help_text=_(
+            'Process that produced the content. Pages with a text layer can '
+            'use the content obtained by parsing instead of OCR.'
+        ), max_length=16, verbose_name=_('Source')
+    )
 
     objects = DocumentPageOCRContentManager()
 
@@ -8,3 +8,15 @@ queue_ocr.add_task_type(
     dotted_path='mayan.apps.ocr.tasks.task_do_ocr',
     label=_('Document version OCR')
 )
+queue_ocr.add_task_type(
+    dotted_path='mayan.apps.ocr.tasks.task_do_ocr_error',
+    label=_('Document version OCR error')
+)
+queue_ocr.add_task_type(
+    dotted_path='mayan.apps.ocr.tasks.task_do_ocr_finish',
+    label=_('Document version OCR finish')
+)
+queue_ocr.add_task_type(
+    dotted_path='mayan.apps.ocr.tasks.task_do_ocr_page',
+    label=_('Document page OCR')
+)
@@ -5,11 +5,18 @@ from .models import DocumentPageOCRContent, DocumentTypeSettings
 
 class DocumentPageOCRContentSerializer(serializers.ModelSerializer):
     class Meta:
-        fields = ('content',)
+        fields = ('content', 'source')
         model = DocumentPageOCRContent
 
 
 class DocumentTypeOCRSettingsSerializer(serializers.ModelSerializer):
+    skipped_page_count = serializers.IntegerField(
+        read_only=True, source='get_skipped_page_count'
+    )
+
     class Meta:
-        fields = ('auto_ocr',)
+        fields = (
+            'auto_ocr', 'parsed_content_minimum_length', 'skip_parsed_pages',
+            'skipped_page_count'
+        )
         model = DocumentTypeSettings
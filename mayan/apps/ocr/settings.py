@@ -2,6 +2,7 @@ from django.utils.translation import ugettext_lazy as _
 
 from mayan.apps.smart_settings.classes import Namespace
 
+from .literals import DEFAULT_OCR_PAGE_CONCURRENCY
 from .setting_migrations import OCRSettingMigration
 
 namespace = Namespace(
@@ -24,3 +25,11 @@ setting_auto_ocr = namespace.add_setting(
         'Set new document types to perform OCR automatically by default.'
     )
 )
+setting_ocr_page_concurrency = namespace.add_setting(
+    global_name='OCR_PAGE_CONCURRENCY', default=DEFAULT_OCR_PAGE_CONCURRENCY,
+    help_text=_(
+        'Maximum number of pages of a single document version that are '
+        'OCRed at the same time. The pages are split among this number of '
+        'task chains that run in parallel.'
+    )
+)
@@ -1,5 +1,8 @@
+import itertools
 import logging
 
+from celery import chain, chord
+
 from django.apps import apps
 from django.db import OperationalError
 
@@ -8,18 +11,28 @@ from mayan.apps.lock_manager.runtime import locking_backend
 from mayan.celery import app
 
 from .literals import DO_OCR_RETRY_DELAY, LOCK_EXPIRE
+from .settings import setting_ocr_page_concurrency
+from .utils import get_exception_text
 
 logger = logging.getLogger(name=__name__)
 
 
 @app.task(bind=True, default_retry_delay=DO_OCR_RETRY_DELAY, ignore_result=True)
 def task_do_ocr(self, document_version_pk):
-    DocumentVersion = apps.get_model(
-        app_label='documents', model_name='DocumentVersion'
-    )
+    """
+    Split the OCR of a document version into chains of per page tasks
+    that run in parallel. The lock of the document version is held until
+    the chord callback task_do_ocr_finish or the chord errback
+    task_do_ocr_error releases it using the token of the lock. Each page
+    task refreshes the lock so that it expires only when the OCR stops
+    making progress.
+    """
     DocumentPageOCRContent = apps.get_model(
         app_label='ocr', model_name='DocumentPageOCRContent'
     )
+    DocumentVersion = apps.get_model(
+        app_label='documents', model_name='DocumentVersion'
+    )
 
     lock_id = 'task_do_ocr_doc_version-%d' % document_version_pk
     try:
@@ -28,25 +41,179 @@ def task_do_ocr(self, document_version_pk):
         # than once concurrently
         lock = locking_backend.acquire_lock(name=lock_id, timeout=LOCK_EXPIRE)
         logger.debug('acquired lock: %s', lock_id)
-        document_version = None
-        try:
-            document_version = DocumentVersion.objects.get(
-                pk=document_version_pk
-            )
-            logger.info(
-                'Starting document OCR for document version: %s',
-                document_version
-            )
-            DocumentPageOCRContent.objects.process_document_version(
-                document_version=document_version
-            )
-        except OperationalError as exception:
-            logger.warning(
-                'OCR error for document version: %d; %s. Retrying.',
-                document_version_pk, exception
-            )
-            raise self.retry(exc=exception)
-        finally:
-            lock.release()
     except LockError:
         logger.debug('unable to obtain lock: %s' % lock_id)
+        return
+
+    try:
+        document_version = DocumentVersion.objects.get(
+            pk=document_version_pk
+        )
+        logger.info(
+            'Starting document OCR for document version: %s',
+            document_version
+        )
+        # Rasterize all the base page images in a single converter pass
+        # before fanning out the pages. Not done when pages with parsed
+        # text are skipped to avoid rasterizing them.
+        if not document_version.document.document_type.ocr_settings.skip_parsed_pages:
+            document_version.cache_page_images()
+        document_page_ids = list(
+            document_version.pages.values_list('pk', flat=True)
+        )
+    except OperationalError as exception:
+        lock.release()
+        logger.warning(
+            'OCR error for document version: %d; %s. Retrying.',
+            document_version_pk, exception
+        )
+        raise self.retry(exc=exception)
+    except DocumentVersion.DoesNotExist:
+        lock.release()
+        raise
+    except Exception as exception:
+        logger.error(
+            'OCR error for document version: %d; %s', document_version_pk,
+            exception
+        )
+        DocumentPageOCRContent.objects.finish_document_version(
+            document_version=document_version,
+            errors=(get_exception_text(exception=exception),)
+        )
+        lock.release()
+        return
+
+    lock_kwargs = {
+        'document_version_pk': document_version_pk, 'lock_id': lock_id,
+        'lock_token': lock.token
+    }
+    callback = task_do_ocr_finish.s(**lock_kwargs).on_error(
+        task_do_ocr_error.s(**lock_kwargs)
+    )
+
+    if not document_page_ids:
+        callback.apply_async(args=([],))
+        return
+
+    concurrency = max(
+        1, min(setting_ocr_page_concurrency.value, len(document_page_ids))
+    )
+
+    # Each chain passes the list of page errors accumulated so far to the
+    # next task and the chord callback receives the list of every chain.
+    header = []
+    for index in range(concurrency):
+        document_page_ids_chain = document_page_ids[index::concurrency]
+        header.append(
+            chain(
+                [
+                    task_do_ocr_page.s(
+                        [], document_page_pk=document_page_ids_chain[0],
+                        lock_id=lock_id, lock_token=lock.token
+                    )
+                ] + [
+                    task_do_ocr_page.s(
+                        document_page_pk=document_page_pk, lock_id=lock_id,
+                        lock_token=lock.token
+                    ) for document_page_pk in document_page_ids_chain[1:]
+                ]
+            )
+        )
+
+    chord(header=header, body=callback).apply_async()
+
+
+@app.task(bind=True, ignore_result=True)
+def task_do_ocr_error(
+    self, task_id, document_version_pk, lock_id, lock_token
+):
+    """
+    Errback of the page chord. Called with the id of the chord callback
+    when a page task fails permanently or its worker is lost and the
+    callback will not run.
+    """
+    DocumentVersion = apps.get_model(
+        app_label='documents', model_name='DocumentVersion'
+    )
+
+    logger.error(
+        'OCR of document version: %d did not complete; task: %s',
+        document_version_pk, task_id
+    )
+
+    try:
+        document_version = DocumentVersion.objects.get(
+            pk=document_version_pk
+        )
+        document_version.ocr_errors.create(
+            result='OCR did not complete. Some pages failed or their '
+            'worker was lost; task: {}'.format(task_id)
+        )
+    finally:
+        locking_backend.release_lock(name=lock_id, token=lock_token)
+
+
+@app.task(ignore_result=True)
+def task_do_ocr_finish(results, document_version_pk, lock_id, lock_token):
+    DocumentPageOCRContent = apps.get_model(
+        app_label='ocr', model_name='DocumentPageOCRContent'
+    )
+    DocumentVersion = apps.get_model(
+        app_label='documents', model_name='DocumentVersion'
+    )
+
+    try:
+        document_version = DocumentVersion.objects.get(
+            pk=document_version_pk
+        )
+        DocumentPageOCRContent.objects.finish_document_version(
+            document_version=document_version,
+            errors=list(itertools.chain.from_iterable(results))
+        )
+    finally:
+        locking_backend.release_lock(name=lock_id, token=lock_token)
+
+
+@app.task(bind=True, default_retry_delay=DO_OCR_RETRY_DELAY)
+def task_do_ocr_page(self, errors, document_page_pk, lock_id, lock_token):
+    """
+    OCR a single document page. Errors are appended to the list received
+    from the previous task of the chain instead of being raised to let
+    the rest of the pages complete. Raises LockError to stop the chord if
+    the lock of the document version expired and was acquired by another
+    OCR run.
+    """
+    DocumentPage = apps.get_model(
+        app_label='documents', model_name='DocumentPage'
+    )
+    DocumentPageOCRContent = apps.get_model(
+        app_label='ocr', model_name='DocumentPageOCRContent'
+    )
+
+    locking_backend.refresh_lock(
+        name=lock_id, token=lock_token, timeout=LOCK_EXPIRE
+    )
+
+    try:
+        document_page = DocumentPage.passthrough.get(pk=document_page_pk)
+        DocumentPageOCRContent.objects.process_document_page(
+            document_page=document_page
+        )
+    except OperationalError as exception:
+        logger.warning(
+            'OCR error for document page: %d; %s. Retrying.',
+            document_page_pk, exception
+        )
+        raise self.retry(exc=exception)
+    except Exception as exception:
+        logger.error(
+            'OCR error for document page: %d; %s', document_page_pk,
+            exception
+        )
+        errors = list(errors) + [
+            'Document page: %d; %s' % (
+                document_page_pk, get_exception_text(exception=exception)
+            )
+        ]
+
+    return errors
@@ -6,3 +6,7 @@ TEST_DOCUMENT_CONTENT_DEU_2 = 'Es bietet einen'
 
 TEST_OCR_INDEX_NODE_TEMPLATE = '{% if "mayan" in document.latest_version.ocr_content|join:" "|lower %}mayan{% endif %}'
 TEST_OCR_INDEX_NODE_TEMPLATE_LEVEL = 'mayan'
+TEST_PARSED_CONTENT = (
+    'Mayan EDMS is a free open source document management system. Its '
+    'main purpose is to store, introspect, and categorize files.'
+)
@@ -3,6 +3,7 @@ from rest_framework import status
 from mayan.apps.documents.tests.mixins import DocumentTestMixin
 from mayan.apps.rest_api.tests.base import BaseAPITestCase
 
+from ..literals import DEFAULT_PARSED_CONTENT_MINIMUM_LENGTH
 from ..permissions import (
     permission_document_type_ocr_setup, permission_ocr_document,
     permission_ocr_content_view
@@ -30,7 +31,13 @@ class DocumentTypeOCRSettingsAPIViewTestCase(
 
         response = self._request_document_type_ocr_settings_details_api_view()
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(response.data, {'auto_ocr': False})
+        self.assertEqual(
+            response.data, {
+                'auto_ocr': False,
+                'parsed_content_minimum_length': DEFAULT_PARSED_CONTENT_MINIMUM_LENGTH,
+                'skip_parsed_pages': False, 'skipped_page_count': 0
+            }
+        )
 
     def test_document_type_ocr_settings_patch_api_view_no_permission(self):
         response = self._request_document_type_ocr_settings_patch_api_view()
@@ -44,7 +51,7 @@ class DocumentTypeOCRSettingsAPIViewTestCase(
 
         response = self._request_document_type_ocr_settings_patch_api_view()
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(response.data, {'auto_ocr': True})
+        self.assertEqual(response.data['auto_ocr'], True)
 
     def test_document_type_ocr_settings_put_api_view_no_permission(self):
         response = self._request_document_type_ocr_settings_put_api_view()
@@ -58,7 +65,7 @@ class DocumentTypeOCRSettingsAPIViewTestCase(
 
         response = self._request_document_type_ocr_settings_put_api_view()
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(response.data, {'auto_ocr': True})
+        self.assertEqual(response.data['auto_ocr'], True)
 
 
 class OCRAPITestCase(DocumentTestMixin, BaseAPITestCase):
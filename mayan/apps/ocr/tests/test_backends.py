@@ -0,0 +1,95 @@
+import mock
+
+from mayan.apps.common.tests.base import BaseTestCase
+
+from ..backends.tesseract_pool import TesseractEnginePool
+from ..exceptions import TesseractPoolError
+
+TEST_LANGUAGE_1 = 'eng'
+TEST_LANGUAGE_2 = 'deu'
+
+
+class TesseractEnginePoolTestCase(BaseTestCase):
+    def setUp(self):
+        super(TesseractEnginePoolTestCase, self).setUp()
+        patcher = mock.patch(
+            'mayan.apps.ocr.backends.tesseract_pool.TesseractEngine',
+            autospec=True
+        )
+        self.mock_engine_class = patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.mock_engine_class.side_effect = self._get_mock_engine
+
+    def _execute(self, engine_pool, language=TEST_LANGUAGE_1):
+        return engine_pool.execute(image=None, language=language)
+
+    def _get_mock_engine(self, language, tessdata_path=None):
+        engine = mock.Mock(language=language, page_count=0)
+        engine.is_alive.return_value = True
+
+        def execute(**kwargs):
+            engine.page_count += 1
+            return 'text'
+
+        engine.execute.side_effect = execute
+        return engine
+
+    def test_engine_reuse(self):
+        engine_pool = TesseractEnginePool(size=1, maximum_pages=10)
+
+        self._execute(engine_pool=engine_pool)
+        self._execute(engine_pool=engine_pool)
+
+        self.assertEqual(self.mock_engine_class.call_count, 1)
+        self.assertEqual(len(engine_pool.idle_engines[TEST_LANGUAGE_1]), 1)
+
+    def test_engine_per_language(self):
+        engine_pool = TesseractEnginePool(size=1, maximum_pages=10)
+
+        self._execute(engine_pool=engine_pool, language=TEST_LANGUAGE_1)
+        self._execute(engine_pool=engine_pool, language=TEST_LANGUAGE_2)
+        self._execute(engine_pool=engine_pool, language=TEST_LANGUAGE_1)
+
+        self.assertEqual(self.mock_engine_class.call_count, 2)
+        self.assertEqual(engine_pool.engine_counts[TEST_LANGUAGE_1], 1)
+        self.assertEqual(engine_pool.engine_counts[TEST_LANGUAGE_2], 1)
+
+    def test_engine_recycle_after_maximum_pages(self):
+        engine_pool = TesseractEnginePool(size=1, maximum_pages=2)
+
+        self._execute(engine_pool=engine_pool)
+        self._execute(engine_pool=engine_pool)
+        self._execute(engine_pool=engine_pool)
+
+        self.assertEqual(self.mock_engine_class.call_count, 2)
+        self.assertEqual(engine_pool.engine_counts[TEST_LANGUAGE_1], 1)
+
+    def test_engine_recycle_after_error(self):
+        engine_pool = TesseractEnginePool(size=1, maximum_pages=10)
+        self._execute(engine_pool=engine_pool)
+
+        engine = engine_pool.idle_engines[TEST_LANGUAGE_1][0]
+        engine.execute.side_effect = Exception
+
+        with self.assertRaises(TesseractPoolError):
+            self._execute(engine_pool=engine_pool)
+
+        self.assertTrue(engine.stop.called)
+        self.assertEqual(engine_pool.engine_counts[TEST_LANGUAGE_1], 0)
+
+        self._execute(engine_pool=engine_pool)
+        self.assertEqual(self.mock_engine_class.call_count, 2)
+
+    def test_engine_recycle_after_failed_health_check(self):
+        engine_pool = TesseractEnginePool(size=1, maximum_pages=10)
+        self._execute(engine_pool=engine_pool)
+
+        engine = engine_pool.idle_engines[TEST_LANGUAGE_1][0]
+        engine.is_alive.return_value = False
+
+        self._execute(engine_pool=engine_pool)
+
+        self.assertTrue(engine.stop.called)
+        self.assertEqual(self.mock_engine_class.call_count, 2)
+        self.assertEqual(engine_pool.engine_counts[TEST_LANGUAGE_1], 1)
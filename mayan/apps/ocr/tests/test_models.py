@@ -1,12 +1,23 @@
+import mock
+
 from django.test import override_settings
 
 from mayan.apps.common.tests.base import BaseTestCase
+from mayan.apps.document_parsing.models import DocumentPageContent
 from mayan.apps.documents.tests.mixins import DocumentTestMixin
-from mayan.apps.documents.tests.literals import TEST_DEU_DOCUMENT_PATH
+from mayan.apps.documents.tests.literals import (
+    TEST_DEU_DOCUMENT_PATH, TEST_MULTI_PAGE_TIFF
+)
+from mayan.apps.lock_manager.exceptions import LockError
+from mayan.apps.lock_manager.runtime import locking_backend
+
+from ..literals import OCR_CONTENT_SOURCE_OCR, OCR_CONTENT_SOURCE_PARSING
+from ..runtime import ocr_backend
+from ..tasks import task_do_ocr, task_do_ocr_error, task_do_ocr_page
 
 from .literals import (
     TEST_DOCUMENT_CONTENT, TEST_DOCUMENT_CONTENT_DEU_1,
-    TEST_DOCUMENT_CONTENT_DEU_2
+    TEST_DOCUMENT_CONTENT_DEU_2, TEST_PARSED_CONTENT
 )
 
 
@@ -46,3 +57,151 @@ class GermanOCRSupportTestCase(DocumentTestMixin, BaseTestCase):
         self.assertTrue(
             TEST_DOCUMENT_CONTENT_DEU_2 in content
         )
+
+
+@override_settings(OCR_AUTO_OCR=False, OCR_PAGE_CONCURRENCY=2)
+class DocumentVersionOCRTaskTestCase(DocumentTestMixin, BaseTestCase):
+    test_document_filename = TEST_MULTI_PAGE_TIFF
+
+    def _execute_ocr_task(self):
+        task_do_ocr.apply_async(
+            kwargs={
+                'document_version_pk': self.test_document.latest_version.pk
+            }
+        )
+
+    def _assert_lock_released(self):
+        lock = locking_backend.acquire_lock(name=self._get_lock_id())
+        lock.release()
+
+    def _get_lock_id(self):
+        return 'task_do_ocr_doc_version-%d' % self.test_document.latest_version.pk
+
+    def test_document_version_ocr_all_pages(self):
+        with mock.patch.object(ocr_backend, 'execute', return_value=TEST_DOCUMENT_CONTENT):
+            self._execute_ocr_task()
+
+        self.assertEqual(
+            self.test_document.pages.filter(
+                ocr_content__content=TEST_DOCUMENT_CONTENT
+            ).count(), self.test_document.pages.count()
+        )
+        self.assertEqual(
+            self.test_document.latest_version.ocr_errors.count(), 0
+        )
+        self._assert_lock_released()
+
+    def test_document_version_ocr_page_error(self):
+        with mock.patch.object(ocr_backend, 'execute', side_effect=[TEST_DOCUMENT_CONTENT, Exception]):
+            self._execute_ocr_task()
+
+        self.assertEqual(
+            self.test_document.pages.filter(
+                ocr_content__content=TEST_DOCUMENT_CONTENT
+            ).count(), 1
+        )
+        self.assertEqual(
+            self.test_document.latest_version.ocr_errors.count(), 1
+        )
+        self._assert_lock_released()
+
+    def test_document_version_ocr_chord_error(self):
+        lock = locking_backend.acquire_lock(name=self._get_lock_id())
+
+        task_do_ocr_error.apply_async(
+            args=('test-task-id',), kwargs={
+                'document_version_pk': self.test_document.latest_version.pk,
+                'lock_id': self._get_lock_id(), 'lock_token': lock.token
+            }
+        )
+
+        self.assertEqual(
+            self.test_document.latest_version.ocr_errors.count(), 1
+        )
+        self._assert_lock_released()
+
+    def test_document_page_ocr_lost_lock(self):
+        lock = locking_backend.acquire_lock(name=self._get_lock_id())
+
+        with mock.patch.object(ocr_backend, 'execute', return_value=TEST_DOCUMENT_CONTENT) as mock_execute:
+            with self.assertRaises(expected_exception=LockError):
+                task_do_ocr_page.apply_async(
+                    args=([],), kwargs={
+                        'document_page_pk': self.test_document.pages.first().pk,
+                        'lock_id': self._get_lock_id(),
+                        'lock_token': 'lost'
+                    }
+                )
+
+        self.assertFalse(mock_execute.called)
+
+        # Cleanup
+        lock.release()
+
+
+@override_settings(OCR_AUTO_OCR=False)
+class DocumentPageOCRSkipParsedTestCase(DocumentTestMixin, BaseTestCase):
+    def setUp(self):
+        super(DocumentPageOCRSkipParsedTestCase, self).setUp()
+        self.test_document_page = self.test_document.pages.first()
+        ocr_settings = self.test_document_type.ocr_settings
+        ocr_settings.skip_parsed_pages = True
+        ocr_settings.save()
+
+    def _create_test_parsed_content(self, content):
+        DocumentPageContent.objects.update_or_create(
+            document_page=self.test_document_page, defaults={
+                'content': content
+            }
+        )
+
+    def _execute_ocr_task(self):
+        with mock.patch.object(ocr_backend, 'execute', return_value=TEST_DOCUMENT_CONTENT) as self.mock_execute:
+            task_do_ocr.apply_async(
+                kwargs={
+                    'document_version_pk': self.test_document.latest_version.pk
+                }
+            )
+
+    def test_page_with_parsed_content(self):
+        self._create_test_parsed_content(content=TEST_PARSED_CONTENT)
+        self._execute_ocr_task()
+
+        self.assertFalse(self.mock_execute.called)
+        self.assertEqual(
+            self.test_document_page.ocr_content.content, TEST_PARSED_CONTENT
+        )
+        self.assertEqual(
+            self.test_document_page.ocr_content.source,
+            OCR_CONTENT_SOURCE_PARSING
+        )
+        self.assertEqual(
+            self.test_document_type.ocr_settings.get_skipped_page_count(), 1
+        )
+
+    def test_page_with_short_parsed_content(self):
+        self._create_test_parsed_content(content=TEST_PARSED_CONTENT[:10])
+        self._execute_ocr_task()
+
+        self.assertTrue(self.mock_execute.called)
+        self.assertEqual(
+            self.test_document_page.ocr_content.source,
+            OCR_CONTENT_SOURCE_OCR
+        )
+        self.assertEqual(
+            self.test_document_type.ocr_settings.get_skipped_page_count(), 0
+        )
+
+    def test_page_with_parsed_content_skip_disabled(self):
+        ocr_settings = self.test_document_type.ocr_settings
+        ocr_settings.skip_parsed_pages = False
+        ocr_settings.save()
+
+        self._create_test_parsed_content(content=TEST_PARSED_CONTENT)
+        self._execute_ocr_task()
+
+        self.assertTrue(self.mock_execute.called)
+        self.assertEqual(
+            self.test_document_page.ocr_content.content,
+            TEST_DOCUMENT_CONTENT
+        )
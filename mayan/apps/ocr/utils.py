@@ -1,7 +1,26 @@
+import sys
+import traceback
+
 from django.apps import apps
+from django.conf import settings
 from django.utils.encoding import force_text
 
 
+def get_exception_text(exception):
+    """
+    Return the text stored as the result of an OCR error. Includes the
+    traceback when DEBUG is enabled. Must be called while the exception is
+    being handled.
+    """
+    if settings.DEBUG:
+        type, value, tb = sys.exc_info()
+        result = ['%s: %s' % (type.__name__, value)]
+        result.extend(traceback.format_tb(tb))
+        return '\n'.join(result)
+    else:
+        return force_text(exception)
+
+
 def get_instance_ocr_content(instance):
     DocumentPageOCRContent = apps.get_model(
         app_label='ocr', model_name='DocumentPageOCRContent'
@@ -188,7 +188,9 @@ class DocumentTypeSettingsEditView(ExternalObjectMixin, SingleObjectEditView):
     external_object_class = DocumentType
     external_object_permission = permission_document_type_ocr_setup
     external_object_pk_url_kwarg = 'document_type_id'
-    fields = ('auto_ocr',)
+    fields = (
+        'auto_ocr', 'skip_parsed_pages', 'parsed_content_minimum_length'
+    )
     post_action_redirect = reverse_lazy(
         viewname='documents:document_type_list'
     )
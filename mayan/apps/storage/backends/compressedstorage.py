@@ -7,7 +7,6 @@ except ImportError:
     COMPRESSION = zipfile.ZIP_STORED
 
 from django.core.files.base import ContentFile
-from django.utils.encoding import force_text
 
 from ..classes import BufferedFile, PassthroughStorage
 
@@ -18,7 +17,6 @@ class BufferedZipFile(BufferedFile):
     def __init__(self, *args, **kwargs):
         self.member_name = kwargs.pop('member_name')
         super(BufferedZipFile, self).__init__(*args, **kwargs)
-        self.binary_mode = 'b' in self.mode
         self.zip_container_file_object = zipfile.ZipFile(
             file=self.file_object
         )
@@ -29,16 +27,16 @@ class BufferedZipFile(BufferedFile):
     def close(self):
         self.zip_file_object.close()
         self.zip_container_file_object.close()
-        self.file_object.close()
+        super(BufferedZipFile, self).close()
 
     def _get_file_object_chunk(self):
-        chunk = self.zip_file_object.read(ZIP_CHUNK_SIZE)
+        return self.zip_file_object.read(ZIP_CHUNK_SIZE)
 
-        if chunk:
-            if self.binary_mode:
-                return chunk
-            else:
-                return force_text(chunk)
+    def _rewind(self):
+        self.zip_file_object.close()
+        self.zip_file_object = self.zip_container_file_object.open(
+            name=self.member_name
+        )
 
 
 class ZipCompressedPassthroughStorage(PassthroughStorage):
@@ -1,57 +1,239 @@
+import os
+import struct
+import threading
+
 from Crypto.Cipher import AES
 from Crypto.Hash import SHA256
 from Crypto.Protocol.KDF import PBKDF2
+from Crypto.Random import get_random_bytes
 from Crypto.Util.Padding import pad, unpad
 
 from django.conf import settings
-from django.core.files.base import ContentFile
-from django.utils.encoding import force_text
+from django.core.files.base import ContentFile, File
+from django.utils.encoding import force_bytes, force_text
 
 from ..classes import BufferedFile, PassthroughStorage
 
 from .literals import (
     ENCRYPTION_FILE_CHUNK_SIZE, ENCRYPTION_KEY_DERIVATION_ITERATIONS,
-    ENCRYPTION_KEY_SIZE
+    ENCRYPTION_KEY_SIZE, SEEKABLE_ENCRYPTION_CHUNK_SIZE,
+    SEEKABLE_ENCRYPTION_HEADER_FORMAT, SEEKABLE_ENCRYPTION_HEADER_MAGIC,
+    SEEKABLE_ENCRYPTION_TAG_SIZE, SEEKABLE_ENCRYPTION_VERSION
+)
+
+SEEKABLE_ENCRYPTION_HEADER_SIZE = struct.calcsize(
+    SEEKABLE_ENCRYPTION_HEADER_FORMAT
 )
 
 
+def get_seekable_chunk_cipher(key, header, index, is_last):
+    """
+    Return the cipher of a chunk of the seekable format. The nonce is
+    made of the random file nonce and the chunk index. The header, the
+    index and the last chunk flag are authenticated to detect swapped,
+    reordered or truncated chunks.
+    """
+    nonce_prefix = header[-8:]
+    cipher = AES.new(
+        key=key, mode=AES.MODE_GCM,
+        nonce=nonce_prefix + struct.pack('>I', index),
+        mac_len=SEEKABLE_ENCRYPTION_TAG_SIZE
+    )
+    cipher.update(header + struct.pack('>IB', index, is_last))
+    return cipher
+
+
+def read_full(file_object, size):
+    """
+    Read until size bytes are returned or the end of the file is reached.
+    """
+    result = []
+    remaining = size
+
+    while remaining:
+        data = file_object.read(remaining)
+        if not data:
+            break
+
+        data = force_bytes(data)
+        result.append(data)
+        remaining -= len(data)
+
+    return b''.join(result)
+
+
 class BufferedEncryptedFile(BufferedFile):
     def __init__(self, *args, **kwargs):
         self.key = kwargs.pop('key')
 
         super(BufferedEncryptedFile, self).__init__(*args, **kwargs)
+        self._start_cipher()
+
+    def _get_file_object_chunk(self):
+        # Each chunk is padded when saved, which adds up to a block to its
+        # size.
+        chunk = self.file_object.read(
+            ENCRYPTION_FILE_CHUNK_SIZE + AES.block_size
+        )
+
+        if chunk:
+            return unpad(
+                padded_data=self.cipher.decrypt(chunk),
+                block_size=AES.block_size
+            )
 
+    def _rewind(self):
+        self.file_object.seek(0)
+        self._start_cipher()
+
+    def _start_cipher(self):
         self.initial_vector = self.file_object.read(16)
         self.cipher = AES.new(
             key=self.key, mode=AES.MODE_CBC, iv=self.initial_vector
         )
-        self.binary_mode = 'b' in self.mode
 
-    def _get_file_object_chunk(self):
-        chunk = self.file_object.read(ENCRYPTION_FILE_CHUNK_SIZE)
 
-        if chunk:
-            data = unpad(
-                padded_data=self.cipher.decrypt(chunk),
-                block_size=AES.block_size
+class SeekableEncryptedFile(File):
+    """
+    Read only file of the seekable encrypted format. Only the chunks that
+    contain the requested data are read and decrypted, making seeks and
+    range reads independent of the file size.
+    """
+    def __init__(self, file_object, key, mode, name=None):
+        self.file_object = file_object
+        self.key = key
+        self.mode = mode
+        self.name = name
+        self.binary_mode = 'b' in mode
+
+        self.header = read_full(
+            file_object=file_object, size=SEEKABLE_ENCRYPTION_HEADER_SIZE
+        )
+        magic, version, self.chunk_size, nonce_prefix = struct.unpack(
+            SEEKABLE_ENCRYPTION_HEADER_FORMAT, self.header
+        )
+        if magic != SEEKABLE_ENCRYPTION_HEADER_MAGIC or version != SEEKABLE_ENCRYPTION_VERSION:
+            raise ValueError('Unknown seekable encrypted file format.')
+
+        self.encrypted_chunk_size = self.chunk_size + SEEKABLE_ENCRYPTION_TAG_SIZE
+
+        file_object.seek(0, os.SEEK_END)
+        body_size = file_object.tell() - SEEKABLE_ENCRYPTION_HEADER_SIZE
+        # Even empty files have one chunk holding only the tag.
+        self.chunk_count = max(
+            1, -(-body_size // self.encrypted_chunk_size)
+        )
+        self.size = body_size - self.chunk_count * SEEKABLE_ENCRYPTION_TAG_SIZE
+
+        self.chunk_data = None
+        self.chunk_index = None
+        self.position = 0
+
+    def close(self):
+        self.file_object.close()
+
+    @property
+    def closed(self):
+        return self.file_object.closed
+
+    def get_chunk(self, index):
+        if index != self.chunk_index:
+            self.file_object.seek(
+                SEEKABLE_ENCRYPTION_HEADER_SIZE + index * self.encrypted_chunk_size
             )
-            if self.binary_mode:
-                return data
-            else:
-                return force_text(data)
+            data = read_full(
+                file_object=self.file_object, size=self.encrypted_chunk_size
+            )
+            cipher = get_seekable_chunk_cipher(
+                header=self.header, index=index,
+                is_last=index == self.chunk_count - 1, key=self.key
+            )
+            self.chunk_data = cipher.decrypt_and_verify(
+                ciphertext=data[:-SEEKABLE_ENCRYPTION_TAG_SIZE],
+                received_mac_tag=data[-SEEKABLE_ENCRYPTION_TAG_SIZE:]
+            )
+            self.chunk_index = index
+
+        return self.chunk_data
+
+    def read(self, size=None):
+        if size is None or size < 0:
+            size = self.size - self.position
+
+        size = min(size, self.size - self.position)
+        result = []
+
+        while size > 0:
+            index, offset = divmod(self.position, self.chunk_size)
+            data = self.get_chunk(index=index)[offset:offset + size]
+            result.append(data)
+            self.position += len(data)
+            size -= len(data)
+
+        data = b''.join(result)
+
+        if self.binary_mode:
+            return data
+        else:
+            return force_text(data)
+
+    def seek(self, offset, whence=os.SEEK_SET):
+        if whence == os.SEEK_CUR:
+            offset += self.position
+        elif whence == os.SEEK_END:
+            offset += self.size
+
+        if offset < 0:
+            raise ValueError('Negative seek position {}'.format(offset))
+
+        self.position = offset
+        return self.position
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self.position
 
 
 class EncryptedPassthroughStorage(PassthroughStorage):
+    _key_cache = {}
+    _key_cache_lock = threading.Lock()
+
+    @classmethod
+    def get_key(cls, password):
+        """
+        Derive the encryption key from the password. The key derivation is
+        expensive by design, keep the derived keys per process.
+        """
+        cache_key = (
+            password, settings.SECRET_KEY,
+            ENCRYPTION_KEY_DERIVATION_ITERATIONS, ENCRYPTION_KEY_SIZE
+        )
+
+        with cls._key_cache_lock:
+            if cache_key not in cls._key_cache:
+                cls._key_cache[cache_key] = PBKDF2(
+                    count=ENCRYPTION_KEY_DERIVATION_ITERATIONS,
+                    dkLen=ENCRYPTION_KEY_SIZE,
+                    hmac_hash_module=SHA256,
+                    password=password,
+                    salt=settings.SECRET_KEY
+                )
+
+            return cls._key_cache[cache_key]
+
+    @classmethod
+    def invalidate_cache(cls):
+        with cls._key_cache_lock:
+            cls._key_cache.clear()
+
+        super(EncryptedPassthroughStorage, cls).invalidate_cache()
+
     def __init__(self, *args, **kwargs):
         password = kwargs.pop('password')
         super(EncryptedPassthroughStorage, self).__init__(*args, **kwargs)
-        self.key = PBKDF2(
-            count=ENCRYPTION_KEY_DERIVATION_ITERATIONS,
-            dkLen=ENCRYPTION_KEY_SIZE,
-            hmac_hash_module=SHA256,
-            password=password,
-            salt=settings.SECRET_KEY
-        )
+        self.key = self.get_key(password=password)
 
     def open(self, name, mode='rb', _direct=False):
         next_kwargs = {'name': name}
@@ -110,3 +292,101 @@ class EncryptedPassthroughStorage(PassthroughStorage):
                     file_object.write(cipher.encrypt(chunk))
 
             return name
+
+
+class SeekableEncryptedPassthroughStorage(EncryptedPassthroughStorage):
+    """
+    Encrypted storage made of independently authenticated fixed size
+    chunks. Files stored with the previous sequential format are still
+    readable and are converted when processed with the storage_process
+    command using the --upgrade option.
+    """
+    def open(self, name, mode='rb', _direct=False):
+        if _direct:
+            return super(SeekableEncryptedPassthroughStorage, self).open(
+                name=name, mode=mode, _direct=_direct
+            )
+        else:
+            # Mode is always 'rb' when reading the encrypted file
+            storage_file = self._call_backend_method(
+                method_name='open', kwargs={'mode': 'rb', 'name': name}
+            )
+            magic = read_full(
+                file_object=storage_file,
+                size=len(SEEKABLE_ENCRYPTION_HEADER_MAGIC)
+            )
+            storage_file.seek(0)
+
+            if magic == SEEKABLE_ENCRYPTION_HEADER_MAGIC:
+                return SeekableEncryptedFile(
+                    file_object=storage_file, key=self.key, mode=mode,
+                    name=name
+                )
+            else:
+                # File stored with the sequential format.
+                return BufferedEncryptedFile(
+                    file_object=storage_file, key=self.key, mode=mode
+                )
+
+    def save(self, name, content, max_length=None, _direct=False):
+        if _direct:
+            return super(SeekableEncryptedPassthroughStorage, self).save(
+                content=content, max_length=max_length, name=name,
+                _direct=_direct
+            )
+        else:
+            header = struct.pack(
+                SEEKABLE_ENCRYPTION_HEADER_FORMAT,
+                SEEKABLE_ENCRYPTION_HEADER_MAGIC, SEEKABLE_ENCRYPTION_VERSION,
+                SEEKABLE_ENCRYPTION_CHUNK_SIZE, get_random_bytes(8)
+            )
+            name = self._call_backend_method(
+                method_name='save', kwargs={
+                    'content': ContentFile(content=''),
+                    'max_length': max_length, 'name': name
+                }
+            )
+            with self._call_backend_method(
+                method_name='open', kwargs={
+                    'name': name, 'mode': 'wb'
+                }
+            ) as file_object:
+                file_object.write(header)
+
+                index = 0
+                chunk = read_full(
+                    file_object=content, size=SEEKABLE_ENCRYPTION_CHUNK_SIZE
+                )
+                while True:
+                    # Read ahead to know if this is the last chunk.
+                    next_chunk = read_full(
+                        file_object=content,
+                        size=SEEKABLE_ENCRYPTION_CHUNK_SIZE
+                    )
+                    is_last = not next_chunk
+                    cipher = get_seekable_chunk_cipher(
+                        header=header, index=index, is_last=is_last,
+                        key=self.key
+                    )
+                    ciphertext, tag = cipher.encrypt_and_digest(
+                        plaintext=chunk
+                    )
+                    file_object.write(ciphertext)
+                    file_object.write(tag)
+
+                    if is_last:
+                        break
+
+                    chunk = next_chunk
+                    index += 1
+
+            return name
+
+    def size(self, name):
+        with self.open(name=name) as file_object:
+            if isinstance(file_object, SeekableEncryptedFile):
+                return file_object.size
+
+        return super(SeekableEncryptedPassthroughStorage, self).size(
+            name=name
+        )
@@ -2,5 +2,13 @@ ENCRYPTION_FILE_CHUNK_SIZE = 64 * 1024  # 64K
 ENCRYPTION_KEY_DERIVATION_ITERATIONS = 100000
 ENCRYPTION_KEY_SIZE = 32
 
+# Seekable encrypted file format. The header is followed by fixed size
+# chunks, each encrypted and authenticated independently with AES-GCM.
+SEEKABLE_ENCRYPTION_CHUNK_SIZE = 64 * 1024  # 64K
+SEEKABLE_ENCRYPTION_HEADER_FORMAT = '>8sBI8s'
+SEEKABLE_ENCRYPTION_HEADER_MAGIC = b'MAYANSEC'
+SEEKABLE_ENCRYPTION_TAG_SIZE = 16
+SEEKABLE_ENCRYPTION_VERSION = 1
+
 ZIP_CHUNK_SIZE = 64 * 1024  # 64K
 ZIP_MEMBER_FILENAME = 'mayan_file'
@@ -1,79 +1,268 @@
+from io import SEEK_CUR, SEEK_END, SEEK_SET
+import json
 import logging
+import os
+import tempfile
+import threading
 
 from django.core.files.base import File
 from django.core.files.storage import Storage
 from django.utils.module_loading import import_string
-from django.utils.six import BytesIO, StringIO, raise_from
+from django.utils.encoding import force_text
+from django.utils.six import raise_from
 from django.utils.translation import ugettext_lazy as _
 
 from mayan.apps.common.class_mixins import ModuleLoaderMixin
 
-from .literals import DEFAULT_STORAGE_BACKEND
+from .literals import (
+    DEFAULT_STORAGE_BACKEND, STORAGE_TIER_FILE_NAME,
+    STORAGE_TIER_FILE_NAME_PREFIX, STORAGE_TIER_NAME
+)
+from .settings import (
+    setting_buffered_file_spool_size, setting_temporary_directory
+)
 
 logger = logging.getLogger(name=__name__)
 
 
 class BufferedFile(File):
+    """
+    Base class for files whose content is decoded from another file one
+    chunk at a time. Subclasses implement _get_file_object_chunk to return
+    the next decoded chunk as bytes or None when there is no more data and
+    _rewind to restart the decoding from the start of the source file.
+
+    Forward reads and seeks keep only the decoded data that was not read
+    yet. The first backward seek, or seek relative to the end, restarts
+    the decoding and from then on the decoded data is kept in a spool to
+    serve the following seeks. The spool moves from memory to a temporary
+    file when it grows past STORAGE_BUFFERED_FILE_SPOOL_SIZE.
+    """
     def __init__(self, file_object, mode, name=None):
         self.file_object = file_object
         self.mode = mode
-        if 'b' in mode:
-            self.stream = BytesIO()
-        else:
-            self.stream = StringIO()
+        self.name = name
+        self.binary_mode = 'b' in mode
+        self.buffer = b''
+        self.buffer_position = 0
+        self.is_exhausted = False
+        self.position = 0
+        self.stream = None
+        self.stream_size = 0
+
+    def _discard(self):
+        """
+        Drop the buffered data before the current position.
+        """
+        discard_size = min(
+            self.position, self.stream_size
+        ) - self.buffer_position
+
+        if discard_size > 0:
+            self.buffer = self.buffer[discard_size:]
+            self.buffer_position += discard_size
+
+    def _fill(self, size=None):
+        """
+        Decode chunks until at least size bytes are decoded or until the
+        end of the source file when size is None.
+        """
+        while not self.is_exhausted and (size is None or size > self.stream_size):
+            chunk = self._get_file_object_chunk()
+            if chunk:
+                if self.stream is None:
+                    self._discard()
+                    self.buffer += chunk
+                else:
+                    self.stream.seek(0, SEEK_END)
+                    self.stream.write(chunk)
+
+                self.stream_size += len(chunk)
+            else:
+                self.is_exhausted = True
+
+    def _rewind(self):
+        raise NotImplementedError(
+            'Class must provide a ._rewind() method that restarts the '
+            'decoding from the start of the source file.'
+        )
 
+    def _start_spool(self):
+        if self.stream_size:
+            self._rewind()
+
+        self.buffer = b''
+        self.buffer_position = 0
+        self.is_exhausted = False
+        self.stream = tempfile.SpooledTemporaryFile(
+            dir=setting_temporary_directory.value,
+            max_size=setting_buffered_file_spool_size.value
+        )
         self.stream_size = 0
 
     def close(self):
         self.file_object.close()
-        self.stream.close()
+        if self.stream is not None:
+            self.stream.close()
+
+    @property
+    def closed(self):
+        return self.file_object.closed
 
     def read(self, size=None):
-        if size is None:
-            size = -1
-
-        if size == -1 or size > self.stream_size:
-            while True:
-                position = self.stream.tell()
-                chunk = self._get_file_object_chunk()
-                if chunk:
-                    self.stream_size += len(chunk)
-                    self.stream.write(chunk)
-                    self.stream.seek(position)
-                    if self.stream_size >= size and size != -1:
-                        break
-                else:
-                    break
+        if size is None or size < 0:
+            self._fill()
+            end = self.stream_size
+        else:
+            self._fill(size=self.position + size)
+            end = min(self.position + size, self.stream_size)
+
+        if end > self.position:
+            if self.stream is None:
+                self._discard()
+                data = self.buffer[:end - self.position]
+                self.position = end
+                self._discard()
+            else:
+                self.stream.seek(self.position)
+                data = self.stream.read(end - self.position)
+                self.position = end
+        else:
+            data = b''
 
-        if size:
-            read_size = min(size, self.stream_size)
-            self.stream_size -= read_size
+        if self.binary_mode:
+            return data
         else:
-            read_size = None
+            return force_text(data)
+
+    def readable(self):
+        return True
+
+    def seek(self, offset, whence=SEEK_SET):
+        if whence == SEEK_CUR:
+            offset += self.position
+        elif whence == SEEK_END:
+            if self.stream is None and not self.is_exhausted:
+                self._start_spool()
+
+            self._fill()
+            offset += self.stream_size
+
+        if offset < 0:
+            raise ValueError('Negative seek position {}'.format(offset))
+
+        if self.stream is None and offset < self.buffer_position:
+            self._start_spool()
+
+        self.position = offset
+        return self.position
+
+    def seekable(self):
+        return True
 
-        return self.stream.read(read_size)
+    @property
+    def size(self):
+        if self.stream is None and not self.is_exhausted:
+            self._start_spool()
+
+        self._fill()
+        return self.stream_size
+
+    def tell(self):
+        return self.position
 
 
 class DefinedStorage(ModuleLoaderMixin, object):
     _loader_module_name = 'storages'
     _registry = {}
+    _storage_instances = {}
+    _storage_instances_lock = threading.Lock()
 
     @classmethod
     def get(cls, name):
         return cls._registry[name]
 
+    @classmethod
+    def initialize(cls):
+        super(DefinedStorage, cls).initialize()
+        cls.invalidate_cache()
+
+    @classmethod
+    def invalidate_cache(cls):
+        """
+        Discard the memoized storage instances and the values derived by
+        the storage backends, like encryption keys. Must be called after
+        changing the storage settings at runtime.
+        """
+        with cls._storage_instances_lock:
+            cls._storage_instances.clear()
+
+        PassthroughStorage.invalidate_cache()
+
     def __init__(self, dotted_path, label, name, kwargs, error_message=None):
         self.dotted_path = dotted_path
         self.error_message = error_message
         self.label = label
         self.name = name
         self.kwargs = kwargs or {}
+        self.tiers = {}
         self.__class__._registry[name] = self
 
     def __eq__(self, other):
         return True
 
+    def get_cache_key(self):
+        """
+        Storage instances are memoized for each combination of backend and
+        arguments. Arguments are serialized to catch changes made to the
+        dictionary after the defined storage was created.
+        """
+        return (
+            self.name, self.dotted_path, json.dumps(
+                obj=self.kwargs, default=force_text, sort_keys=True
+            )
+        )
+
+    def get_file_defined_storage(self, file_name):
+        """
+        Return the defined storage holding a file, either this one or one
+        of its tiers, and the name of the file inside of it.
+        """
+        if file_name and file_name.startswith(STORAGE_TIER_FILE_NAME_PREFIX):
+            tier_name, separator, tier_file_name = file_name[
+                len(STORAGE_TIER_FILE_NAME_PREFIX):
+            ].partition('/')
+
+            try:
+                return self.tiers[tier_name], tier_file_name
+            except KeyError:
+                logger.warning(
+                    'File "%s" of storage "%s" belongs to unknown tier '
+                    '"%s".', file_name, self.name, tier_name
+                )
+
+        return self, file_name
+
+    def get_file_name(self, file_name):
+        """
+        Return the name used by the models to reference a file of this
+        defined storage.
+        """
+        return file_name
+
     def get_storage_instance(self):
+        cache_key = self.get_cache_key()
+
+        try:
+            return self.__class__._storage_instances[cache_key]
+        except KeyError:
+            with self.__class__._storage_instances_lock:
+                if cache_key not in self.__class__._storage_instances:
+                    self.__class__._storage_instances[cache_key] = self._get_storage_instance()
+
+                return self.__class__._storage_instances[cache_key]
+
+    def _get_storage_instance(self):
         try:
             return self.get_storage_subclass()(**self.kwargs)
         except Exception as exception:
@@ -124,6 +313,60 @@ class DefinedStorage(ModuleLoaderMixin, object):
 
         return DynamicStorageSubclass
 
+    def get_usage(self):
+        """
+        Return the number of files and their total size by walking the
+        storage. The storage backend must implement listdir.
+        """
+        storage_instance = self.get_storage_instance()
+        file_count = 0
+        size = 0
+
+        paths = ['']
+        while paths:
+            path = paths.pop()
+            directories, files = storage_instance.listdir(path)
+
+            for directory in directories:
+                paths.append(os.path.join(path, directory))
+
+            for file_name in files:
+                file_count += 1
+                size += storage_instance.size(os.path.join(path, file_name))
+
+        return {'file_count': file_count, 'size': size}
+
+
+class DefinedStorageTier(DefinedStorage):
+    """
+    Defined storage holding part of the files of another defined storage,
+    for example the files that are seldom read on slower and cheaper
+    disks. The names of the files of a tier carry the tier name as a
+    prefix. The lazy storage of the parent defined storage uses it to
+    route the file operations, which keeps the file references of the
+    models valid when files move between tiers. The policy is a
+    dictionary interpreted by the app that owns the files.
+    """
+    def __init__(self, defined_storage_name, tier_name, policy=None, **kwargs):
+        self.defined_storage = DefinedStorage.get(name=defined_storage_name)
+        self.policy = policy or {}
+        self.tier_name = tier_name
+        super(DefinedStorageTier, self).__init__(
+            name=STORAGE_TIER_NAME.format(
+                defined_storage_name=defined_storage_name, tier_name=tier_name
+            ), **kwargs
+        )
+        self.defined_storage.tiers[tier_name] = self
+
+    def get_file_name(self, file_name):
+        return STORAGE_TIER_FILE_NAME.format(
+            file_name=file_name, tier_name=self.tier_name
+        )
+
+    def unregister(self):
+        self.defined_storage.tiers.pop(self.tier_name, None)
+        self.__class__._registry.pop(self.name, None)
+
 
 def defined_storage_proxy_method(method_name):
     def inner_function(self, *args, **kwargs):
@@ -134,20 +377,42 @@ def defined_storage_proxy_method(method_name):
     return inner_function
 
 
+def defined_storage_tier_proxy_method(method_name):
+    """
+    Proxy a method whose first argument is a file name to the storage of
+    the tier holding the file.
+    """
+    def inner_function(self, name, *args, **kwargs):
+        defined_storage, file_name = DefinedStorage.get(
+            name=self.name
+        ).get_file_defined_storage(file_name=name)
+
+        result = getattr(
+            defined_storage.get_storage_instance(), method_name
+        )(file_name, *args, **kwargs)
+
+        if method_name == 'save':
+            return defined_storage.get_file_name(file_name=result)
+        else:
+            return result
+
+    return inner_function
+
+
 class DefinedStorageLazy(object):
     def __init__(self, name):
         self.name = name
         super(DefinedStorageLazy, self).__init__()
 
-    delete = defined_storage_proxy_method(method_name='delete')
-    exists = defined_storage_proxy_method(method_name='exists')
+    delete = defined_storage_tier_proxy_method(method_name='delete')
+    exists = defined_storage_tier_proxy_method(method_name='exists')
     generate_filename = defined_storage_proxy_method(
         method_name='generate_filename'
     )
-    open = defined_storage_proxy_method(method_name='open')
-    path = defined_storage_proxy_method(method_name='path')
-    save = defined_storage_proxy_method(method_name='save')
-    size = defined_storage_proxy_method(method_name='size')
+    open = defined_storage_tier_proxy_method(method_name='open')
+    path = defined_storage_tier_proxy_method(method_name='path')
+    save = defined_storage_tier_proxy_method(method_name='save')
+    size = defined_storage_tier_proxy_method(method_name='size')
 
 
 class FakeStorageSubclass(object):
@@ -160,6 +425,16 @@ class FakeStorageSubclass(object):
 
 
 class PassthroughStorage(Storage):
+    @classmethod
+    def invalidate_cache(cls):
+        """
+        Clear the values memoized by the passthrough storage subclasses.
+        Subclasses that cache values override this method and call it
+        afterwards.
+        """
+        for subclass in cls.__subclasses__():
+            subclass.invalidate_cache()
+
     def __init__(self, *args, **kwargs):
         logger.debug(
             'initializing passthrought storage with: %s, %s', args, kwargs
@@ -189,6 +464,9 @@ class PassthroughStorage(Storage):
     def exists(self, *args, **kwargs):
         return self.next_storage_backend.exists(*args, **kwargs)
 
+    def listdir(self, *args, **kwargs):
+        return self.next_storage_backend.listdir(*args, **kwargs)
+
     def path(self, *args, **kwargs):
         return self.next_storage_backend.path(*args, **kwargs)
 
@@ -0,0 +1,13 @@
+class BaseStorageException(Exception):
+    """
+    Base exception for the storage app
+    """
+    pass
+
+
+class StorageProcessVerificationError(BaseStorageException):
+    """
+    The content of a processed file doesn't match the content of the
+    original file
+    """
+    pass
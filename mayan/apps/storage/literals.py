@@ -1 +1,11 @@
+DEFAULT_BUFFERED_FILE_SPOOL_SIZE = 10 * 1024 * 1024  # 10 MB
 DEFAULT_STORAGE_BACKEND = 'django.core.files.storage.FileSystemStorage'
+DEFAULT_STORAGE_PROCESS_REPORT_INTERVAL = 10
+
+STORAGE_PROCESS_CHUNK_SIZE = 64 * 1024  # 64K
+# Maximum number of files queued for each worker.
+STORAGE_PROCESS_QUEUE_SIZE_PER_WORKER = 2
+STORAGE_PROCESS_TEMPORARY_NAME = '{}.{}.tmp'
+STORAGE_TIER_FILE_NAME = 'tiers/{tier_name}/{file_name}'
+STORAGE_TIER_FILE_NAME_PREFIX = 'tiers/'
+STORAGE_TIER_NAME = '{defined_storage_name}__tier__{tier_name}'
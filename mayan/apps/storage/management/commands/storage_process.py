@@ -1,6 +1,7 @@
 from django.core import management
 from django.utils.translation import ugettext_lazy as _
 
+from ...literals import DEFAULT_STORAGE_PROCESS_REPORT_INTERVAL
 from ...utils import PassthroughStorageProcessor
 
 
@@ -26,6 +27,15 @@ class Command(management.BaseCommand):
             help=_('Process a specific model.'),
             required=True,
         )
+        parser.add_argument(
+            '--rate_limit', action='store', dest='rate_limit', type=float,
+            help=_('Maximum number of files to process per second.')
+        )
+        parser.add_argument(
+            '--report_interval', action='store', dest='report_interval',
+            default=DEFAULT_STORAGE_PROCESS_REPORT_INTERVAL, type=int,
+            help=_('Seconds between progress reports.')
+        )
         parser.add_argument(
             '--reverse', action='store_true', dest='reverse',
             help=_(
@@ -33,6 +43,21 @@ class Command(management.BaseCommand):
                 'pipeline transformations.'
             )
         )
+        parser.add_argument(
+            '--upgrade', action='store_true', dest='upgrade',
+            help=_(
+                'Decode the files and store them again to convert them to '
+                'the current format of the storage pipeline. Use a new '
+                'log file.'
+            )
+        )
+        parser.add_argument(
+            '--workers', action='store', dest='workers', default=1,
+            type=int, help=_(
+                'Number of worker processes. Files are processed in the '
+                'main process when set to 1.'
+            )
+        )
         parser.add_argument(
             '--storage_name', action='store', dest='defined_storage_name',
             help=_('Name of the storage to process.'),
@@ -44,5 +69,11 @@ class Command(management.BaseCommand):
             app_label=options['app_label'],
             defined_storage_name=options['defined_storage_name'],
             log_file=options['log_file'], model_name=options['model_name'],
+            rate_limit=options['rate_limit'],
+            report_callback=self.stdout.write,
+            report_interval=options['report_interval'],
+            workers=options['workers']
+        )
+        processor.execute(
+            reverse=options['reverse'], upgrade=options['upgrade']
         )
-        processor.execute(reverse=options['reverse'])
@@ -0,0 +1,31 @@
+from django.core import management
+from django.template.defaultfilters import filesizeformat
+from django.utils.translation import ugettext_lazy as _
+
+from ...classes import DefinedStorage
+
+
+class Command(management.BaseCommand):
+    help = 'Show the number of files and space used by a storage and its tiers.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--storage_name', action='store', dest='defined_storage_name',
+            help=_('Name of the storage to report.'),
+            required=True,
+        )
+
+    def handle(self, *args, **options):
+        defined_storage = DefinedStorage.get(
+            name=options['defined_storage_name']
+        )
+
+        for entry in [defined_storage] + list(defined_storage.tiers.values()):
+            usage = entry.get_usage()
+            self.stdout.write(
+                _('%(label)s: %(file_count)d files, %(size)s') % {
+                    'file_count': usage['file_count'],
+                    'label': entry.label,
+                    'size': filesizeformat(usage['size'])
+                }
+            )
@@ -4,8 +4,19 @@ from django.utils.translation import ugettext_lazy as _
 
 from mayan.apps.smart_settings.classes import Namespace
 
+from .literals import DEFAULT_BUFFERED_FILE_SPOOL_SIZE
+
 namespace = Namespace(label=_('Storage'), name='storage')
 
+setting_buffered_file_spool_size = namespace.add_setting(
+    global_name='STORAGE_BUFFERED_FILE_SPOOL_SIZE',
+    default=DEFAULT_BUFFERED_FILE_SPOOL_SIZE, help_text=_(
+        'Size in bytes of the data decoded from compressed or encrypted '
+        'files that is kept in memory to serve backward seeks. Data past '
+        'this size is moved to a temporary file. Files read only forward '
+        'keep just the data not read yet.'
+    )
+)
 setting_temporary_directory = namespace.add_setting(
     global_name='STORAGE_TEMPORARY_DIRECTORY', default=tempfile.gettempdir(),
     help_text=_(
@@ -1,2 +1,6 @@
 TEST_CONTENT = 'testcontent'
 TEST_FILE_NAME = 'test_file'
+TEST_PASSWORD = 'testpassword'
+TEST_STORAGE_NAME = 'storage__test_storage'
+TEST_STORAGE_TIER_LABEL = 'Test tier'
+TEST_STORAGE_TIER_NAME = 'test_tier'
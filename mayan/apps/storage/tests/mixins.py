@@ -3,8 +3,32 @@ import shutil
 
 from mayan.apps.documents.literals import STORAGE_NAME_DOCUMENT_VERSION
 
-from ..classes import DefinedStorage
-from ..utils import mkdtemp
+from ..classes import DefinedStorage, DefinedStorageTier
+from ..utils import fs_cleanup, mkdtemp
+
+from .literals import TEST_STORAGE_TIER_LABEL, TEST_STORAGE_TIER_NAME
+
+
+class DefinedStorageTierTestMixin(object):
+    def setUp(self):
+        super(DefinedStorageTierTestMixin, self).setUp()
+        self.test_storage_tiers = []
+
+    def tearDown(self):
+        for test_storage_tier in self.test_storage_tiers:
+            test_storage_tier.unregister()
+            fs_cleanup(filename=test_storage_tier.kwargs['location'])
+
+        super(DefinedStorageTierTestMixin, self).tearDown()
+
+    def _create_test_storage_tier(self, defined_storage_name, policy=None):
+        self.test_storage_tier = DefinedStorageTier(
+            defined_storage_name=defined_storage_name,
+            dotted_path='django.core.files.storage.FileSystemStorage',
+            kwargs={'location': mkdtemp()}, label=TEST_STORAGE_TIER_LABEL,
+            policy=policy, tier_name=TEST_STORAGE_TIER_NAME
+        )
+        self.test_storage_tiers.append(self.test_storage_tier)
 
 
 class StorageProcessorTestMixin(object):
@@ -14,6 +38,7 @@ class StorageProcessorTestMixin(object):
         cls.defined_storage = DefinedStorage.get(
             name=STORAGE_NAME_DOCUMENT_VERSION
         )
+        cls.document_storage_dotted_path = cls.defined_storage.dotted_path
         cls.document_storage_kwargs = cls.defined_storage.kwargs
 
     def setUp(self):
@@ -25,4 +50,5 @@ class StorageProcessorTestMixin(object):
     def tearDown(self):
         super(StorageProcessorTestMixin, self).tearDown()
         shutil.rmtree(self.temporary_directory, ignore_errors=True)
+        self.defined_storage.dotted_path = self.document_storage_dotted_path
         self.defined_storage.kwargs = self.document_storage_kwargs
@@ -1,5 +1,7 @@
+import mock
 from pathlib import Path
 
+from django.conf import settings
 from django.core.files.base import ContentFile
 from django.utils.encoding import force_bytes
 
@@ -7,10 +9,15 @@ from mayan.apps.common.tests.base import BaseTestCase
 from mayan.apps.storage.utils import fs_cleanup, mkdtemp
 from mayan.apps.mimetype.api import get_mimetype
 
+from ..backends import encryptedstorage
 from ..backends.compressedstorage import ZipCompressedPassthroughStorage
-from ..backends.encryptedstorage import EncryptedPassthroughStorage
+from ..backends.encryptedstorage import (
+    EncryptedPassthroughStorage, SeekableEncryptedPassthroughStorage,
+    SeekableEncryptedFile
+)
+from ..backends.literals import SEEKABLE_ENCRYPTION_CHUNK_SIZE
 
-from .literals import TEST_CONTENT, TEST_FILE_NAME
+from .literals import TEST_CONTENT, TEST_FILE_NAME, TEST_PASSWORD
 
 
 class EncryptedPassthroughStorageTestCase(BaseTestCase):
@@ -24,7 +31,7 @@ class EncryptedPassthroughStorageTestCase(BaseTestCase):
 
     def test_file_save_and_load(self):
         storage = EncryptedPassthroughStorage(
-            password='testpassword',
+            password=TEST_PASSWORD,
             next_storage_backend_arguments={
                 'location': self.temporary_directory,
             }
@@ -54,6 +61,168 @@ class EncryptedPassthroughStorageTestCase(BaseTestCase):
             self.assertEqual(file_object.read(999), TEST_CONTENT)
 
 
+    def test_file_seek_backward(self):
+        storage = EncryptedPassthroughStorage(
+            password=TEST_PASSWORD,
+            next_storage_backend_arguments={
+                'location': self.temporary_directory,
+            }
+        )
+        storage.save(
+            name=TEST_FILE_NAME, content=ContentFile(
+                content=force_bytes(TEST_CONTENT)
+            )
+        )
+
+        with storage.open(name=TEST_FILE_NAME, mode='rb') as file_object:
+            file_object.read(4)
+            file_object.seek(1)
+            self.assertEqual(
+                file_object.read(), force_bytes(TEST_CONTENT)[1:]
+            )
+
+    def test_key_derivation_caching(self):
+        EncryptedPassthroughStorage.invalidate_cache()
+
+        with mock.patch.object(encryptedstorage, 'PBKDF2', wraps=encryptedstorage.PBKDF2) as mock_pbkdf2:
+            storage = EncryptedPassthroughStorage(password=TEST_PASSWORD)
+            EncryptedPassthroughStorage(password=TEST_PASSWORD)
+            self.assertEqual(mock_pbkdf2.call_count, 1)
+
+            with self.settings(SECRET_KEY='{}x'.format(settings.SECRET_KEY)):
+                self.assertNotEqual(
+                    EncryptedPassthroughStorage(password=TEST_PASSWORD).key,
+                    storage.key
+                )
+            self.assertEqual(mock_pbkdf2.call_count, 2)
+
+            EncryptedPassthroughStorage.invalidate_cache()
+            self.assertEqual(
+                EncryptedPassthroughStorage(password=TEST_PASSWORD).key,
+                storage.key
+            )
+            self.assertEqual(mock_pbkdf2.call_count, 3)
+
+
+class SeekableEncryptedPassthroughStorageTestCase(BaseTestCase):
+    def setUp(self):
+        super(SeekableEncryptedPassthroughStorageTestCase, self).setUp()
+        self.temporary_directory = mkdtemp()
+        self.test_content = force_bytes(
+            ''.join(
+                map(str, range(SEEKABLE_ENCRYPTION_CHUNK_SIZE // 2))
+            )
+        )
+        self.storage = SeekableEncryptedPassthroughStorage(
+            password=TEST_PASSWORD,
+            next_storage_backend_arguments={
+                'location': self.temporary_directory,
+            }
+        )
+
+    def tearDown(self):
+        fs_cleanup(filename=self.temporary_directory)
+        super(SeekableEncryptedPassthroughStorageTestCase, self).tearDown()
+
+    def _save_test_file(self, content=None):
+        if content is None:
+            content = self.test_content
+
+        self.test_file_name = self.storage.save(
+            name=TEST_FILE_NAME, content=ContentFile(content=content)
+        )
+
+    def test_empty_file_save_and_load(self):
+        self._save_test_file(content=b'')
+
+        with self.storage.open(name=self.test_file_name) as file_object:
+            self.assertEqual(file_object.read(), b'')
+
+        self.assertEqual(self.storage.size(name=self.test_file_name), 0)
+
+    def test_file_save_and_load(self):
+        self._save_test_file()
+
+        with self.storage.open(name=self.test_file_name) as file_object:
+            self.assertTrue(isinstance(file_object, SeekableEncryptedFile))
+            self.assertEqual(file_object.read(), self.test_content)
+
+        with self.storage.open(name=self.test_file_name, _direct=True) as file_object:
+            self.assertTrue(
+                force_bytes(TEST_CONTENT) not in file_object.read()
+            )
+
+        self.assertEqual(
+            self.storage.size(name=self.test_file_name),
+            len(self.test_content)
+        )
+
+    def test_file_seek_and_read(self):
+        self._save_test_file()
+        offsets = (
+            0, SEEKABLE_ENCRYPTION_CHUNK_SIZE - 5,
+            SEEKABLE_ENCRYPTION_CHUNK_SIZE, len(self.test_content) - 3
+        )
+
+        with self.storage.open(name=self.test_file_name) as file_object:
+            for offset in reversed(offsets):
+                file_object.seek(offset)
+                self.assertEqual(
+                    file_object.read(10), self.test_content[offset:offset + 10]
+                )
+                self.assertEqual(
+                    file_object.tell(),
+                    min(offset + 10, len(self.test_content))
+                )
+
+            file_object.seek(-4, 2)
+            self.assertEqual(file_object.read(), self.test_content[-4:])
+
+    def test_file_tampering(self):
+        self._save_test_file()
+
+        path_file = Path(self.temporary_directory) / self.test_file_name
+        with path_file.open(mode='r+b') as file_object:
+            file_object.seek(-1, 2)
+            last_byte = file_object.read(1)
+            file_object.seek(-1, 2)
+            file_object.write(bytes([last_byte[0] ^ 1]))
+
+        with self.storage.open(name=self.test_file_name) as file_object:
+            file_object.read(10)
+
+            with self.assertRaises(expected_exception=ValueError):
+                file_object.seek(-10, 2)
+                file_object.read()
+
+    def test_file_truncation(self):
+        self._save_test_file()
+
+        path_file = Path(self.temporary_directory) / self.test_file_name
+        with path_file.open(mode='r+b') as file_object:
+            file_object.truncate(
+                path_file.stat().st_size - len(self.test_content) // 2
+            )
+
+        with self.storage.open(name=self.test_file_name) as file_object:
+            with self.assertRaises(expected_exception=ValueError):
+                file_object.read()
+
+    def test_sequential_format_load(self):
+        EncryptedPassthroughStorage(
+            password=TEST_PASSWORD,
+            next_storage_backend_arguments={
+                'location': self.temporary_directory,
+            }
+        ).save(
+            name=TEST_FILE_NAME, content=ContentFile(content=self.test_content)
+        )
+
+        with self.storage.open(name=TEST_FILE_NAME) as file_object:
+            self.assertFalse(isinstance(file_object, SeekableEncryptedFile))
+            self.assertEqual(file_object.read(), self.test_content)
+
+
 class ZipCompressedPassthroughStorageTestCase(BaseTestCase):
     def setUp(self):
         super(ZipCompressedPassthroughStorageTestCase, self).setUp()
@@ -89,3 +258,20 @@ class ZipCompressedPassthroughStorageTestCase(BaseTestCase):
 
         with storage.open(name=TEST_FILE_NAME, mode='r') as file_object:
             self.assertEqual(file_object.read(), TEST_CONTENT)
+
+    def test_file_seek_backward(self):
+        storage = ZipCompressedPassthroughStorage(
+            next_storage_backend_arguments={
+                'location': self.temporary_directory
+            }
+        )
+        storage.save(
+            name=TEST_FILE_NAME, content=ContentFile(content=TEST_CONTENT)
+        )
+
+        with storage.open(name=TEST_FILE_NAME, mode='rb') as file_object:
+            file_object.read(4)
+            file_object.seek(1)
+            self.assertEqual(
+                file_object.read(), force_bytes(TEST_CONTENT)[1:]
+            )
@@ -0,0 +1,229 @@
+import os
+
+from django.core.files.base import ContentFile
+from django.utils.encoding import force_bytes
+from django.utils.six import BytesIO
+
+from mayan.apps.common.tests.base import BaseTestCase
+
+from ..classes import BufferedFile, DefinedStorage, DefinedStorageLazy
+from ..settings import setting_buffered_file_spool_size
+from ..utils import fs_cleanup, mkdtemp
+
+from .literals import (
+    TEST_CONTENT, TEST_FILE_NAME, TEST_STORAGE_NAME, TEST_STORAGE_TIER_NAME
+)
+from .mixins import DefinedStorageTierTestMixin
+
+
+class TestBufferedFile(BufferedFile):
+    def _get_file_object_chunk(self):
+        return self.file_object.read(4)
+
+    def _rewind(self):
+        self.file_object.seek(0)
+
+
+class BufferedFileTestCase(BaseTestCase):
+    def setUp(self):
+        super(BufferedFileTestCase, self).setUp()
+        self.test_content = force_bytes(TEST_CONTENT * 4)
+        self.test_buffered_file = TestBufferedFile(
+            file_object=BytesIO(self.test_content), mode='rb'
+        )
+
+    def tearDown(self):
+        self.test_buffered_file.close()
+        super(BufferedFileTestCase, self).tearDown()
+
+    def test_read_partial(self):
+        self.assertEqual(
+            self.test_buffered_file.read(6), self.test_content[:6]
+        )
+        self.assertEqual(self.test_buffered_file.stream_size, 8)
+        self.assertEqual(
+            self.test_buffered_file.read(6), self.test_content[6:12]
+        )
+        self.assertEqual(self.test_buffered_file.tell(), 12)
+        self.assertEqual(
+            self.test_buffered_file.read(), self.test_content[12:]
+        )
+        self.assertEqual(self.test_buffered_file.read(), b'')
+
+    def test_read_text_mode(self):
+        test_buffered_file = TestBufferedFile(
+            file_object=BytesIO(self.test_content), mode='r'
+        )
+
+        with test_buffered_file:
+            self.assertEqual(test_buffered_file.read(), TEST_CONTENT * 4)
+
+    def test_seek(self):
+        self.test_buffered_file.read(10)
+        self.test_buffered_file.seek(2)
+        self.assertEqual(
+            self.test_buffered_file.read(3), self.test_content[2:5]
+        )
+
+        self.test_buffered_file.seek(3, 1)
+        self.assertEqual(
+            self.test_buffered_file.read(3), self.test_content[8:11]
+        )
+
+        self.test_buffered_file.seek(-5, 2)
+        self.assertEqual(
+            self.test_buffered_file.read(), self.test_content[-5:]
+        )
+
+        self.assertEqual(
+            self.test_buffered_file.size, len(self.test_content)
+        )
+
+    def test_read_forward(self):
+        while self.test_buffered_file.read(3):
+            self.assertTrue(len(self.test_buffered_file.buffer) <= 4)
+
+        self.test_buffered_file.seek(2, 1)
+        self.assertEqual(self.test_buffered_file.read(), b'')
+        self.assertEqual(self.test_buffered_file.stream, None)
+
+    def test_spool_size(self):
+        self.test_buffered_file.read(12)
+
+        old_value = setting_buffered_file_spool_size.value
+        setting_buffered_file_spool_size.value = '8'
+
+        try:
+            self.test_buffered_file.seek(0)
+        finally:
+            setting_buffered_file_spool_size.value = '{}'.format(old_value)
+
+        self.test_buffered_file.read(4)
+        self.assertFalse(self.test_buffered_file.stream._rolled)
+        self.test_buffered_file.read(8)
+        self.assertTrue(self.test_buffered_file.stream._rolled)
+
+        self.test_buffered_file.seek(0)
+        self.assertEqual(self.test_buffered_file.read(), self.test_content)
+
+
+class DefinedStorageTestCase(BaseTestCase):
+    def setUp(self):
+        super(DefinedStorageTestCase, self).setUp()
+        self.temporary_directory = mkdtemp()
+        self.test_defined_storage = DefinedStorage(
+            dotted_path='django.core.files.storage.FileSystemStorage',
+            label='Test storage', name=TEST_STORAGE_NAME,
+            kwargs={'location': self.temporary_directory}
+        )
+
+    def tearDown(self):
+        fs_cleanup(filename=self.temporary_directory)
+        super(DefinedStorageTestCase, self).tearDown()
+
+    def test_storage_instance_caching(self):
+        storage_instance = self.test_defined_storage.get_storage_instance()
+
+        self.assertTrue(
+            self.test_defined_storage.get_storage_instance() is storage_instance
+        )
+
+    def test_storage_instance_caching_arguments_change(self):
+        storage_instance = self.test_defined_storage.get_storage_instance()
+
+        self.test_defined_storage.kwargs = {
+            'location': '{}/other'.format(self.temporary_directory)
+        }
+
+        self.assertFalse(
+            self.test_defined_storage.get_storage_instance() is storage_instance
+        )
+
+    def test_storage_instance_caching_invalidation(self):
+        storage_instance = self.test_defined_storage.get_storage_instance()
+
+        DefinedStorage.invalidate_cache()
+
+        self.assertFalse(
+            self.test_defined_storage.get_storage_instance() is storage_instance
+        )
+
+
+class DefinedStorageTierTestCase(DefinedStorageTierTestMixin, BaseTestCase):
+    def setUp(self):
+        super(DefinedStorageTierTestCase, self).setUp()
+        self.temporary_directory = mkdtemp()
+        self.test_defined_storage = DefinedStorage(
+            dotted_path='django.core.files.storage.FileSystemStorage',
+            label='Test storage', name=TEST_STORAGE_NAME,
+            kwargs={'location': self.temporary_directory}
+        )
+        self._create_test_storage_tier(defined_storage_name=TEST_STORAGE_NAME)
+        self.test_lazy_storage = DefinedStorageLazy(name=TEST_STORAGE_NAME)
+
+    def tearDown(self):
+        fs_cleanup(filename=self.temporary_directory)
+        super(DefinedStorageTierTestCase, self).tearDown()
+
+    def test_lazy_storage_tier_routing(self):
+        file_name = self.test_lazy_storage.save(
+            name=self.test_storage_tier.get_file_name(
+                file_name=TEST_FILE_NAME
+            ), content=ContentFile(content=TEST_CONTENT)
+        )
+
+        self.assertEqual(
+            file_name, 'tiers/{}/{}'.format(
+                TEST_STORAGE_TIER_NAME, TEST_FILE_NAME
+            )
+        )
+        self.assertTrue(
+            os.path.exists(
+                os.path.join(
+                    self.test_storage_tier.kwargs['location'], TEST_FILE_NAME
+                )
+            )
+        )
+        self.assertFalse(
+            os.path.exists(
+                os.path.join(self.temporary_directory, TEST_FILE_NAME)
+            )
+        )
+
+        with self.test_lazy_storage.open(name=file_name, mode='r') as file_object:
+            self.assertEqual(file_object.read(), TEST_CONTENT)
+
+        self.test_lazy_storage.delete(name=file_name)
+        self.assertFalse(self.test_lazy_storage.exists(name=file_name))
+
+    def test_lazy_storage_without_tier(self):
+        file_name = self.test_lazy_storage.save(
+            name=TEST_FILE_NAME, content=ContentFile(content=TEST_CONTENT)
+        )
+
+        self.assertEqual(file_name, TEST_FILE_NAME)
+        self.assertTrue(
+            os.path.exists(
+                os.path.join(self.temporary_directory, TEST_FILE_NAME)
+            )
+        )
+
+    def test_usage(self):
+        self.test_lazy_storage.save(
+            name='{}/{}'.format(TEST_STORAGE_TIER_NAME, TEST_FILE_NAME),
+            content=ContentFile(content=TEST_CONTENT)
+        )
+        self.test_lazy_storage.save(
+            name=self.test_storage_tier.get_file_name(
+                file_name=TEST_FILE_NAME
+            ), content=ContentFile(content=TEST_CONTENT)
+        )
+
+        self.assertEqual(
+            self.test_defined_storage.get_usage(),
+            {'file_count': 1, 'size': len(TEST_CONTENT)}
+        )
+        self.assertEqual(
+            self.test_storage_tier.get_usage(),
+            {'file_count': 1, 'size': len(TEST_CONTENT)}
+        )
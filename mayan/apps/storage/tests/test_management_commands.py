@@ -1,10 +1,14 @@
 from django.core import management
 from django.utils.encoding import force_text
+from django.utils.six import StringIO
 
 from mayan.apps.documents.tests.base import GenericDocumentTestCase
 from mayan.apps.mimetype.api import get_mimetype
 
-from .mixins import StorageProcessorTestMixin
+from ..backends.encryptedstorage import SeekableEncryptedFile
+
+from .literals import TEST_PASSWORD, TEST_STORAGE_TIER_LABEL
+from .mixins import DefinedStorageTierTestMixin, StorageProcessorTestMixin
 
 
 class StorageProcessManagementCommandTestCase(
@@ -72,3 +76,58 @@ class StorageProcessManagementCommandTestCase(
             self.test_document.latest_version.checksum,
             self.test_document.latest_version.update_checksum(save=False)
         )
+
+
+class StorageProcessUpgradeManagementCommandTestCase(
+    StorageProcessorTestMixin, GenericDocumentTestCase
+):
+    auto_upload_test_document = False
+
+    def test_storage_processor_command_upgrade(self):
+        self.defined_storage.dotted_path = 'mayan.apps.storage.backends.encryptedstorage.EncryptedPassthroughStorage'
+        self.defined_storage.kwargs = {
+            'next_storage_backend': 'django.core.files.storage.FileSystemStorage',
+            'next_storage_backend_arguments': {
+                'location': self.document_storage_kwargs['location']
+            },
+            'password': TEST_PASSWORD
+        }
+
+        self._upload_test_document()
+
+        self.defined_storage.dotted_path = 'mayan.apps.storage.backends.encryptedstorage.SeekableEncryptedPassthroughStorage'
+
+        management.call_command(
+            command_name='storage_process', app_label='documents',
+            defined_storage_name='documents__documentversion',
+            log_file=force_text(self.path_test_file),
+            model_name='DocumentVersion', upgrade=True
+        )
+
+        with self.test_document.latest_version.open() as file_object:
+            self.assertTrue(isinstance(file_object, SeekableEncryptedFile))
+
+        self.assertEqual(
+            self.test_document.latest_version.checksum,
+            self.test_document.latest_version.update_checksum(save=False)
+        )
+
+
+class StorageUsageManagementCommandTestCase(
+    DefinedStorageTierTestMixin, GenericDocumentTestCase
+):
+    def test_storage_usage_command(self):
+        self._create_test_storage_tier(
+            defined_storage_name='documents__documentversion'
+        )
+
+        output = StringIO()
+        management.call_command(
+            command_name='storage_usage',
+            defined_storage_name='documents__documentversion', stdout=output
+        )
+
+        self.assertTrue('Document version files: ' in output.getvalue())
+        self.assertTrue(
+            '{}: 0 files'.format(TEST_STORAGE_TIER_LABEL) in output.getvalue()
+        )
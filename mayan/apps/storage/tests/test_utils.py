@@ -1,12 +1,16 @@
+import mock
+import os
 from pathlib import Path
 import shutil
 
 from django.utils.encoding import force_text
 
 from mayan.apps.common.tests.base import BaseTestCase
+from mayan.apps.documents.models import DocumentVersion
 from mayan.apps.documents.tests.base import GenericDocumentTestCase
 from mayan.apps.mimetype.api import get_mimetype
 
+from .. import utils
 from ..utils import PassthroughStorageProcessor, mkdtemp, patch_files
 
 from .mixins import StorageProcessorTestMixin
@@ -87,16 +91,16 @@ class StorageProcessorTestCase(
 ):
     auto_upload_test_document = False
 
-    def _execute_storage_procesor(self, reverse=None):
-        storage_processor = PassthroughStorageProcessor(
+    def _execute_storage_procesor(self, reverse=None, **kwargs):
+        self.test_storage_processor = PassthroughStorageProcessor(
             app_label='documents',
             defined_storage_name='documents__documentversion',
             log_file=force_text(self.path_test_file),
-            model_name='DocumentVersion'
+            model_name='DocumentVersion', **kwargs
         )
-        storage_processor.execute(reverse=reverse)
+        self.test_storage_processor.execute(reverse=reverse)
 
-    def _upload_and_process(self):
+    def _upload_and_process(self, **kwargs):
         self.defined_storage.dotted_path = 'django.core.files.storage.FileSystemStorage'
         self.defined_storage.kwargs = {
             'location': self.document_storage_kwargs['location']
@@ -112,7 +116,7 @@ class StorageProcessorTestCase(
             }
         }
 
-        self._execute_storage_procesor()
+        self._execute_storage_procesor(**kwargs)
 
     def test_processor_forwards(self):
         self._upload_and_process()
@@ -148,3 +152,82 @@ class StorageProcessorTestCase(
             self.test_document.latest_version.checksum,
             self.test_document.latest_version.update_checksum(save=False)
         )
+
+    def test_processor_forwards_parallel(self):
+        self._upload_test_document()
+        self._upload_and_process(workers=2)
+
+        self.assertEqual(self.test_storage_processor.statistics['files'], 2)
+
+        for document in self.test_documents:
+            with open(document.latest_version.file.path, mode='rb') as file_object:
+                self.assertEqual(
+                    get_mimetype(file_object=file_object),
+                    ('application/zip', 'binary')
+                )
+
+            self.assertEqual(
+                document.latest_version.checksum,
+                document.latest_version.update_checksum(save=False)
+            )
+
+        for file_name in os.listdir(self.document_storage_kwargs['location']):
+            self.assertFalse(file_name.endswith('.tmp'))
+
+    def test_processor_shared_file(self):
+        self._upload_test_document()
+        self._upload_test_document()
+        DocumentVersion.objects.filter(
+            pk=self.test_documents[1].latest_version.pk
+        ).update(file=self.test_documents[0].latest_version.file.name)
+
+        self._upload_and_process()
+
+        self.assertEqual(self.test_storage_processor.statistics['files'], 2)
+        self.assertEqual(self.test_storage_processor.statistics['skipped'], 1)
+
+        for document_version in DocumentVersion.objects.all():
+            self.assertEqual(
+                document_version.checksum,
+                document_version.update_checksum(save=False)
+            )
+
+    def test_processor_report(self):
+        test_reports = []
+        self._upload_and_process(
+            report_callback=test_reports.append, report_interval=0
+        )
+
+        self.assertEqual(len(test_reports), 2)
+        self.assertTrue('Processed 1 of 1 files' in test_reports[-1])
+
+    def test_processor_resume(self):
+        self._upload_and_process()
+        self._execute_storage_procesor()
+
+        self.assertEqual(self.test_storage_processor.statistics['files'], 0)
+        self.assertEqual(self.test_storage_processor.statistics['skipped'], 1)
+
+    def test_processor_verification_error(self):
+        self._silence_logger(name='mayan.apps.storage.utils')
+
+        with mock.patch.object(utils, 'copy_and_hash', side_effect=('1', '2')):
+            self._upload_and_process()
+
+        self.assertEqual(self.test_storage_processor.statistics['errors'], 1)
+
+        self.defined_storage.dotted_path = 'django.core.files.storage.FileSystemStorage'
+        self.defined_storage.kwargs = {
+            'location': self.document_storage_kwargs['location']
+        }
+
+        with open(self.test_document.latest_version.file.path, mode='rb') as file_object:
+            self.assertNotEqual(
+                get_mimetype(file_object=file_object),
+                ('application/zip', 'binary')
+            )
+
+        self.assertEqual(
+            self.test_document.latest_version.checksum,
+            self.test_document.latest_version.update_checksum(save=False)
+        )
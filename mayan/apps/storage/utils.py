@@ -1,14 +1,29 @@
+from concurrent.futures import (
+    FIRST_COMPLETED, ProcessPoolExecutor, as_completed, wait
+)
+import datetime
 import dbm
+import functools
+import hashlib
 import logging
 import os
 from pathlib import Path
 import shutil
 import tempfile
+import time
+import uuid
 
 from django.apps import apps
+from django.core.files.base import File
 from django.utils.module_loading import import_string
+from django.utils.translation import ugettext as _
 
 from .classes import DefinedStorage, PassthroughStorage
+from .exceptions import StorageProcessVerificationError
+from .literals import (
+    DEFAULT_STORAGE_PROCESS_REPORT_INTERVAL, STORAGE_PROCESS_CHUNK_SIZE,
+    STORAGE_PROCESS_QUEUE_SIZE_PER_WORKER, STORAGE_PROCESS_TEMPORARY_NAME
+)
 from .settings import setting_temporary_directory
 
 logger = logging.getLogger(name=__name__)
@@ -20,15 +35,25 @@ def NamedTemporaryFile(*args, **kwargs):
 
 
 class PassthroughStorageProcessor(object):
+    """
+    Process the files of a model over a storage pipeline. Processed files
+    are recorded in a dbm log file to allow resuming interrupted runs.
+    Files can be processed in parallel by a pool of worker processes.
+    """
     def __init__(
         self, app_label, defined_storage_name, log_file, model_name,
-        file_attribute='file'
+        file_attribute='file', rate_limit=None, report_callback=None,
+        report_interval=DEFAULT_STORAGE_PROCESS_REPORT_INTERVAL, workers=1
     ):
         self.app_label = app_label
         self.defined_storage_name = defined_storage_name
         self.file_attribute = file_attribute
         self.log_file = log_file
         self.model_name = model_name
+        self.rate_limit = rate_limit
+        self.report_callback = report_callback or logger.info
+        self.report_interval = report_interval
+        self.workers = workers
 
     def _update_entry(self, key):
         if not self.reverse:
@@ -45,15 +70,80 @@ class PassthroughStorageProcessor(object):
         else:
             return key not in self.database
 
-    def execute(self, reverse=False):
+    def _process_result(self, keys, file_name, get_size):
+        """
+        Record the outcome of processing a file. get_size returns the size
+        of the processed content or raises the processing exception.
+        """
+        try:
+            size = get_size()
+        except Exception as exception:
+            logger.error(
+                'Error processing file "%s"; %s', file_name, exception,
+                exc_info=True
+            )
+            self.statistics['errors'] += 1
+        else:
+            for key in keys:
+                self._update_entry(key=key)
+
+            self.statistics['bytes'] += size
+            self.statistics['files'] += 1
+
+        self._report()
+
+    def _report(self, force=False):
+        current_time = time.time()
+
+        if force or current_time - self.report_time >= self.report_interval:
+            self.report_time = current_time
+            elapsed = max(current_time - self.start_time, 0.001)
+            files_per_second = self.statistics['files'] / elapsed
+            remaining = max(
+                self.statistics['total'] - self.statistics['files'] - self.statistics['errors'] - self.statistics['skipped'],
+                0
+            )
+
+            if files_per_second:
+                eta = datetime.timedelta(
+                    seconds=int(remaining / files_per_second)
+                )
+            else:
+                eta = _('unknown')
+
+            self.report_callback(
+                _(
+                    'Processed %(files)d of %(total)d files, '
+                    '%(errors)d errors, %(files_per_second).2f files/s, '
+                    '%(megabytes_per_second).2f MB/s, ETA: %(eta)s'
+                ) % {
+                    'errors': self.statistics['errors'],
+                    'eta': eta, 'files': self.statistics['files'],
+                    'files_per_second': files_per_second,
+                    'megabytes_per_second': self.statistics['bytes'] / elapsed / 1024 / 1024,
+                    'total': self.statistics['total']
+                }
+            )
+
+    def _throttle(self):
+        """
+        Wait until processing another file keeps the rate under the limit.
+        """
+        if self.rate_limit:
+            self.submitted_count += 1
+            delay = self.start_time + self.submitted_count / self.rate_limit - time.time()
+            if delay > 0:
+                time.sleep(delay)
+
+    def execute(self, reverse=False, upgrade=False):
         self.reverse = reverse
+        self.upgrade = upgrade
         model = apps.get_model(
             app_label=self.app_label, model_name=self.model_name
         )
 
-        storage_instance = DefinedStorage.get(
-            name=self.defined_storage_name
-        ).get_storage_instance()
+        defined_storage = DefinedStorage.get(name=self.defined_storage_name)
+        storage_instance = defined_storage.get_storage_instance()
 
         if isinstance(storage_instance, PassthroughStorage):
             ContentType = apps.get_model(
@@ -61,25 +151,96 @@ class PassthroughStorageProcessor(object):
             )
             content_type = ContentType.objects.get_for_model(model=model)
 
+            # Upgrades decode and encode with the pipeline. Forwards reads
+            # the raw file and encodes it. Reverse decodes the file and
+            # writes it raw.
+            process_kwargs = {
+                'defined_storage_name': self.defined_storage_name,
+                'source_direct': not self.reverse and not self.upgrade,
+                'target_direct': self.reverse
+            }
+
+            queryset = model.objects.all()
+            self.start_time = self.report_time = time.time()
+            self.statistics = {
+                'bytes': 0, 'errors': 0, 'files': 0, 'skipped': 0,
+                'total': queryset.count()
+            }
+            self.submitted_count = 0
+
             self.database = dbm.open(self.log_file, flag='c')
 
-            for instance in model.objects.all():
-                key = '{}.{}'.format(content_type.name, instance.pk)
-                if self._inclusion_condition(key=key):
-                    file_name = getattr(instance, self.file_attribute).name
+            if self.workers > 1:
+                executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                executor = None
 
-                    content = storage_instance.open(
-                        name=file_name, mode='rb',
-                        _direct=not self.reverse
+            try:
+                file_names = set()
+                pending = {}
+
+                for instance in queryset.iterator():
+                    key = '{}.{}'.format(content_type.name, instance.pk)
+                    file_name = getattr(instance, self.file_attribute).name
+                    file_defined_storage, tier_file_name = defined_storage.get_file_defined_storage(
+                        file_name=file_name
                     )
-                    storage_instance.delete(name=file_name)
-                    storage_instance.save(
-                        name=file_name, content=content,
-                        _direct=self.reverse
+
+                    # Files can be shared by several instances, process
+                    # them only once and record all the instances. Files
+                    # moved to a storage tier are not processed.
+                    if file_defined_storage is not defined_storage:
+                        self.statistics['skipped'] += 1
+                    elif self._inclusion_condition(key=key) and file_name not in file_names:
+                        file_names.add(file_name)
+                        keys = [
+                            '{}.{}'.format(content_type.name, pk) for pk in model.objects.filter(
+                                **{self.file_attribute: file_name}
+                            ).values_list('pk', flat=True)
+                        ]
+                        self._throttle()
+
+                        if executor:
+                            future = executor.submit(
+                                process_storage_file, file_name=file_name,
+                                **process_kwargs
+                            )
+                            pending[future] = (keys, file_name)
+
+                            # Bound the queue of submitted files.
+                            if len(pending) >= self.workers * STORAGE_PROCESS_QUEUE_SIZE_PER_WORKER:
+                                done, not_done = wait(
+                                    fs=pending, return_when=FIRST_COMPLETED
+                                )
+                                for future in done:
+                                    keys, file_name = pending.pop(future)
+                                    self._process_result(
+                                        file_name=file_name,
+                                        get_size=future.result, keys=keys
+                                    )
+                        else:
+                            self._process_result(
+                                file_name=file_name, get_size=functools.partial(
+                                    process_storage_file, file_name=file_name,
+                                    **process_kwargs
+                                ), keys=keys
+                            )
+                    else:
+                        self.statistics['skipped'] += 1
+
+                for future in as_completed(fs=pending):
+                    keys, file_name = pending[future]
+                    self._process_result(
+                        file_name=file_name, get_size=future.result,
+                        keys=keys
                     )
-                    self._update_entry(key=key)
+            finally:
+                if executor:
+                    executor.shutdown()
+
+                self.database.close()
 
-            self.database.close
+            self._report(force=True)
 
 
 def TemporaryFile(*args, **kwargs):
@@ -87,6 +248,72 @@ def TemporaryFile(*args, **kwargs):
     return tempfile.TemporaryFile(*args, **kwargs)
 
 
+def copy_and_hash(source, destination=None):
+    """
+    Copy the content of a file object into another one, if provided, and
+    return the SHA256 hash of the content.
+    """
+    hash_object = hashlib.sha256()
+
+    while True:
+        data = source.read(STORAGE_PROCESS_CHUNK_SIZE)
+        if not data:
+            break
+
+        hash_object.update(data)
+        if destination:
+            destination.write(data)
+
+    return hash_object.hexdigest()
+
+
+def copy_tier_file(defined_storage_name, file_name, tier_name=None):
+    """
+    Copy a file of a defined storage to one of its tiers, or back to the
+    defined storage itself when tier_name is None, and verify the copy.
+    Returns the name of the copy. The original file is left in place to
+    be deleted after the references to it are updated, so that an
+    interruption never leaves a reference without its file.
+    """
+    defined_storage = DefinedStorage.get(name=defined_storage_name)
+    source_defined_storage, source_file_name = defined_storage.get_file_defined_storage(
+        file_name=file_name
+    )
+
+    if tier_name:
+        target_defined_storage = defined_storage.tiers[tier_name]
+    else:
+        target_defined_storage = defined_storage
+
+    source_storage = source_defined_storage.get_storage_instance()
+    target_storage = target_defined_storage.get_storage_instance()
+
+    with TemporaryFile() as temporary_file_object:
+        with source_storage.open(name=source_file_name, mode='rb') as file_object:
+            checksum = copy_and_hash(
+                destination=temporary_file_object, source=file_object
+            )
+
+        temporary_file_object.seek(0)
+        target_file_name = target_storage.save(
+            name=source_file_name, content=File(file=temporary_file_object)
+        )
+
+    try:
+        with target_storage.open(name=target_file_name, mode='rb') as file_object:
+            if copy_and_hash(source=file_object) != checksum:
+                raise StorageProcessVerificationError(
+                    'Copy of file "{}" does not match the original.'.format(
+                        file_name
+                    )
+                )
+    except Exception:
+        target_storage.delete(name=target_file_name)
+        raise
+
+    return target_defined_storage.get_file_name(file_name=target_file_name)
+
+
 def fs_cleanup(filename, suppress_exceptions=True):
     """
     Tries to remove the given filename. Ignores non-existent files.
@@ -199,6 +426,64 @@ def patch_files(path=None, replace_list=None):
                             shutil.copyfileobj(fsrc=temporary_file_object, fdst=source_file_object)
 
 
+def process_storage_file(
+    defined_storage_name, file_name, source_direct, target_direct
+):
+    """
+    Process a single file over the storage pipeline. The file is written
+    to a temporary name and verified before replacing the original file
+    so that an interruption never leaves the file missing. Returns the
+    size of the processed content. Defined at the module level to be
+    usable by process pool workers.
+    """
+    storage_instance = DefinedStorage.get(
+        name=defined_storage_name
+    ).get_storage_instance()
+
+    with TemporaryFile() as temporary_file_object:
+        with storage_instance.open(name=file_name, mode='rb', _direct=source_direct) as file_object:
+            checksum = copy_and_hash(
+                destination=temporary_file_object, source=file_object
+            )
+
+        size = temporary_file_object.tell()
+        temporary_file_object.seek(0)
+
+        temporary_name = storage_instance.save(
+            name=STORAGE_PROCESS_TEMPORARY_NAME.format(
+                file_name, uuid.uuid4().hex
+            ), content=File(file=temporary_file_object),
+            _direct=target_direct
+        )
+
+    with storage_instance.open(name=temporary_name, mode='rb', _direct=target_direct) as file_object:
+        if copy_and_hash(source=file_object) != checksum:
+            storage_instance.delete(name=temporary_name)
+            raise StorageProcessVerificationError(
+                'Verification of the processed file "{}" failed.'.format(
+                    file_name
+                )
+            )
+
+    try:
+        os.replace(
+            storage_instance.path(name=temporary_name),
+            storage_instance.path(name=file_name)
+        )
+    except NotImplementedError:
+        # The storage has no filesystem paths, copy the processed file
+        # over the original. The verified temporary file is kept until
+        # the copy finishes.
+        storage_instance.delete(name=file_name)
+        with storage_instance.open(name=temporary_name, mode='rb', _direct=True) as file_object:
+            storage_instance.save(
+                name=file_name, content=file_object, _direct=True
+            )
+        storage_instance.delete(name=temporary_name)
+
+    return size
+
+
 def validate_path(path):
     if not os.path.exists(path):
         # If doesn't exist try to create it